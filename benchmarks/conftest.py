@@ -0,0 +1,76 @@
+"""基准测试的公共设置
+
+在临时目录中伪造 APPDATA/LOCALAPPDATA/HOME，不需要安装 Cursor，也不需要显示器。
+默认只测量较小的规模；设置环境变量 CURSOR_BENCH_FULL=1 时包括 100 MB 的配置
+和 100,000 个备份。
+
+    python -m pytest benchmarks --benchmark-autosave          # 保存结果
+    python -m pytest benchmarks --benchmark-compare            # 与上次保存的结果比较
+"""
+import functools
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from profiles import KB, make_storage, populate_backups  # noqa: E402
+
+
+@functools.lru_cache(maxsize=None)
+def storage_data(size):
+    """同一大小的配置在整个测试过程中只生成一次"""
+    return make_storage(size)
+
+
+@pytest.fixture
+def fake_env(tmp_path, monkeypatch):
+    """伪造的用户目录，返回临时目录"""
+    monkeypatch.setenv('APPDATA', str(tmp_path / 'appdata'))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path / 'localappdata'))
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    return tmp_path
+
+
+@pytest.fixture
+def modifier_factory(fake_env):
+    """创建 Windows 版 CursorModifier，写入指定大小的 storage.json 和指定数量的备份
+
+    默认不应用备份保留策略，只测量操作本身。
+    """
+    from cursor_win_gui import CursorModifier
+
+    def create(size=1 * KB, backups=0, retention=None):
+        modifier = CursorModifier()
+        modifier.retention = retention
+        os.makedirs(os.path.dirname(modifier.storage_file), exist_ok=True)
+        data = storage_data(size)
+        with open(modifier.storage_file, 'wb') as f:
+            f.write(data)
+        if backups:
+            populate_backups(modifier.backup_store.backup_dir, backups, storage_data(1 * KB))
+        return modifier
+    return create
+
+
+@pytest.fixture
+def measure(benchmark):
+    """测量耗时，并把单独运行一次时的 Python 内存峰值记录到 extra_info
+
+    tracemalloc 会明显拖慢执行，所以内存峰值在计时之前单独测量。
+    """
+    def run(fn, *args):
+        tracemalloc.start()
+        try:
+            fn(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['peak_memory_kb'] = round(peak / 1024, 1)
+        return benchmark(fn, *args)
+    return run
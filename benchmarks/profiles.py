@@ -0,0 +1,76 @@
+"""合成的 Cursor 配置和备份目录
+
+storage.json 的结构仿照真实文件：开头是 telemetry.* 键，中间是大量工作区状态
+(嵌套对象、数组和较长的字符串)，更新设置放在末尾 (按键读取的最坏情况)。
+同一大小生成的内容是确定的，不同提交之间的测量结果可以比较。
+"""
+import json
+import os
+import random
+
+KB = 1024
+MB = 1024 * KB
+
+# 设置 CURSOR_BENCH_FULL=1 时测量全部规模
+FULL = os.environ.get('CURSOR_BENCH_FULL') == '1'
+PROFILE_SIZES = [1 * KB, 100 * KB, 1 * MB] + ([10 * MB, 100 * MB] if FULL else [])
+BACKUP_COUNTS = [10, 1000] + ([10000, 100000] if FULL else [])
+
+TELEMETRY = {
+    'telemetry.machineId': '61757468307c757365725fb38b5fabb389d433be1468bdb64b93a96adc9c101c',
+    'telemetry.macMachineId': 'e5b16fc8-03f8-4700-8b2c-a1c8904f6dc3',
+    'telemetry.devDeviceId': '46595587-da2f-4af1-afc4-4bdd58e9ecf2',
+    'telemetry.sqmId': '{6215A058-DE11-47EF-8B82-A030DFDA47D1}',
+}
+
+UPDATE = {
+    'update.mode': 'default',
+    'update.channel': 'default',
+    'update.enableDownload': True,
+}
+
+
+def _filler(rng, index):
+    """一个工作区状态键和值 (约 1-4 KB)"""
+    key = f"workbench.state.{index:07d}"
+    value = {
+        'folder': f"file:///home/user/projects/project-{rng.randrange(10 ** 6)}",
+        'opened': [f"src/module_{rng.randrange(1000)}.py" for _ in range(rng.randint(5, 30))],
+        'layout': {'sidebar': rng.random() > 0.5, 'width': rng.randint(100, 800)},
+        'blob': ''.join(rng.choices('abcdefghijklmnopqrstuvwxyz0123456789+/', k=rng.randint(200, 2000))),
+    }
+    return key, value
+
+
+def make_storage(size, seed=0):
+    """生成大约 size 字节的 storage.json 内容 (bytes)"""
+    rng = random.Random(seed or size)
+    config = dict(TELEMETRY)
+    fixed = len(json.dumps({**TELEMETRY, **UPDATE}, indent=2))
+    total = fixed
+    index = 0
+    while total < size:
+        key, value = _filler(rng, index)
+        total += len(json.dumps({key: value}, indent=2)) + 2
+        config[key] = value
+        index += 1
+    config.update(UPDATE)
+    return json.dumps(config, indent=2).encode('utf-8')
+
+
+def populate_backups(backup_dir, count, data):
+    """在备份目录中写入 count 个旧格式的完整备份 (backup_<时间>_<序号>.json)"""
+    os.makedirs(backup_dir, exist_ok=True)
+    for i in range(count):
+        path = os.path.join(backup_dir, f"backup_20250101_000000_{i:06d}.json")
+        with open(path, 'wb') as f:
+            f.write(data)
+        timestamp = 1735689600 + i
+        os.utime(path, (timestamp, timestamp))
+
+
+def size_label(size):
+    """参数化测试的名称"""
+    if size >= MB:
+        return f"{size // MB}MB"
+    return f"{size // KB}KB"
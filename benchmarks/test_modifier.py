@@ -0,0 +1,84 @@
+"""CursorModifier 各操作随配置大小和备份数量的耗时与内存峰值"""
+import os
+
+import pytest
+
+from profiles import BACKUP_COUNTS, PROFILE_SIZES, TELEMETRY, size_label
+
+sizes = pytest.mark.parametrize('size', PROFILE_SIZES, ids=size_label)
+counts = pytest.mark.parametrize('count', BACKUP_COUNTS)
+
+
+@sizes
+def test_is_auto_update_enabled(modifier_factory, measure, size):
+    modifier = modifier_factory(size)
+    assert measure(modifier.is_auto_update_enabled) is True
+
+
+@sizes
+def test_generate_new_config(modifier_factory, measure, size):
+    modifier = modifier_factory(size)
+    assert measure(modifier.generate_new_config) is True
+
+
+@sizes
+def test_create_manual_backup(modifier_factory, measure, size):
+    modifier = modifier_factory(size)
+    assert measure(modifier.create_manual_backup)
+
+
+@sizes
+def test_restore_backup(modifier_factory, measure, size):
+    modifier = modifier_factory(size)
+    backup = modifier.create_manual_backup()
+    assert measure(modifier.restore_backup, backup) is True
+
+
+@counts
+def test_list_backups(modifier_factory, measure, count):
+    modifier = modifier_factory(backups=count)
+    assert len(measure(modifier.list_backups)) == count
+
+
+@counts
+def test_get_backup_info(modifier_factory, measure, count):
+    from cursor_win_gui import Language
+    modifier = modifier_factory(backups=count)
+    backups = modifier.list_backups()
+    backup = backups[len(backups) // 2]
+    info = measure(modifier.get_backup_info, backup, Language.CHINESE)
+    assert TELEMETRY['telemetry.machineId'] in info
+
+
+@counts
+def test_prune_dry_run(modifier_factory, measure, count):
+    from cursor_tool.retention import DEFAULT_POLICY
+    modifier = modifier_factory(backups=count)
+    # 合成的备份都在同一小时内，只有最新的 keep_last 个被保留
+    removed = measure(modifier.prune, DEFAULT_POLICY, True)
+    assert len(removed) == max(count - DEFAULT_POLICY.keep_last, 0)
+
+
+@counts
+def test_backup_with_retention(modifier_factory, measure, count):
+    """每次备份后增量应用保留策略，耗时不应随备份数量增长"""
+    from cursor_tool.retention import DEFAULT_POLICY
+    modifier = modifier_factory(backups=count, retention=DEFAULT_POLICY)
+    backup_path = measure(modifier.create_manual_backup)
+    assert backup_path
+    # 合成的旧格式完整备份不参与自动删除；新备份中最新的总是保留，
+    # 其余最多为最近的 keep_last 个 (与计时的轮数无关)
+    backups = modifier.list_backups()
+    assert backups[-1] == backup_path
+    legacy = [path for path in backups if '_20250101_' in os.path.basename(path)]
+    assert len(legacy) == count
+    assert len(backups) - count <= DEFAULT_POLICY.keep_last + 1
+
+
+@counts
+def test_list_backups_page(modifier_factory, measure, count):
+    """对话框第一页: 最新的 100 个备份"""
+    modifier = modifier_factory(backups=count)
+    page = measure(modifier.list_backups, 0, 100, True)
+    assert len(page) == min(count, 100)
+    assert page[0] == modifier.list_backups()[-1]
@@ -0,0 +1,68 @@
+"""启动导入耗时 (预算见 README 的“启动时间”)"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 导入 GUI 模块的累计耗时上限 (含 PyQt6)
+IMPORT_BUDGET_MS = 150
+# 启动时不应导入的模块
+LAZY_MODULES = ('psutil', 'cursor_tool.qt.backup_view', 'cursor_tool.purge')
+
+CHECK = (
+    "import sys, {module}; "
+    "print(','.join(m for m in {lazy!r} if m in sys.modules))"
+)
+
+
+def _import(module, lazy=LAZY_MODULES):
+    """在新进程中导入模块，返回 (累计耗时 ms, 启动时已导入的延迟模块)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHECK.format(module=module, lazy=lazy)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env=dict(os.environ, PYTHONPATH=ROOT),
+    )
+    for line in reversed(result.stderr.splitlines()):
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            cumulative = int(fields[1]) / 1000
+            break
+    else:
+        raise AssertionError(f"importtime 输出中没有 {module}")
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return cumulative, loaded
+
+
+@pytest.mark.parametrize('module', ['cursor_win_gui', 'cursor_mac_gui'])
+def test_import_time(benchmark, module):
+    timings = []
+
+    def run():
+        cumulative, loaded = _import(module)
+        assert not loaded, f"启动时导入了 {loaded}"
+        timings.append(cumulative)
+
+    benchmark.pedantic(run, rounds=5, iterations=1)
+    # --benchmark-disable 时只运行一次，补足 5 次
+    while len(timings) < 5:
+        run()
+    benchmark.extra_info['import_ms'] = min(timings)
+    # 取最好的一次，排除冷缓存和系统负载的影响
+    assert min(timings) <= IMPORT_BUDGET_MS
+
+
+
+def test_cli_import_time(benchmark):
+    """命令行入口不导入 PyQt6"""
+    timings = []
+
+    def run():
+        cumulative, loaded = _import('cursor_tool.cli', ('PyQt6',) + LAZY_MODULES)
+        assert not loaded, f"命令行入口导入了 {loaded}"
+        timings.append(cumulative)
+
+    benchmark.pedantic(run, rounds=5, iterations=1)
+    benchmark.extra_info['import_ms'] = min(timings)
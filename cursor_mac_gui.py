@@ -1,19 +1,28 @@
 import sys
 import os
 import json
-import uuid
-import shutil
 import datetime
-import subprocess
-import ctypes
+import html
 from pathlib import Path
 from typing import Dict, Optional
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QPushButton, QLabel, QMessageBox, QTextEdit, 
-                            QScrollArea, QFrame, QDialog, QHBoxLayout,
+                            QFrame, QDialog, QHBoxLayout,
                             QLineEdit, QDialogButtonBox)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont
+from cursor_tool import memprof, trace
+from cursor_tool.core import CursorCore
+from cursor_tool.mac_helper import HelperError, HelperSession, LocalSession
+from cursor_tool.platforms import MacPlatform
+from cursor_tool.qt.i18n import Translator
+from cursor_tool.qt.logsink import LogSink
+from cursor_tool.qt.tasks import TaskEngine
+from cursor_tool.qt.theme import install as install_theme, set_state
+from cursor_tool.qt.update_state import UpdateStateModel
+
+# 打开备份对话框时预先读取信息的备份数量
+BACKUP_PAGE_SIZE = 100
 
 # 修改 MESSAGES 配置为中英文分离的格式
 class Messages:
@@ -132,6 +141,9 @@ class PasswordDialog(QDialog):
         self.setup_ui()
     
     def setup_ui(self):
+        # 密码对话框在主窗口之前显示，先安装样式表
+        install_theme(StyleSheet.MAIN)
+        
         # 根据当前语言设置标题
         title = "管理员权限" if self.current_language == Language.CHINESE else "Administrator Privileges"
         self.setWindowTitle(title)
@@ -144,14 +156,8 @@ class PasswordDialog(QDialog):
         # 图标和提示文本
         info_layout = QHBoxLayout()
         icon_label = QLabel()
+        icon_label.setObjectName("warning_icon")
         icon_label.setFixedSize(32, 32)
-        icon_label.setStyleSheet("""
-            QLabel {
-                background-image: url(':/warning.png');
-                background-position: center;
-                background-repeat: no-repeat;
-            }
-        """)
         info_layout.addWidget(icon_label)
         
         # 根据语言设置提示文本
@@ -159,24 +165,12 @@ class PasswordDialog(QDialog):
                    if self.current_language == Language.CHINESE 
                    else "Administrator privileges required.\nPlease enter your password:")
         msg_label = QLabel(msg_text)
-        msg_label.setStyleSheet("QLabel { color: #2f3542; }")
         info_layout.addWidget(msg_label, 1)
         layout.addLayout(info_layout)
         
         # 密码输入框
         self.password_input = QLineEdit()
         self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
-        self.password_input.setStyleSheet("""
-            QLineEdit {
-                padding: 8px;
-                border: 1px solid #dcdde1;
-                border-radius: 5px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border: 1px solid #4a69bd;
-            }
-        """)
         # 设置密码输入框的占位符文本
         placeholder = "输入密码" if self.current_language == Language.CHINESE else "Enter password"
         self.password_input.setPlaceholderText(placeholder)
@@ -190,6 +184,8 @@ class PasswordDialog(QDialog):
         # 设置按钮文本
         ok_btn = button_box.button(QDialogButtonBox.StandardButton.Ok)
         cancel_btn = button_box.button(QDialogButtonBox.StandardButton.Cancel)
+        ok_btn.setProperty('role', 'primary')
+        cancel_btn.setProperty('role', 'secondary')
         if self.current_language == Language.CHINESE:
             ok_btn.setText("确定")
             cancel_btn.setText("取消")
@@ -199,29 +195,6 @@ class PasswordDialog(QDialog):
             
         button_box.accepted.connect(self.accept)
         button_box.rejected.connect(self.reject)
-        button_box.setStyleSheet("""
-            QPushButton {
-                padding: 8px 16px;
-                border-radius: 5px;
-                min-width: 80px;
-            }
-            QPushButton[text="确定"], QPushButton[text="OK"] {
-                background-color: #4a69bd;
-                color: white;
-                border: none;
-            }
-            QPushButton[text="确定"]:hover, QPushButton[text="OK"]:hover {
-                background-color: #6a89cc;
-            }
-            QPushButton[text="取消"], QPushButton[text="Cancel"] {
-                background-color: #f5f6fa;
-                border: 1px solid #dcdde1;
-                color: #2f3542;
-            }
-            QPushButton[text="取消"]:hover, QPushButton[text="Cancel"]:hover {
-                background-color: #dcdde1;
-            }
-        """)
         layout.addWidget(button_box)
         
         # 设置回车键触发确定按钮
@@ -231,45 +204,49 @@ class PasswordDialog(QDialog):
         return self.password_input.text()
 
 def run_as_admin():
-    """以管理员权限运行"""
-    if not is_admin():
-        try:
-            app = QApplication.instance()
-            if not app:
-                app = QApplication(sys.argv)
-            
-            # 显示密码输入对话框，传入当前语言设置
-            dialog = PasswordDialog(language=Language.CHINESE)  # 或从配置中获取当前语言
-            if dialog.exec() == QDialog.DialogCode.Accepted:
-                password = dialog.get_password()
-                # 使用获取的密码执行提权命令
-                cmd = f'echo "{password}" | sudo -S "{sys.executable}" "{" ".join(sys.argv)}"'
-                subprocess.run(cmd, shell=True, check=True)
-                sys.exit(0)  # 退出当前非管理员进程
-            else:
-                sys.exit(1)  # 用户取消
-        except subprocess.CalledProcessError:
-            error_title = "错误" if Language.CHINESE else "Error"
-            error_msg = ("密码错误或权限验证失败。" if Language.CHINESE 
-                        else "Incorrect password or authentication failed.")
-            QMessageBox.critical(None, error_title, error_msg,
-                               QMessageBox.StandardButton.Ok)
-            sys.exit(1)
-        except Exception as e:
-            error_title = "错误" if Language.CHINESE else "Error"
-            error_msg = (f"获取管理员权限失败: {e}" if Language.CHINESE 
-                        else f"Failed to obtain administrator privileges: {e}")
-            QMessageBox.critical(None, error_title, error_msg,
-                               QMessageBox.StandardButton.Ok)
-            sys.exit(1)
-
-class CursorModifier:
+    """获取管理员权限
+
+    启动一个常驻的特权助手进程并返回其会话，之后的特权文件操作都批量发送给它；
+    已经是 root 时直接在当前进程中执行。
+    """
+    if is_admin():
+        return LocalSession()
+    
+    try:
+        app = QApplication.instance()
+        if not app:
+            app = QApplication(sys.argv)
+        
+        # 显示密码输入对话框，传入当前语言设置
+        dialog = PasswordDialog(language=Language.CHINESE)  # 或从配置中获取当前语言
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            # 使用获取的密码启动特权助手 (只调用一次 sudo)
+            return HelperSession.start(dialog.get_password())
+        else:
+            sys.exit(1)  # 用户取消
+    except HelperError:
+        error_title = "错误" if Language.CHINESE else "Error"
+        error_msg = ("密码错误或权限验证失败。" if Language.CHINESE 
+                    else "Incorrect password or authentication failed.")
+        QMessageBox.critical(None, error_title, error_msg,
+                           QMessageBox.StandardButton.Ok)
+        sys.exit(1)
+    except Exception as e:
+        error_title = "错误" if Language.CHINESE else "Error"
+        error_msg = (f"获取管理员权限失败: {e}" if Language.CHINESE 
+                    else f"Failed to obtain administrator privileges: {e}")
+        QMessageBox.critical(None, error_title, error_msg,
+                           QMessageBox.StandardButton.Ok)
+        sys.exit(1)
+
+class CursorModifier(CursorCore):
     """Cursor配置修改器类 (macOS版)"""
-    def __init__(self):
-        self.home = str(Path.home())
-        self.storage_file = Path(f"{self.home}/Library/Application Support/Cursor/User/globalStorage/storage.json")
-        self.backup_dir = Path(f"{self.home}/Library/Application Support/Cursor/User/globalStorage/backups")
-        self.cursor_app = Path("/Applications/Cursor.app")
+    def __init__(self, session=None):
+        # 路径、备份存储和安装探测由 CursorCore 按 macOS 平台创建；
+        # 特权操作会话由 run_as_admin 创建
+        super().__init__(MacPlatform(), session or LocalSession())
+        # 更新器文件，替换为只读空文件表示已禁用自动更新
+        self.updater_path = Path(self.platform.updater_path)
         self.current_language = Messages.CHINESE  # 默认中文
         self.log_callback = lambda x: None  # 默认空日志回调
 
@@ -280,156 +257,117 @@ class CursorModifier:
     def get_cursor_version(self) -> Optional[str]:
         """获取Cursor版本"""
         try:
-            package_path = self.cursor_app / "Contents/Resources/app/package.json"
-            if package_path.exists():
-                with open(package_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get('version')
+            install = self.get_install()
+            if install is not None:
+                return install.version
         except Exception as e:
             print(f"读取版本出错: {e}")
         return None
 
-    def close_cursor_processes(self):
-        """关闭所有Cursor进程"""
+    def close_cursor_processes(self) -> bool:
+        """关闭所有Cursor进程，进程全部退出 (或没有运行) 时返回 True"""
         try:
-            result = subprocess.run(['pgrep', '-f', 'Cursor'], capture_output=True)
-            if result.returncode == 0:
-                subprocess.run(['pkill', '-f', 'Cursor'], check=True)
-                return True
+            # 按进程名匹配 (包括 /Applications 以外的安装)，连同子进程一起结束
+            report = self.close_cursor()
+        except Exception as e:
+            self.log_callback(self.current_language['kill_failed'].format(e))
+            return False
+        if not report.ok:
+            self.log_callback(self.current_language['kill_failed'].format(report.remaining))
             return False
+        if report.found:
+            self.log_callback(f"{self.current_language['process_killed']} ({report})")
+        return True
+
+    def prepare_backup_dir(self) -> bool:
+        """确保当前用户可以写入备份目录，返回是否修改了属主"""
+        try:
+            # 旧版本以 root 身份创建的备份目录通过特权助手改为当前用户所有
+            return self.claim_backup_dir()
         except Exception as e:
-            print(f"关闭进程失败: {e}")
+            print(f"修改备份目录属主失败: {e}" if self.current_language == Messages.CHINESE
+                  else f"Failed to take ownership of the backup directory: {e}")
             return False
 
+    @trace.traced()
     def backup_config(self, auto_backup: bool = False) -> Optional[Path]:
         """备份当前配置"""
         try:
-            if not self.backup_dir.exists():
-                os.makedirs(self.backup_dir, mode=0o755, exist_ok=True)
-            
-            if not self.storage_file.exists():
-                return None
-            
-            timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_path = self.backup_dir / f"storage.json.backup_{timestamp}"
-            
-            # 使用 sudo 复制文件
-            subprocess.run(['sudo', 'cp', str(self.storage_file), str(backup_path)], check=True)
-            subprocess.run(['sudo', 'chmod', '644', str(backup_path)], check=True)
-            
-            return backup_path
+            # 当前用户不可读时通过特权会话读取；内容相同的备份只存储一次
+            backup_path = self.create_backup()
+            return Path(backup_path) if backup_path else None
         except Exception as e:
             error_msg = (f"备份失败: {e}" if self.current_language == Messages.CHINESE 
                         else f"Backup failed: {e}")
             print(error_msg)
             return None
 
-    def generate_ids(self) -> Dict[str, str]:
-        """生成新的设备ID"""
-        def get_random_hex(length: int) -> str:
-            return os.urandom(length).hex()
-
-        prefix = "auth0|user_"
-        prefix_hex = ''.join(f'{ord(c):02x}' for c in prefix)
-        random_part = get_random_hex(32 - len(prefix_hex) // 2)
-        machine_id = f"{prefix_hex}{random_part}"
-
-        return {
-            'machineId': machine_id,
-            'macMachineId': str(uuid.uuid4()),
-            'devDeviceId': str(uuid.uuid4()).lower(),
-            'sqmId': f"{{{str(uuid.uuid4()).upper()}}}"
-        }
-
+    @trace.traced()
     def update_system_uuid(self) -> bool:
         """更新系统UUID"""
         try:
-            new_uuid = str(uuid.uuid4())
-            subprocess.run(['sudo', 'nvram', f'SystemUUID={new_uuid}'], check=True)
+            self.update_system_id()
             return True
         except Exception as e:
             print(f"更新系统UUID失败: {e}")
             return False
 
+    @trace.traced()
     def update_config(self, new_ids: Dict[str, str]) -> bool:
         """更新配置文件"""
         try:
-            if not self.storage_file.exists():
+            if not self.has_storage():
                 return False
 
-            # 1. 读取当前配置
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-            # 2. 更新配置
-            for key, value in new_ids.items():
-                config[f'telemetry.{key}'] = value
-
-            # 3. 使用临时文件进行写入
-            temp_file = self.storage_file.with_suffix('.tmp')
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
-
-            # 4. 替换原文件
-            subprocess.run(['sudo', 'mv', str(temp_file), str(self.storage_file)], check=True)
-            subprocess.run(['sudo', 'chmod', '444', str(self.storage_file)], check=True)  # 设置为只读
-
-            # 5. 更新 state.json
-            state_file = self.storage_file.parent / "state.json"
-            if state_file.exists():
-                try:
-                    with open(state_file, 'r', encoding='utf-8') as f:
-                        state = json.load(f)
-                    state['machineId'] = new_ids['machineId']
-                    
-                    temp_state = state_file.with_suffix('.tmp')
-                    with open(temp_state, 'w', encoding='utf-8') as f:
-                        json.dump(state, f, indent=2)
-                    
-                    subprocess.run(['sudo', 'mv', str(temp_state), str(state_file)], check=True)
-                    subprocess.run(['sudo', 'chmod', '444', str(state_file)], check=True)
-                except Exception as e:
-                    print(f"更新 state.json 失败: {e}")
-
-            # 6. 清理缓存
-            cache_dirs = [
-                Path(f"{self.home}/Library/Caches/Cursor"),
-                Path(f"{self.home}/Library/Application Support/Cursor/Cache"),
-                Path(f"{self.home}/Library/Application Support/Cursor/Code Cache"),
-                Path(f"{self.home}/Library/Application Support/Cursor/Session Storage"),
-            ]
-            
-            for cache_dir in cache_dirs:
-                if cache_dir.exists():
-                    try:
-                        subprocess.run(['sudo', 'rm', '-rf', str(cache_dir)], check=True)
-                    except Exception as e:
-                        print(f"清理缓存失败 {cache_dir}: {e}")
+            # storage.json 和 state.json 只改写设备标识并设置为只读，缓存目录移到一旁
+            # (所有特权操作合并为一次请求)
+            for op, error in self.apply_ids(new_ids):
+                if op['op'] == 'patch_keys':
+                    print(f"更新 state.json 失败: {error}")
+                else:
+                    print(f"清理缓存失败 {op['path']}: {error}")
 
             return True
         except Exception as e:
             print(f"更新配置失败: {e}")
             return False
 
+    def cache_dirs(self) -> list:
+        """需要清理的缓存目录"""
+        return [Path(path) for path in self.platform.cache_dirs()]
+
+    @trace.traced()
+    def purge_caches(self, progress=None) -> Optional[dict]:
+        """并行删除已移到一旁的缓存目录，progress(已删除文件数, 已释放字节数)
+
+        返回清理结果，没有需要清理的目录时返回 None。
+        """
+        def report(event):
+            if progress is not None:
+                progress(event['files'], event['bytes'])
+        
+        try:
+            result = super().purge_caches(report)
+        except Exception as e:
+            print(f"清理缓存失败: {e}")
+            return None
+        if result is None:
+            return None
+        for error in result['errors']:
+            print(f"清理缓存失败 {error}")
+        return result
+
+    @trace.traced()
     def disable_auto_update(self) -> bool:
         """禁用自动更新"""
-        updater_path = Path(f"{self.home}/Library/Application Support/Caches/cursor-updater")
+        updater_path = self.updater_path
         try:
-            # 1. 如果更新器文件存在，先删除它
+            # 删除更新器文件 (如果存在)，再创建一个只读的空文件，防止被修改
             if updater_path.exists():
                 self.log_callback(f"正在删除更新器文件: {updater_path}")
-                subprocess.run(['sudo', 'rm', '-rf', str(updater_path)], check=True)
-                self.log_callback("更新器文件删除成功")
-            
-            # 2. 创建一个空文件
-            self.log_callback(f"正在创建空文件: {updater_path}")
-            subprocess.run(['sudo', 'touch', str(updater_path)], check=True)
-            self.log_callback("空文件创建成功")
-            
-            # 3. 将文件设置为只读，防止被修改
-            self.log_callback("正在设置文件权限为只读(444)")
-            subprocess.run(['sudo', 'chmod', '444', str(updater_path)], check=True)
-            self.log_callback("文件权限设置成功")
+            self.log_callback(f"正在创建空文件并设置权限为只读(444): {updater_path}")
+            super().disable_auto_update()
+            self.log_callback("更新器已替换为只读空文件")
             
             return True
         except Exception as e:
@@ -437,14 +375,15 @@ class CursorModifier:
             self.log_callback(error_msg)
             return False
 
+    @trace.traced()
     def enable_auto_update(self) -> bool:
         """恢复自动更新"""
-        updater_path = Path(f"{self.home}/Library/Application Support/Caches/cursor-updater")
+        updater_path = self.updater_path
         try:
             # 删除更新器文件
             if updater_path.exists():
                 self.log_callback(f"正在删除更新器文件: {updater_path}")
-                subprocess.run(['sudo', 'rm', '-f', str(updater_path)], check=True)
+                super().enable_auto_update()
                 self.log_callback("更新器文件删除成功")
             else:
                 self.log_callback("更新器文件不存在，无需删除")
@@ -454,20 +393,17 @@ class CursorModifier:
             self.log_callback(error_msg)
             return False
 
-    def list_backups(self) -> list:
-        """列出所有备份"""
-        if not self.backup_dir.exists():
-            return []
-        
-        backups = sorted(self.backup_dir.glob('storage.json.backup_*'))
-        return backups
+    def list_backups(self, offset=0, limit=None, newest_first=False) -> list:
+        """列出备份 (默认全部，从旧到新)"""
+        return [Path(path) for path in super().list_backups(offset, limit, newest_first)]
 
+    @trace.traced()
     def restore_backup(self, backup_path: Path) -> bool:
         """恢复备份"""
         try:
-            if backup_path.exists():
-                shutil.copy2(backup_path, self.storage_file)
-                os.chmod(self.storage_file, 0o444)
+            if self.backup_store.exists(backup_path):
+                # 先备份当前配置，恢复后配置文件设为只读
+                super().restore_backup(backup_path)
                 return True
             return False
         except Exception as e:
@@ -477,44 +413,39 @@ class CursorModifier:
     def get_backup_info(self, backup_path: Path) -> str:
         """获取备份信息"""
         try:
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                telemetry_config = {k: v for k, v in config.items() if k.startswith('telemetry.')}
-                
-            created_time = datetime.datetime.fromtimestamp(backup_path.stat().st_mtime)
-            
-            if self.current_language == Messages.CHINESE:
-                return f"""
+            # 摘要来自备份目录，只在备份变化时才解析备份内容
+            return self.format_backup_info(self.backup_summary(backup_path))
+        except Exception as e:
+            return (f"读取备份失败: {e}" if self.current_language == Messages.CHINESE 
+                   else f"Failed to read backup: {e}")
+
+    def format_backup_info(self, summary: Dict) -> str:
+        """按当前语言格式化备份摘要 (不读取文件，切换语言时直接重新格式化)"""
+        telemetry_config = summary['telemetry']
+        created_time = datetime.datetime.fromtimestamp(summary['timestamp'])
+        
+        if self.current_language == Messages.CHINESE:
+            return f"""
 备份信息:
-文件名: {backup_path.name}
+文件名: {summary['name']}
 创建时间: {created_time.strftime('%Y-%m-%d %H:%M:%S')}
 配置内容:
 {json.dumps(telemetry_config, indent=2, ensure_ascii=False)}
 """
-            else:
-                return f"""
+        return f"""
 Backup Information:
-Filename: {backup_path.name}
+Filename: {summary['name']}
 Created: {created_time.strftime('%Y-%m-%d %H:%M:%S')}
 Configuration:
 {json.dumps(telemetry_config, indent=2, ensure_ascii=False)}
 """
-        except Exception as e:
-            return (f"读取备份失败: {e}" if self.current_language == Messages.CHINESE 
-                   else f"Failed to read backup: {e}")
 
+    @trace.traced()
     def view_current_config(self) -> Optional[Dict[str, str]]:
         """查看当前配置"""
         try:
-            if not self.storage_file.exists():
-                return None
-
-            # 使用 sudo 读取文件
-            result = subprocess.run(['sudo', 'cat', str(self.storage_file)], 
-                                  capture_output=True, text=True, check=True)
-            config = json.loads(result.stdout)
-            telemetry_config = {k: v for k, v in config.items() if k.startswith('telemetry.')}
-            return telemetry_config
+            # 只读取 telemetry.* 字段，当前用户不可读时通过特权会话读取
+            return self.read_config()
         except Exception as e:
             error_msg = (f"读取配置失败: {e}" if self.current_language == Messages.CHINESE 
                         else f"Failed to read configuration: {e}")
@@ -660,7 +591,7 @@ class Language:
     }
 
 class StyleSheet:
-    """样式表"""
+    """应用级样式表 (启动时安装一次，控件状态用动态属性表示)"""
     MAIN = """
     QMainWindow {
         background-color: #f5f6fa;
@@ -685,8 +616,9 @@ class StyleSheet:
         background-color: #3c55a5;
     }
     
-    QPushButton:disabled {
-        background-color: #95afc0;  /* 禁用状态的颜色 */
+    QPushButton:disabled,
+    QPushButton[state="active"] {
+        background-color: #95afc0;  /* 禁用状态和当前已生效的更新设置 */
     }
     
     QTextEdit {
@@ -698,6 +630,12 @@ class StyleSheet:
         color: #1e3799;
     }
     
+    /* 配置查看对话框 */
+    QTextEdit#config_view {
+        color: #2f3542;
+        padding: 10px;
+    }
+    
     QLabel#version_label {
         color: #2f3542;
         padding: 10px;
@@ -705,23 +643,124 @@ class StyleSheet:
         border-radius: 5px;
         border: 1px solid #dcdde1;
     }
+    
+    QLabel#log_title {
+        color: #1e3799;
+        padding: 5px;
+        background-color: #ffffff;
+        border-radius: 5px;
+        border: 1px solid #dcdde1;
+    }
+    
+    /* 管理员密码对话框 */
+    QLabel#warning_icon {
+        background-image: url(':/warning.png');
+        background-position: center;
+        background-repeat: no-repeat;
+    }
+    
+    PasswordDialog QLabel {
+        color: #2f3542;
+    }
+    
+    QLineEdit {
+        padding: 8px;
+        border: 1px solid #dcdde1;
+        border-radius: 5px;
+        background-color: white;
+    }
+    
+    QLineEdit:focus {
+        border: 1px solid #4a69bd;
+    }
+    
+    QDialogButtonBox QPushButton {
+        padding: 8px 16px;
+        min-width: 80px;
+    }
+    
+    QPushButton[role="secondary"] {
+        background-color: #f5f6fa;
+        border: 1px solid #dcdde1;
+        color: #2f3542;
+    }
+    
+    QPushButton[role="secondary"]:hover {
+        background-color: #dcdde1;
+    }
     """
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # 工作线程中的日志通过该信号排队到 GUI 线程
+    log_requested = pyqtSignal(str)
+
+    def __init__(self, session=None):
         super().__init__()
-        self.modifier = CursorModifier()
+        self.modifier = CursorModifier(session)
         self.current_language = Language.CHINESE
         self.modifier.set_language(Messages.CHINESE)
-        # 设置日志回调
+        # 界面文本在创建控件时登记，切换语言时一次更新
+        self.i18n = Translator({'zh': Language.CHINESE, 'en': Language.ENGLISH}, 'zh')
+        self.cursor_version = "..."  # 后台获取后更新，None 表示未找到
+        # 设置日志回调 (log 可在工作线程中调用)
         self.modifier.set_log_callback(self.log)
+        
+        # 后台任务引擎，CursorModifier 的操作都在工作线程中执行
+        self.tasks = TaskEngine(self)
+        self.tasks.task_progress.connect(self.on_task_progress)
+        self.tasks.task_failed.connect(self.on_task_failed)
+        self.tasks.busy_changed.connect(self.on_tasks_busy)
+        # 只读的状态查询使用单独的工作线程: 不排在耗时操作之后，也不改变忙碌状态
+        self.readers = TaskEngine(self)
+        self.log_requested.connect(self.log)
+        
+        # 自动更新状态，更新器文件变化时才重新检查
+        # (在后台任务中读取，不阻塞 GUI 线程)
+        self.update_state = UpdateStateModel(self.modifier.update_state_path(),
+                                             self.modifier.is_auto_update_enabled,
+                                             tasks=self.readers, parent=self)
+        
+        self.started = False
         self.setup_ui()
         
+        # 设置 CURSOR_TRACE 时记录各操作的耗时，同时显示在日志中
+        # (窗口销毁时注销，不再输出到已关闭的窗口)
+        tracer = trace.from_env()
+        if tracer is not None:
+            trace_sink = lambda span: self.log(f"[trace] {trace.format_span(span)}")
+            tracer.add_sink(trace_sink)
+            self.destroyed.connect(lambda *_: tracer.remove_sink(trace_sink))
+        
+        # 设置 CURSOR_MEMORY 时报告每个操作的内存峰值和主要分配位置
+        profiler = memprof.from_env()
+        if profiler is not None:
+            memory_sink = self._log_memory_report
+            profiler.add_sink(memory_sink)
+            self.destroyed.connect(lambda *_: profiler.remove_sink(memory_sink))
+        
+        # 更新控制按钮绑定到更新状态 (首次绘制后读取)，切换语言后按状态重新设置文字
+        self.update_state.changed.connect(self._apply_update_state)
+        self.i18n.on_switch(self._retranslate_update_state)
+        
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # 窗口第一次绘制后再执行启动时的其他工作
+        if not self.started:
+            self.started = True
+            QTimer.singleShot(0, self.deferred_startup)
+    
+    def deferred_startup(self):
+        """首次绘制后执行: 获取版本、读取更新状态、检查备份目录的属主"""
+        self.refresh_version_label()
+        self.update_state.refresh()
+        # 排在之后的备份操作之前执行
+        self.tasks.submit('prepare_backup_dir', self.modifier.prepare_backup_dir, background=True)
+        
     def setup_ui(self):
         """设置主界面"""
-        self.setWindowTitle(self.current_language['title'])
+        self.i18n.bind(self, 'title', 'setWindowTitle')
         self.setMinimumSize(1000, 600)
-        self.setStyleSheet(StyleSheet.MAIN)
+        install_theme(StyleSheet.MAIN)
         
         # 创建中心部件
         central_widget = QWidget()
@@ -744,7 +783,7 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(right_panel)
         
         # 状态栏
-        self.statusBar().showMessage(self.current_language['status_ready'])
+        self.i18n.bind(self.statusBar(), 'status_ready', 'showMessage')
         
     def create_left_panel(self):
         """创建左侧面板"""
@@ -753,12 +792,10 @@ class MainWindow(QMainWindow):
         layout.setSpacing(15)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        # 版本信息
-        version = self.modifier.get_cursor_version()
-        version_label = QLabel(self.current_language['version'].format(
-            version or "未找到"
-        ))
+        # 版本信息 (后台获取)
+        self.version_label = version_label = QLabel()
         version_label.setObjectName("version_label")
+        self.i18n.bind(version_label, 'version', args=lambda: (self._version_text(),))
         version_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         version_label.setFixedHeight(42)  # 设置固定高度
         layout.addWidget(version_label)
@@ -784,18 +821,9 @@ class MainWindow(QMainWindow):
         top_layout.setContentsMargins(0, 0, 0, 0)
         
         # 日志标题
-        log_title = QLabel(self.current_language['log_title'])
+        log_title = self.i18n.bind(QLabel(), 'log_title')
         log_title.setFont(QFont('Arial', 12, QFont.Weight.Bold))
         log_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        log_title.setStyleSheet("""
-            QLabel {
-                color: #1e3799;
-                padding: 5px;
-                background-color: #ffffff;
-                border-radius: 5px;
-                border: 1px solid #dcdde1;
-            }
-        """)
         log_title.setObjectName("log_title")
         log_title.setFixedHeight(42)  # 设置固定高度，与版本标签对齐
         top_layout.addWidget(log_title)
@@ -806,15 +834,8 @@ class MainWindow(QMainWindow):
         self.log_area = QTextEdit()
         self.log_area.setReadOnly(True)
         self.log_area.setFont(QFont('Menlo', 10))
-        self.log_area.setStyleSheet("""
-            QTextEdit {
-                background-color: #ffffff;
-                color: #1e3799;
-                border: 1px solid #dcdde1;
-                border-radius: 5px;
-                padding: 5px;
-            }
-        """)
+        # 日志批量写入，约每帧刷新一次
+        self.log_sink = LogSink(self.log_area, rich_text=True)
         layout.addWidget(self.log_area)
         
         # 添加初始日志
@@ -825,6 +846,7 @@ class MainWindow(QMainWindow):
     def create_buttons(self, layout):
         """创建功能按钮"""
         button_frame = QFrame()
+        self.button_frame = button_frame  # 任务执行期间禁用
         button_layout = QVBoxLayout(button_frame)
         button_layout.setSpacing(10)  # 设置按钮间距
         button_layout.setContentsMargins(0, 0, 0, 0)  # 移除边距
@@ -852,27 +874,13 @@ class MainWindow(QMainWindow):
         for group_name, buttons in groups:
             # 添加按钮
             for btn_name, handler in buttons:
-                btn = QPushButton(self.current_language['buttons'][group_name][btn_name])
-                btn.setObjectName(f"{group_name}_{btn_name}")
+                btn = self.i18n.bind(QPushButton(), f"buttons.{group_name}.{btn_name}")
                 btn.clicked.connect(handler)
                 btn.setFixedHeight(42)  # 设置按钮固定高度
                 
-                # 为更新控制按钮添加状态文字
+                # 更新控制按钮的状态文字由 _apply_update_state 设置
                 if group_name == 'update_control':
-                    # 检查更新器状态
-                    updater_path = Path(f"{self.modifier.home}/Library/Application Support/Caches/cursor-updater")
-                    is_update_disabled = updater_path.exists() and updater_path.stat().st_size == 0
-                    
-                    if btn_name == 'disable_update':
-                        if is_update_disabled:
-                            btn.setText(self.current_language['buttons'][group_name][btn_name] + 
-                                      self.current_language['status']['disabled'])
-                            btn.setEnabled(False)
-                    elif btn_name == 'enable_update':
-                        if not is_update_disabled:
-                            btn.setText(self.current_language['buttons'][group_name][btn_name] + 
-                                      self.current_language['status']['enabled'])
-                            btn.setEnabled(False)
+                    setattr(self, f"{btn_name}_btn", btn)
                 
                 button_layout.addWidget(btn)
             
@@ -882,10 +890,49 @@ class MainWindow(QMainWindow):
         
         layout.addWidget(button_frame)
 
+    def _log_memory_report(self, report):
+        for line in report.lines():
+            self.log(html.escape(line))
+
     def log(self, message):
         """添加日志"""
+        # 工作线程中的日志排队到 GUI 线程
+        if QThread.currentThread() != self.thread():
+            self.log_requested.emit(str(message))
+            return
+        
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.log_area.append(f'<span style="color: #1e3799;">[{timestamp}] {message}</span>')
+        self.log_sink.write(f'<span style="color: #1e3799;">[{timestamp}] {message}</span>')
+
+    def on_task_progress(self, name, percent, message):
+        """在状态栏显示任务进度"""
+        if percent >= 0:
+            self.statusBar().showMessage(f"{message} ({percent}%)")
+        else:
+            self.statusBar().showMessage(message)
+
+    def on_task_failed(self, name, message):
+        """记录未处理的任务错误"""
+        self.log(f"任务执行出错 ({name}): {message}")
+
+    def on_tasks_busy(self, busy):
+        """任务执行期间禁用功能按钮"""
+        if hasattr(self, 'button_frame'):
+            self.button_frame.setEnabled(not busy)
+
+    def refresh_version_label(self):
+        """在后台获取 Cursor 版本并更新版本标签"""
+        self.tasks.submit('version', self.modifier.get_cursor_version,
+                          on_done=self._set_version_label)
+
+    def _set_version_label(self, version):
+        self.cursor_version = version
+        self.i18n.refresh(self.version_label)
+
+    def _version_text(self):
+        if self.cursor_version is None:
+            return "未找到" if self.current_language == Language.CHINESE else "N/A"
+        return self.cursor_version
         
     # 实现功能按钮的处理方法
     def generate_new_config(self):
@@ -896,24 +943,49 @@ class MainWindow(QMainWindow):
             self.current_language['confirm']['generate'],
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         ) == QMessageBox.StandardButton.Yes:
-            self.log("正在关闭Cursor进程...")
-            self.modifier.close_cursor_processes()
-            backup_path = self.modifier.backup_config(auto_backup=True)
-            if backup_path:
-                self.log(f"已创建备份: {backup_path}")
-                new_ids = self.modifier.generate_ids()
-                if self.modifier.update_system_uuid() and self.modifier.update_config(new_ids):
-                    # 在日志区域显示
-                    self.log("配置已更新")
-                    self.log("\n新的ID:")
-                    formatted_ids = "\n".join([f"{k}: {v}" for k, v in new_ids.items()])
-                    self.log(formatted_ids)
-                    
-                    # 同时弹出消息框显示
-                    QMessageBox.information(
-                        self,
-                        self.current_language['messages']['success'],
-                        f"""配置已更新成功！
+            self.tasks.submit('generate', self._generate_new_config, with_progress=True,
+                              on_done=self._on_config_generated)
+
+    def _generate_new_config(self, progress):
+        """关闭进程、备份并写入新配置 (工作线程)
+
+        返回新的ID；未能创建备份时返回 None，更新失败时返回 False。
+        """
+        self.log("正在关闭Cursor进程...")
+        progress(self.modifier.current_language['closing_cursor'], 0)
+        if not self.modifier.close_cursor_processes():
+            return False
+        
+        progress("正在创建备份...", 20)
+        backup_path = self.modifier.backup_config(auto_backup=True)
+        if not backup_path:
+            return None
+        self.log(f"已创建备份: {backup_path}")
+        
+        progress("正在更新配置...", 40)
+        new_ids = self.modifier.generate_ids()
+        if self.modifier.update_system_uuid() and self.modifier.update_config(new_ids):
+            progress(self.modifier.current_language['config_updated'], 100)
+            return new_ids
+        return False
+
+    def _on_config_generated(self, new_ids):
+        if new_ids:
+            # 缓存目录已移到一旁，在后台删除其中的内容
+            self.tasks.submit('purge_caches', self._purge_caches, with_progress=True,
+                              on_done=self._on_caches_purged)
+            
+            # 在日志区域显示
+            self.log("配置已更新")
+            self.log("\n新的ID:")
+            formatted_ids = "\n".join([f"{k}: {v}" for k, v in new_ids.items()])
+            self.log(formatted_ids)
+            
+            # 同时弹出消息框显示
+            QMessageBox.information(
+                self,
+                self.current_language['messages']['success'],
+                f"""配置已更新成功！
 
 新的ID:
 {formatted_ids}
@@ -923,21 +995,35 @@ class MainWindow(QMainWindow):
 2. 清除浏览器中 Cursor 网站的所有数据
 3. 重启电脑
 4. 使用新账号登录 Cursor"""
-                    )
-                else:
-                    QMessageBox.warning(
-                        self,
-                        self.current_language['messages']['error'],
-                        "更新配置失败"
-                    )
+            )
+        elif new_ids is False:
+            QMessageBox.warning(
+                self,
+                self.current_language['messages']['error'],
+                "更新配置失败"
+            )
+    
+    def _purge_caches(self, progress):
+        """删除移到一旁的缓存目录 (工作线程)"""
+        def report(files, size):
+            progress(f"正在清理缓存: {files} 个文件, {size / 1024 / 1024:.1f} MB")
+        return self.modifier.purge_caches(report)
+
+    def _on_caches_purged(self, result):
+        if result:
+            self.log(f"缓存清理完成: 删除 {result['files']} 个文件, "
+                     f"释放 {result['bytes'] / 1024 / 1024:.1f} MB, 耗时 {result['elapsed']:.1f} 秒")
+        self.statusBar().showMessage(self.current_language['status_ready'])
     
     def view_current_config(self):
         """查看当前配置"""
         viewing_msg = ("正在查看当前配置..." if self.current_language == Language.CHINESE 
                       else "Viewing current configuration...")
         self.log(viewing_msg)
-        
-        config = self.modifier.view_current_config()
+        self.tasks.submit('view_config', self.modifier.view_current_config,
+                          on_done=self._show_current_config)
+
+    def _show_current_config(self, config):
         if config:
             # 在日志中显示
             current_config = ("当前配置:" if self.current_language == Language.CHINESE 
@@ -949,6 +1035,7 @@ class MainWindow(QMainWindow):
             # 显示配置对话框
             dialog = ConfigViewDialog(self, config)
             dialog.exec()
+            dialog.deleteLater()
         else:
             not_found = ("未找到配置" if self.current_language == Language.CHINESE 
                         else "Configuration not found")
@@ -957,20 +1044,44 @@ class MainWindow(QMainWindow):
     def view_backups(self):
         """查看备份"""
         self.log("正在查看备份...")
-        backups = self.modifier.list_backups()
+        self.tasks.submit('list_backups', self._load_backups, with_progress=True,
+                          on_done=self._show_backup_dialog)
+
+    def _load_backups(self, progress):
+        """读取备份列表及备份信息 (工作线程)"""
+        # 最新的备份显示在最前面；只预先读取第一页的备份信息，其余在滚动到时读取
+        backups = self.modifier.list_backups(newest_first=True)
+        first_page = backups[:BACKUP_PAGE_SIZE]
+        infos = {}
+        for i, backup in enumerate(first_page, 1):
+            # 对话框缓存与语言无关的摘要，切换语言时只重新格式化
+            try:
+                infos[backup] = self.modifier.backup_summary(backup)
+            except Exception:
+                pass  # 读取失败时由对话框显示错误
+            progress(backup.name, i * 100 // len(first_page))
+        return backups, infos
+
+    def _show_backup_dialog(self, result):
+        backups, infos = result
         if not backups:
             self.log("未找到备份")
             return
         
-        dialog = BackupDialog(self, backups, self.modifier)
+        dialog = BackupDialog(self, backups, self.modifier, infos)
         dialog.exec()
+        # 关闭后销毁对话框，其控件随之从翻译登记中移除
+        dialog.deleteLater()
     
     def create_backup(self):
         """创建备份"""
         creating_msg = ("正在创建备份..." if self.current_language == Language.CHINESE 
                        else "Creating backup...")
         self.log(creating_msg)
-        backup_path = self.modifier.backup_config()
+        self.tasks.submit('backup', self.modifier.backup_config,
+                          on_done=self._on_backup_created)
+
+    def _on_backup_created(self, backup_path):
         if backup_path:
             success_msg = (f"备份创建成功: {backup_path}" if self.current_language == Language.CHINESE 
                           else f"Backup created successfully: {backup_path}")
@@ -982,9 +1093,8 @@ class MainWindow(QMainWindow):
                         else "Disabling auto-update...")
         self.log(disabling_msg)
         
-        # 检查更新器状态
-        updater_path = Path(f"{self.modifier.home}/Library/Application Support/Caches/cursor-updater")
-        if updater_path.exists() and updater_path.stat().st_size == 0:
+        # 检查更新状态 (内存中的状态由文件监听保持最新)
+        if self.update_state.enabled is False:
             # 已经是禁用状态
             status_msg = ("自动更新已经处于禁用状态" if self.current_language == Language.CHINESE 
                          else "Auto-update is already disabled")
@@ -996,7 +1106,11 @@ class MainWindow(QMainWindow):
             )
             return
         
-        if self.modifier.disable_auto_update():
+        self.tasks.submit('disable_update', self.modifier.disable_auto_update,
+                          on_done=self._on_update_disabled)
+
+    def _on_update_disabled(self, ok):
+        if ok:
             disabled_msg = ("自动更新已成功禁用" if self.current_language == Language.CHINESE 
                            else "Auto-update has been disabled successfully")
             self.log(disabled_msg)
@@ -1005,7 +1119,7 @@ class MainWindow(QMainWindow):
                 self.current_language['messages']['success'],
                 disabled_msg
             )
-            self.update_update_control_buttons()  # 更新按钮状态
+            self.update_state.refresh()  # 更新按钮状态
 
     def enable_auto_update(self):
         """恢复自动更新"""
@@ -1013,9 +1127,8 @@ class MainWindow(QMainWindow):
                        else "Enabling auto-update...")
         self.log(enabling_msg)
         
-        # 检查更新器状态
-        updater_path = Path(f"{self.modifier.home}/Library/Application Support/Caches/cursor-updater")
-        if not updater_path.exists() or updater_path.stat().st_size > 0:
+        # 检查更新状态 (内存中的状态由文件监听保持最新)
+        if self.update_state.enabled:
             # 已经是启用状态
             status_msg = ("自动更新已经处于启用状态" if self.current_language == Language.CHINESE 
                          else "Auto-update is already enabled")
@@ -1027,7 +1140,11 @@ class MainWindow(QMainWindow):
             )
             return
         
-        if self.modifier.enable_auto_update():
+        self.tasks.submit('enable_update', self.modifier.enable_auto_update,
+                          on_done=self._on_update_enabled)
+
+    def _on_update_enabled(self, ok):
+        if ok:
             enabled_msg = ("自动更新已成功恢复" if self.current_language == Language.CHINESE 
                           else "Auto-update has been enabled successfully")
             self.log(enabled_msg)
@@ -1036,7 +1153,7 @@ class MainWindow(QMainWindow):
                 self.current_language['messages']['success'],
                 enabled_msg
             )
-            self.update_update_control_buttons()  # 更新按钮状态
+            self.update_state.refresh()  # 更新按钮状态
     
     def show_about(self):
         """显示关于信息"""
@@ -1056,88 +1173,54 @@ class MainWindow(QMainWindow):
             Messages.ENGLISH if self.current_language == Language.ENGLISH 
             else Messages.CHINESE
         )
-        self.update_ui_text()
-        
-    def update_ui_text(self):
-        """更新界面文本"""
-        try:
-            # 更新窗口标题
-            self.setWindowTitle(self.current_language['title'])
-            
-            # 更新版本标签
-            version_label = self.findChild(QLabel, "version_label")
-            if version_label:
-                version = self.modifier.get_cursor_version()
-                version_label.setText(
-                    self.current_language['version'].format(version or "N/A")
-                )
-            
-            # 更新日志标题
-            log_title = self.findChild(QLabel, "log_title")
-            if log_title:
-                log_title.setText(self.current_language['log_title'])
-            
-            # 更新状态栏
-            self.statusBar().showMessage(self.current_language['status_ready'])
-            
-            # 更新所有按钮
-            for group_name, buttons in [
-                ('id_management', ['generate', 'view_current']),
-                ('backup_management', ['view_backup', 'create_backup']),
-                ('update_control', ['disable_update', 'enable_update']),
-                ('others', ['about', 'switch_lang'])
-            ]:
-                # 更新按钮文本
-                for btn_name in buttons:
-                    btn = self.findChild(QPushButton, f"{group_name}_{btn_name}")
-                    if btn and group_name != 'update_control':  # 跳过更新控制按钮，由专门的方法处理
-                        btn.setText(self.current_language['buttons'][group_name][btn_name])
-            
-            # 更新更新控制按钮的状态和文字
-            self.update_update_control_buttons()
-            
-        except Exception as e:
-            print(f"更新界面文本时出错: {e}")
+        # 一次更新所有已登记的控件 (包括打开的对话框)
+        self.i18n.switch('en' if self.current_language == Language.ENGLISH else 'zh')
 
-    def update_update_control_buttons(self):
-        """更新控制按钮状态"""
-        updater_path = Path(f"{self.modifier.home}/Library/Application Support/Caches/cursor-updater")
-        is_update_disabled = updater_path.exists() and updater_path.stat().st_size == 0
-        
-        disable_btn = self.findChild(QPushButton, "update_control_disable_update")
-        enable_btn = self.findChild(QPushButton, "update_control_enable_update")
-        
-        if disable_btn and enable_btn:
-            if is_update_disabled:
-                # 更新已禁用
-                disable_btn.setText(self.current_language['buttons']['update_control']['disable_update'] + 
-                                  self.current_language['status']['disabled'])
-                disable_btn.setEnabled(False)
-                
-                enable_btn.setText(self.current_language['buttons']['update_control']['enable_update'])
-                enable_btn.setEnabled(True)
-            else:
-                # 更新已启用
-                enable_btn.setText(self.current_language['buttons']['update_control']['enable_update'] + 
-                                 self.current_language['status']['enabled'])
-                enable_btn.setEnabled(False)
-                
-                disable_btn.setText(self.current_language['buttons']['update_control']['disable_update'])
-                disable_btn.setEnabled(True)
+    def _retranslate_update_state(self):
+        """切换语言后按更新状态重新设置更新控制按钮的文字"""
+        if self.update_state.enabled is not None:
+            self._apply_update_state(self.update_state.enabled)
+
+    def _apply_update_state(self, is_update_enabled):
+        """根据更新状态设置按钮 (更新状态变化或切换语言时调用)"""
+        texts = self.current_language['buttons']['update_control']
+        if is_update_enabled:
+            # 更新已启用
+            self.enable_update_btn.setText(texts['enable_update'] + self.current_language['status']['enabled'])
+            self.disable_update_btn.setText(texts['disable_update'])
+        else:
+            # 更新已禁用
+            self.disable_update_btn.setText(texts['disable_update'] + self.current_language['status']['disabled'])
+            self.enable_update_btn.setText(texts['enable_update'])
+        self.enable_update_btn.setEnabled(not is_update_enabled)
+        self.disable_update_btn.setEnabled(is_update_enabled)
+        # 已生效的一侧显示为灰色 (state 属性，样式表只解析一次)
+        set_state(self.disable_update_btn, None if is_update_enabled else 'active')
+        set_state(self.enable_update_btn, 'active' if is_update_enabled else None)
 
 class BackupDialog(QDialog):
     """备份管理对话框"""
-    def __init__(self, parent, backups, modifier):
+    def __init__(self, parent, backups, modifier, infos=None):
         super().__init__(parent)
-        self.backups = backups
         self.modifier = modifier
         self.parent = parent
-        self.current_language = parent.current_language
+        # 备份列表组件在第一次打开对话框时才导入
+        from cursor_tool.qt.backup_view import BackupListModel
+        # 已在后台读取的备份摘要由模型缓存，其余的在行第一次显示时由后台任务读取
+        # (与其他备份操作在同一个工作线程中依次执行)
+        self.model = BackupListModel(backups, self.modifier.backup_summary, infos,
+                                     tasks=parent.tasks,
+                                     formatter=self.modifier.format_backup_info, parent=self)
         self.setup_ui()
     
+    @property
+    def current_language(self):
+        return self.parent.current_language
+    
     def setup_ui(self):
         """设置对话框界面"""
-        self.setWindowTitle(self.current_language['dialog']['title'])
+        i18n = self.parent.i18n
+        i18n.bind(self, 'dialog.title', 'setWindowTitle')
         self.setMinimumWidth(800)  # 增加最小宽度
         
         layout = QVBoxLayout(self)
@@ -1145,79 +1228,33 @@ class BackupDialog(QDialog):
         layout.setContentsMargins(15, 15, 15, 15)
         
         # 添加备份列表标题
-        title_label = QLabel(self.current_language['dialog']['backup_list'])
+        title_label = i18n.bind(QLabel(), 'dialog.backup_list')
         title_label.setFont(QFont('Arial', 12, QFont.Weight.Bold))
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title_label)
         
-        # 添加备份列表
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setMinimumHeight(400)  # 增加最小高度
-        
-        content = QWidget()
-        content_layout = QVBoxLayout(content)
-        content_layout.setSpacing(10)
-        
-        for backup in self.backups:
-            frame = QFrame()
-            frame.setStyleSheet("""
-                QFrame {
-                    background-color: #ffffff;
-                    border: 1px solid #dcdde1;
-                    border-radius: 5px;
-                    padding: 10px;
-                }
-            """)
-            frame_layout = QVBoxLayout(frame)
-            frame_layout.setSpacing(10)
-            
-            # 备份信息
-            info_area = QTextEdit()
-            info_area.setReadOnly(True)
-            info_area.setFont(QFont('Menlo', 10))
-            info_area.setStyleSheet("""
-                QTextEdit {
-                    background-color: transparent;
-                    border: none;
-                    color: #2f3542;
-                }
-            """)
-            info_area.setText(self.modifier.get_backup_info(backup))
-            info_area.document().adjustSize()
-            doc_height = info_area.document().size().height()
-            info_area.setFixedHeight(min(doc_height + 20, 200))
-            
-            frame_layout.addWidget(info_area)
-            
-            # 按钮
-            btn_layout = QHBoxLayout()
-            btn_layout.setSpacing(10)
-            
-            restore_btn = QPushButton(self.current_language['dialog']['restore'])
-            restore_btn.setFixedWidth(150)
-            restore_btn.clicked.connect(lambda checked, b=backup: self.restore_backup(b))
-            btn_layout.addWidget(restore_btn)
-            
-            delete_btn = QPushButton(self.current_language['dialog']['delete'])
-            delete_btn.setFixedWidth(150)
-            delete_btn.clicked.connect(lambda checked, b=backup: self.delete_backup(b))
-            btn_layout.addWidget(delete_btn)
-            
-            btn_layout.addStretch()
-            frame_layout.addLayout(btn_layout)
-            content_layout.addWidget(frame)
-        
-        content_layout.addStretch()
-        scroll.setWidget(content)
-        layout.addWidget(scroll)
+        # 添加备份列表 (按需加载并由委托绘制每一行)
+        from cursor_tool.qt.backup_view import BackupDelegate, create_backup_view
+        self.delegate = BackupDelegate(QFont('Menlo', 10), '', '', button_width=150)
+        self.delegate.restore_clicked.connect(self.restore_backup)
+        self.delegate.delete_clicked.connect(self.delete_backup)
+        self.list_view = create_backup_view(self.model, self.delegate)
+        i18n.bind(self, ('dialog.restore', 'dialog.delete'), self._set_row_texts)
+        self.list_view.setMinimumHeight(400)
+        layout.addWidget(self.list_view)
         
         # 关闭按钮
-        close_btn = QPushButton(self.current_language['dialog']['close'])
+        close_btn = i18n.bind(QPushButton(), 'dialog.close')
         close_btn.setFixedWidth(100)
         close_btn.clicked.connect(self.close)
         layout.addWidget(close_btn, 0, Qt.AlignmentFlag.AlignCenter)
     
+    def _set_row_texts(self, restore_text, delete_text):
+        """设置列表中的按钮文本，备份信息按新语言重新格式化 (不重新读取备份)"""
+        self.delegate.set_texts(restore_text, delete_text)
+        self.model.set_formatter(self.modifier.format_backup_info)
+        self.list_view.viewport().update()
+    
     def restore_backup(self, backup):
         """恢复备份"""
         reply = QMessageBox.question(
@@ -1228,19 +1265,23 @@ class BackupDialog(QDialog):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            if self.modifier.restore_backup(backup):
-                QMessageBox.information(
-                    self,
-                    self.current_language['messages']['success'],
-                    self.current_language['messages']['backup_restored']
-                )
-                self.close()
-            else:
-                QMessageBox.warning(
-                    self,
-                    self.current_language['messages']['error'],
-                    self.current_language['messages']['restore_failed']
-                )
+            self.parent.tasks.submit('restore', self.modifier.restore_backup, backup,
+                                     on_done=self._on_restored)
+    
+    def _on_restored(self, ok):
+        if ok:
+            QMessageBox.information(
+                self,
+                self.current_language['messages']['success'],
+                self.current_language['messages']['backup_restored']
+            )
+            self.close()
+        else:
+            QMessageBox.warning(
+                self,
+                self.current_language['messages']['error'],
+                self.current_language['messages']['restore_failed']
+            )
     
     def delete_backup(self, backup):
         """删除备份"""
@@ -1252,100 +1293,44 @@ class BackupDialog(QDialog):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                os.remove(backup)
-                self.backups.remove(backup)
-                QMessageBox.information(
-                    self,
-                    self.current_language['messages']['success'],
-                    self.current_language['messages']['backup_deleted']
-                )
+            self.parent.tasks.submit('delete_backup', self.modifier.delete_backup, backup,
+                                     on_done=lambda _: self._on_deleted(backup),
+                                     on_error=self._on_delete_failed)
+    
+    def _on_deleted(self, backup):
+        try:
+            # 只移除被删除的行
+            self.model.remove_backup(backup)
+            QMessageBox.information(
+                self,
+                self.current_language['messages']['success'],
+                self.current_language['messages']['backup_deleted']
+            )
+            
+            if not self.model.backups:  # 如果没有备份了，关闭对话框
+                self.close()
                 
-                if not self.backups:  # 如果没有备份了，关闭对话框
-                    self.close()
-                else:
-                    # 清除当前内容
-                    scroll_area = self.findChild(QScrollArea)
-                    if scroll_area:
-                        old_widget = scroll_area.widget()
-                        if old_widget:
-                            old_widget.deleteLater()
-                        
-                        # 创建新的内容部件
-                        content = QWidget()
-                        content_layout = QVBoxLayout(content)
-                        content_layout.setSpacing(10)
-                        
-                        # 重新添加剩余的备份
-                        for backup in self.backups:
-                            frame = QFrame()
-                            frame.setStyleSheet("""
-                                QFrame {
-                                    background-color: #ffffff;
-                                    border: 1px solid #dcdde1;
-                                    border-radius: 5px;
-                                }
-                            """)
-                            frame_layout = QVBoxLayout(frame)
-                            frame_layout.setSpacing(10)
-                            
-                            # 备份信息
-                            info_area = QTextEdit()
-                            info_area.setReadOnly(True)
-                            info_area.setFont(QFont('Menlo', 10))
-                            info_area.setStyleSheet("""
-                                QTextEdit {
-                                    background-color: transparent;
-                                    border: none;
-                                    color: #2f3542;
-                                }
-                            """)
-                            info_area.setText(self.modifier.get_backup_info(backup))
-                            info_area.document().adjustSize()
-                            doc_height = info_area.document().size().height()
-                            info_area.setFixedHeight(min(doc_height + 20, 200))
-                            
-                            frame_layout.addWidget(info_area)
-                            
-                            # 按钮
-                            btn_layout = QHBoxLayout()
-                            btn_layout.setSpacing(10)
-                            
-                            restore_btn = QPushButton(self.current_language['dialog']['restore'])
-                            restore_btn.setFixedWidth(150)
-                            restore_btn.clicked.connect(lambda checked, b=backup: self.restore_backup(b))
-                            btn_layout.addWidget(restore_btn)
-                            
-                            delete_btn = QPushButton(self.current_language['dialog']['delete'])
-                            delete_btn.setFixedWidth(150)
-                            delete_btn.clicked.connect(lambda checked, b=backup: self.delete_backup(b))
-                            btn_layout.addWidget(delete_btn)
-                            
-                            btn_layout.addStretch()
-                            frame_layout.addLayout(btn_layout)
-                            content_layout.addWidget(frame)
-                        
-                        content_layout.addStretch()
-                        scroll_area.setWidget(content)
-                    
-            except Exception as e:
-                QMessageBox.warning(
-                    self,
-                    self.current_language['messages']['error'],
-                    self.current_language['messages']['delete_failed'].format(e)
-                )
+        except Exception as e:
+            self._on_delete_failed(e)
+    
+    def _on_delete_failed(self, error):
+        QMessageBox.warning(
+            self,
+            self.current_language['messages']['error'],
+            self.current_language['messages']['delete_failed'].format(error)
+        )
 
 class ConfigViewDialog(QDialog):
     """配置查看对话框"""
     def __init__(self, parent, config):
         super().__init__(parent)
         self.config = config
-        self.current_language = parent.current_language
+        self.i18n = parent.i18n
         self.setup_ui()
     
     def setup_ui(self):
         """设置对话框界面"""
-        self.setWindowTitle(self.current_language['dialog']['config_title'])
+        self.i18n.bind(self, 'dialog.config_title', 'setWindowTitle')
         self.setMinimumWidth(500)  # 只设置最小宽度
         
         layout = QVBoxLayout(self)
@@ -1356,15 +1341,7 @@ class ConfigViewDialog(QDialog):
         text_area = QTextEdit()
         text_area.setReadOnly(True)
         text_area.setFont(QFont('Menlo', 12))
-        text_area.setStyleSheet("""
-            QTextEdit {
-                background-color: #ffffff;
-                color: #2f3542;
-                border: 1px solid #dcdde1;
-                border-radius: 5px;
-                padding: 10px;
-            }
-        """)
+        text_area.setObjectName("config_view")
         
         # 格式化配置内容
         formatted_config = json.dumps(self.config, indent=2, ensure_ascii=False)
@@ -1378,7 +1355,7 @@ class ConfigViewDialog(QDialog):
         layout.addWidget(text_area)
         
         # 关闭按钮
-        close_btn = QPushButton(self.current_language['dialog']['close'])
+        close_btn = self.i18n.bind(QPushButton(), 'dialog.close')
         close_btn.setFixedWidth(100)
         close_btn.clicked.connect(self.close)
         layout.addWidget(close_btn, 0, Qt.AlignmentFlag.AlignCenter)
@@ -1388,15 +1365,22 @@ class ConfigViewDialog(QDialog):
 
 def main():
     """主函数"""
+    # 打包后的程序以特权助手模式运行
+    if len(sys.argv) > 2 and sys.argv[1] == '--privileged-helper':
+        from cursor_tool.mac_helper import serve
+        serve(sys.argv[2])
+        return
+    
     app = QApplication(sys.argv)
     
-    # 在创建主窗口前检查权限
-    if not is_admin():
-        run_as_admin()
+    # 在创建主窗口前获取权限 (启动特权助手)
+    session = run_as_admin()
     
-    window = MainWindow()
+    window = MainWindow(session)
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    session.close()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1 @@
+"""Cursor ID 修改器的共享组件"""
@@ -0,0 +1,6 @@
+"""python -m cursor_tool: 命令行入口"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
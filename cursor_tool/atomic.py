@@ -0,0 +1,153 @@
+"""原子写入
+
+storage.json、state.json 和备份都通过 atomic_write 写入：
+先写同目录下的临时文件并 fsync，再 os.replace 替换目标文件，最后 fsync 所在目录，
+写入过程中崩溃或被结束时，目标文件要么是旧内容，要么是完整的新内容。
+atomic_copy 以同样的方式用另一个文件的内容替换目标文件，临时文件由 fastcopy 填充
+(支持时为写时复制克隆，数据不经过 Python)。
+
+一次操作修改多个文件时，用 sync_batch() 把目录同步推迟到批次结束，
+同一个目录只同步一次:
+
+    with sync_batch():
+        atomic_write(storage_path, data)
+        atomic_write(state_path, state)
+"""
+import contextlib
+import os
+import tempfile
+import threading
+
+from . import trace
+from .fastcopy import copy_file
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_local = threading.local()
+
+
+def _fsync(fd):
+    """把文件内容写到磁盘 (macOS 上 fsync 不会刷新磁盘缓存，使用 F_FULLFSYNC)"""
+    if fcntl is not None and hasattr(fcntl, 'F_FULLFSYNC'):
+        try:
+            fcntl.fcntl(fd, fcntl.F_FULLFSYNC)
+            return
+        except OSError:
+            pass
+    os.fsync(fd)
+
+
+def fsync_directory(directory):
+    """同步目录项，使 rename 持久化 (Windows 不支持打开目录，直接跳过)"""
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        _fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def sync_batch():
+    """合并批次内的目录同步，批次结束时每个目录只同步一次 (可嵌套)"""
+    if getattr(_local, 'pending', None) is not None:
+        yield
+        return
+    _local.pending = {}
+    try:
+        yield
+    finally:
+        pending, _local.pending = _local.pending, None
+        for directory in pending:
+            fsync_directory(directory)
+
+
+def sync_pending():
+    """立即同步批次中已登记的目录 (用于必须先持久化的文件，如清单引用的对象)"""
+    pending = getattr(_local, 'pending', None)
+    if pending:
+        for directory in list(pending):
+            fsync_directory(directory)
+        pending.clear()
+
+
+def atomic_write(path, data, mode=None, keep_owner=False):
+    """原子写入文件
+
+    mode: 新文件的权限，为 None 时沿用原文件的权限 (新文件按 umask)
+    keep_owner: 以 root 身份运行时保留原文件的属主
+    """
+    def fill(fd, temp_path):
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            trace.count('bytes_written', len(data))
+            f.flush()
+            _fsync(f.fileno())
+
+    _replace(path, fill, mode, keep_owner)
+
+
+def atomic_copy(source, path, mode=None, keep_owner=False):
+    """原子地用 source 的内容替换文件，参数同 atomic_write，返回 fastcopy 使用的复制方式"""
+    method = None
+
+    def fill(fd, temp_path):
+        nonlocal method
+        os.close(fd)
+        method = copy_file(source, temp_path)
+        # 克隆可能带来 source 的只读权限，先设为可写以便 fsync (最终权限随后设置)
+        os.chmod(temp_path, 0o600)
+        fd = os.open(temp_path, os.O_RDWR)
+        try:
+            _fsync(fd)
+        finally:
+            os.close(fd)
+
+    _replace(path, fill, mode, keep_owner)
+    return method
+
+
+def _replace(path, fill, mode, keep_owner):
+    """fill(fd, temp_path) 写入同目录下的临时文件 (负责关闭 fd)，然后替换 path"""
+    path = os.fspath(path)
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        st = None
+    if mode is None:
+        if st is not None:
+            mode = st.st_mode & 0o7777
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        fill(fd, temp_path)
+        if keep_owner and st is not None and hasattr(os, 'geteuid') and os.geteuid() == 0:
+            os.chown(temp_path, st.st_uid, st.st_gid)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    pending = getattr(_local, 'pending', None)
+    if pending is not None:
+        pending[directory] = True
+    else:
+        fsync_directory(directory)
@@ -0,0 +1,102 @@
+"""备份摘要目录
+
+备份对话框只需要每个备份的 telemetry.* 字段，不必每次打开或切换语言都完整解析备份。
+目录以 JSON Lines 格式持久化每个备份的摘要，按 (名称, 版本键) 缓存：
+清单中的备份用内容哈希作为版本键，旧版本的备份文件用 (mtime, size)。
+
+每行一条记录，后写入的记录覆盖先前的同名记录；失效记录过多时整体重写。
+"""
+import json
+import os
+import threading
+
+from .atomic import atomic_write
+
+# 摘要需要的顶层键前缀
+SUMMARY_PREFIXES = ('telemetry.',)
+
+
+class BackupCatalog:
+    """备份摘要目录 (JSON Lines)"""
+    def __init__(self, path):
+        self.path = str(path)
+        self.records = None  # 名称 -> {'name', 'key', 'summary'}
+        self.lines = 0       # 文件中的记录行数，用于判断是否需要压缩
+        self.lock = threading.Lock()
+
+    def _load(self):
+        if self.records is not None:
+            return
+        self.records = {}
+        self.lines = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # 跳过写入中断留下的残行
+                    self.lines += 1
+                    if record.get('summary') is None:
+                        self.records.pop(record.get('name'), None)
+                    else:
+                        self.records[record['name']] = record
+        except FileNotFoundError:
+            pass
+
+    def _append(self, record):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.lines += 1
+        if self.lines > 64 and self.lines > 2 * len(self.records):
+            self._compact()
+
+    def _compact(self):
+        """只保留有效记录重写目录文件"""
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n'
+                       for record in self.records.values())
+        atomic_write(self.path, data.encode('utf-8'))
+        self.lines = len(self.records)
+
+    def get(self, name, key):
+        """读取缓存的摘要，版本键不一致时返回 None"""
+        with self.lock:
+            self._load()
+            record = self.records.get(name)
+            if record is not None and record['key'] == key:
+                return record['summary']
+            return None
+
+    def get_by_key(self, key):
+        """按版本键查找摘要 (内容相同的备份共享摘要)"""
+        with self.lock:
+            self._load()
+            for record in self.records.values():
+                if record['key'] == key:
+                    return record['summary']
+            return None
+
+    def put(self, name, key, summary):
+        """保存摘要"""
+        with self.lock:
+            self._load()
+            record = {'name': name, 'key': key, 'summary': summary}
+            if self.records.get(name) == record:
+                return
+            self.records[name] = record
+            self._append(record)
+
+    def discard(self, name):
+        """删除摘要"""
+        with self.lock:
+            self._load()
+            if self.records.pop(name, None) is not None:
+                self._append({'name': name, 'key': None, 'summary': None})
+
+
+def summarize(config):
+    """提取备份摘要 (所有 telemetry.* 字段)"""
+    return {
+        'telemetry': {k: v for k, v in config.items() if k.startswith(SUMMARY_PREFIXES)},
+    }
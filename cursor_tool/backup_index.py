@@ -0,0 +1,97 @@
+"""备份目录中旧版本完整备份文件的索引
+
+一次 os.scandir 得到所有匹配的文件 (名称、时间、大小)，之后只要目录的 mtime
+不变就直接使用内存中的结果，不再扫描目录。新增或删除文件会改变目录的 mtime；
+清单和对象写在 .store 子目录中，不影响本目录的 mtime。
+
+mtime 精度较低的文件系统 (如 HFS+ 为 1 秒) 上，扫描之后同一时间单位内的变化
+不会改变 mtime，所以 mtime 为整秒且距现在不到 RACY_SECONDS 的目录不信任缓存，
+下次仍重新扫描。文件监视器可以调用 invalidate() 强制重新扫描。
+"""
+import fnmatch
+import os
+import threading
+import time
+
+# 目录 mtime 为整秒 (低精度文件系统) 且距现在不到这个秒数时，不信任缓存
+RACY_SECONDS = 2.0
+
+
+class LegacyIndex:
+    """按目录 mtime 缓存的备份文件列表"""
+    def __init__(self, directory, pattern):
+        self.directory = str(directory)
+        self.pattern = pattern
+        self.lock = threading.Lock()
+        self._signature = None
+        self._entries = []
+        self._names = {}
+        self.version = 0  # 每次内容变化时加 1，用于上层缓存的失效判断
+
+    def _directory_signature(self):
+        try:
+            st = os.stat(self.directory)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns)
+
+    def _trusted(self, signature):
+        """签名可以用于判断之后的变化时返回签名，否则返回 None"""
+        if signature is None:
+            return None
+        mtime_ns = signature[1]
+        coarse = mtime_ns % 1_000_000_000 == 0
+        if coarse and time.time() - mtime_ns / 1e9 < RACY_SECONDS:
+            return None
+        return signature
+
+    def _scan(self):
+        entries = []
+        if os.path.isdir(self.directory):
+            with os.scandir(self.directory) as items:
+                for item in items:
+                    if item.is_file() and fnmatch.fnmatch(item.name, self.pattern):
+                        st = item.stat()
+                        entries.append({
+                            'name': item.name,
+                            'timestamp': st.st_mtime,
+                            'size': st.st_size,
+                            'file': item.path,
+                        })
+        return entries
+
+    def entries(self):
+        """所有匹配的备份文件 (请勿修改返回的列表)"""
+        with self.lock:
+            signature = self._directory_signature()
+            if signature is None or signature != self._signature:
+                entries = self._scan()
+                if entries != self._entries:
+                    self._entries = entries
+                    self._names = {entry['name']: entry for entry in entries}
+                    self.version += 1
+                self._signature = self._trusted(signature)
+            return self._entries
+
+    def get(self, name):
+        """按名称查找 (使用当前的索引)"""
+        self.entries()
+        return self._names.get(name)
+
+    def discard(self, names):
+        """文件已被本进程删除，直接更新索引"""
+        names = set(names) & self._names.keys()
+        with self.lock:
+            if names:
+                for name in names:
+                    del self._names[name]
+                self._entries = [entry for entry in self._entries if entry['name'] not in names]
+                self.version += 1
+            # 删除改变了目录的 mtime，索引已同步更新，记录新的签名
+            if self._signature is not None:
+                self._signature = self._trusted(self._directory_signature())
+
+    def invalidate(self):
+        """强制下次重新扫描 (如文件监视器报告目录变化)"""
+        with self.lock:
+            self._signature = None
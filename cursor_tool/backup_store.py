@@ -0,0 +1,479 @@
+"""内容寻址的备份存储
+
+每个 storage.json 快照按 SHA-256 存为一个对象，相同内容只保存一次；
+清单 (manifest.json) 记录每次备份的名称、时间和对应的对象。
+
+    backups/
+        .store/manifest.json
+        .store/objects/ab/ab12...   快照内容
+        backup_20250101_120000.json 旧版本留下的完整备份 (仍可列出和恢复)
+
+对象分两种：
+    full   完整快照，压缩存储，作为差异的基准
+    delta  相对基准快照的顶层键 JSON Patch (RFC 6902)，压缩存储
+
+相邻的备份通常只有几个 telemetry.* / update.* 键不同，所以大多数备份只需保存
+很小的差异。每隔 FULL_EVERY 个差异、或差异不再明显小于完整快照时，重新保存一个完整基准。
+差异备份恢复出的内容与原快照语义相同 (键和值一致)，但不保证逐字节相同。
+
+备份路径对外仍表现为 backups/<名称>，但清单中的备份在磁盘上没有对应文件，
+读取、恢复和删除都要通过 BackupStore 完成。
+"""
+import datetime
+import fnmatch
+import hashlib
+import json
+import os
+import zlib
+
+from . import trace
+from .atomic import atomic_write, sync_batch, sync_pending
+from .backup_catalog import SUMMARY_PREFIXES, BackupCatalog, summarize
+from .backup_index import LegacyIndex
+from .json_scan import read_keys, scan_keys
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖，未安装时使用 zlib
+    zstandard = None
+
+
+# ---------------------------------------------------------------- 压缩
+
+def compress(data):
+    """压缩数据，返回 (编码, 压缩后的数据)"""
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=10).compress(data)
+    return 'zlib', zlib.compress(data, 6)
+
+
+def decompress(codec, data):
+    """按编码解压数据"""
+    if codec == 'raw':
+        return data
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("该备份使用 zstd 压缩，需要安装 zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"未知的压缩编码: {codec}")
+
+
+# ---------------------------------------------------------------- 顶层键差异
+
+def _pointer(key):
+    return '/' + key.replace('~', '~0').replace('/', '~1')
+
+
+def _unpointer(path):
+    return path[1:].replace('~1', '/').replace('~0', '~')
+
+
+def make_patch(base, target):
+    """生成把 base 变为 target 的顶层键 JSON Patch"""
+    patch = [{'op': 'remove', 'path': _pointer(key)} for key in base if key not in target]
+    for key, value in target.items():
+        if key not in base:
+            patch.append({'op': 'add', 'path': _pointer(key), 'value': value})
+        elif base[key] != value:
+            patch.append({'op': 'replace', 'path': _pointer(key), 'value': value})
+    return patch
+
+
+def apply_patch(base, patch):
+    """对 base 应用顶层键 JSON Patch，返回新的字典"""
+    result = dict(base)
+    for op in patch:
+        key = _unpointer(op['path'])
+        if op['op'] == 'remove':
+            result.pop(key, None)
+        elif op['op'] in ('add', 'replace'):
+            result[key] = op['value']
+        else:
+            raise ValueError(f"不支持的 JSON Patch 操作: {op['op']}")
+    return result
+
+
+class BackupStore:
+    """内容寻址、去重的备份存储"""
+    STORE_DIR = '.store'
+    # 每个基准快照最多对应的差异数量
+    FULL_EVERY = 16
+    # 压缩后的差异超过完整快照的这个比例时，改为保存完整快照
+    DELTA_RATIO = 0.5
+
+    def __init__(self, backup_dir, name_format, legacy_pattern):
+        """
+        backup_dir: 备份目录
+        name_format: 新备份的名称格式，如 'backup_{timestamp}.json'
+        legacy_pattern: 旧版本完整备份文件的匹配模式，如 '*.json'
+        """
+        self.backup_dir = str(backup_dir)
+        self.name_format = name_format
+        self.legacy_pattern = legacy_pattern
+        self.store_dir = os.path.join(self.backup_dir, self.STORE_DIR)
+        self.manifest_path = os.path.join(self.store_dir, 'manifest.json')
+        self.objects_dir = os.path.join(self.store_dir, 'objects')
+        self.catalog = BackupCatalog(os.path.join(self.store_dir, 'catalog.jsonl'))
+        # 旧版本备份文件的索引，目录不变时不再扫描
+        self.legacy = LegacyIndex(self.backup_dir, legacy_pattern)
+        # 按 (时间, 名称) 排序的全部备份，清单或旧备份变化时重建
+        self._listing = None
+        self._listing_key = None
+        self._base_cache = (None, None)  # (对象ID, 解析后的基准快照)
+        # 清单缓存，清单文件的 (mtime, size) 变化时重新读取
+        self._manifest = None
+        self._manifest_sig = None
+        self._index = {}  # 名称 -> 清单条目
+        self._manifest_version = 0  # 清单每次读取或保存时加 1
+
+    # ------------------------------------------------------------ 清单
+
+    def _manifest_signature(self):
+        try:
+            st = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load_manifest(self):
+        sig = self._manifest_signature()
+        if self._manifest is not None and sig == self._manifest_sig:
+            return self._manifest
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = {}
+        manifest['version'] = 2
+        manifest.setdefault('entries', [])
+        manifest.setdefault('objects', {})  # 对象ID -> 对象信息，缺失时为未压缩的完整快照
+        manifest.setdefault('base', None)   # 当前用于生成差异的基准
+        self._set_manifest(manifest, sig)
+        return manifest
+
+    def _set_manifest(self, manifest, sig):
+        self._manifest = manifest
+        self._manifest_sig = sig
+        self._index = {entry['name']: entry for entry in manifest['entries']}
+        self._manifest_version += 1
+
+    def _save_manifest(self, manifest):
+        try:
+            atomic_write(self.manifest_path, json.dumps(manifest, indent=2).encode('utf-8'))
+        except BaseException:
+            self._manifest = None  # 内存中的修改未能保存，下次重新读取
+            raise
+        self._set_manifest(manifest, self._manifest_signature())
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _object_info(self, manifest, digest):
+        return manifest['objects'].get(digest, {'kind': 'full', 'codec': 'raw'})
+
+    def _legacy_entries(self):
+        """旧版本留下的完整备份文件"""
+        return self.legacy.entries()
+
+    # ------------------------------------------------------------ 对象
+
+    def _read_object(self, manifest, digest):
+        """读取并还原对象内容 (bytes)"""
+        info = self._object_info(manifest, digest)
+        with open(self._object_path(digest), 'rb') as f:
+            packed = f.read()
+        trace.count('bytes_read', len(packed))
+        data = decompress(info['codec'], packed)
+        if info['kind'] == 'full':
+            return data
+        base = self._load_base(manifest, info['base'])
+        patch = json.loads(data)
+        return json.dumps(apply_patch(base, patch), indent=2).encode('utf-8')
+
+    def _load_base(self, manifest, digest):
+        """读取并解析基准快照 (带缓存)"""
+        cached_digest, cached = self._base_cache
+        if cached_digest != digest:
+            cached = json.loads(self._read_object(manifest, digest))
+            self._base_cache = (digest, cached)
+        return cached
+
+    def _store_object(self, manifest, digest, data):
+        """保存新对象，能生成差异时只保存差异
+
+        返回解析后的快照，不是 JSON 对象时返回 None。
+        """
+        try:
+            config = json.loads(data)
+        except ValueError:
+            config = None
+
+        codec, packed = compress(data)
+        info = {'kind': 'full', 'codec': codec, 'stored': len(packed)}
+
+        base_digest = manifest['base']
+        if isinstance(config, dict) and base_digest in manifest['objects']:
+            base_info = manifest['objects'][base_digest]
+            if base_info.get('deltas', 0) < self.FULL_EVERY:
+                base = self._load_base(manifest, base_digest)
+                patch = json.dumps(make_patch(base, config)).encode('utf-8')
+                delta_codec, delta = compress(patch)
+                if len(delta) < len(packed) * self.DELTA_RATIO:
+                    codec, packed = delta_codec, delta
+                    info = {'kind': 'delta', 'codec': codec, 'stored': len(packed),
+                            'base': base_digest}
+
+        atomic_write(self._object_path(digest), packed)
+        # 对象写入成功后才修改清单 (内存中的清单随后才保存)
+        if info['kind'] == 'delta':
+            base_info = manifest['objects'][info['base']]
+            base_info['deltas'] = base_info.get('deltas', 0) + 1
+        manifest['objects'][digest] = info
+        if info['kind'] == 'full' and isinstance(config, dict):
+            # 新的完整快照成为后续差异的基准
+            info['deltas'] = 0
+            manifest['base'] = digest
+            self._base_cache = (digest, config)
+        return config if isinstance(config, dict) else None
+
+    # ------------------------------------------------------------ 查询
+
+    def _sorted_entries(self):
+        """按 (时间, 名称) 排序的全部备份 (缓存，请勿修改)"""
+        legacy = self._legacy_entries()
+        manifest = self._load_manifest()
+        key = (self.legacy.version, self._manifest_version)
+        if self._listing is None or self._listing_key != key:
+            self._listing = sorted(legacy + manifest['entries'],
+                                   key=lambda entry: (entry['timestamp'], entry['name']))
+            self._listing_key = key
+        return self._listing
+
+    def entries(self):
+        """所有备份 (从旧到新)"""
+        return list(self._sorted_entries())
+
+    def count(self):
+        return len(self._sorted_entries())
+
+    def page(self, offset=0, limit=None, newest_first=False):
+        """按时间顺序取一页备份条目
+
+        newest_first 为 True 时 offset 从最新的备份开始计算。
+        """
+        listing = self._sorted_entries()
+        total = len(listing)
+        end = total if limit is None else min(offset + limit, total)
+        if offset >= end:
+            return []
+        if newest_first:
+            return listing[total - end:total - offset][::-1]
+        return listing[offset:end]
+
+    def paths(self, offset=0, limit=None, newest_first=False):
+        """备份的路径 (默认全部，从旧到新)"""
+        return [self.path_of(entry) for entry in self.page(offset, limit, newest_first)]
+
+    def invalidate(self):
+        """备份目录在别处发生变化 (如文件监视器通知)，下次重新扫描"""
+        self.legacy.invalidate()
+        self._listing = None
+
+    def usage_entries(self):
+        """所有备份及其实际占用的字节数 ('stored')，用于保留策略的大小限制
+
+        清单中的备份按对象压缩后的大小计算，共享同一对象的备份带相同的 'blob'，
+        差异备份带依赖的基准 'base' 和它的大小 'base_stored'。
+        """
+        manifest = self._load_manifest()
+        return [self._with_usage(manifest, entry) for entry in self.entries()]
+
+    def usage_entry(self, backup_path):
+        """单个备份及其实际占用的字节数，不存在时返回 None"""
+        entry = self.find(backup_path)
+        if entry is None:
+            return None
+        return self._with_usage(self._load_manifest(), entry)
+
+    def _with_usage(self, manifest, entry):
+        if 'blob' not in entry:
+            return entry
+        info = self._object_info(manifest, entry['blob'])
+        usage = dict(entry, stored=info.get('stored', entry['size']))
+        if info.get('base'):
+            # 差异备份同时占用它的基准 (基准在没有备份依赖它之前不会被删除)
+            usage['base'] = info['base']
+            usage['base_stored'] = self._object_info(manifest, info['base']).get('stored', 0)
+        return usage
+
+    def path_of(self, entry):
+        return os.path.join(self.backup_dir, entry['name'])
+
+    def find(self, backup_path):
+        """按路径查找备份，不存在时返回 None"""
+        name = os.path.basename(str(backup_path))
+        self._load_manifest()
+        entry = self._index.get(name)
+        if entry is not None:
+            return entry
+        file_path = os.path.join(self.backup_dir, name)
+        if os.path.isfile(file_path) and fnmatch.fnmatch(name, self.legacy_pattern):
+            st = os.stat(file_path)
+            return {'name': name, 'timestamp': st.st_mtime, 'size': st.st_size, 'file': file_path}
+        return None
+
+    def exists(self, backup_path):
+        return self.find(backup_path) is not None
+
+    def read(self, backup_path):
+        """读取备份内容 (bytes)"""
+        entry = self.find(backup_path)
+        if entry is None:
+            raise FileNotFoundError(f"备份不存在: {backup_path}")
+        if 'file' in entry:
+            with open(entry['file'], 'rb') as f:
+                data = f.read()
+            trace.count('bytes_read', len(data))
+            return data
+        return self._read_object(self._load_manifest(), entry['blob'])
+
+    def file_of(self, backup_path):
+        """备份在磁盘上的完整文件 (旧版本备份)，清单中的备份返回 None"""
+        entry = self.find(backup_path)
+        if entry is None:
+            raise FileNotFoundError(f"备份不存在: {backup_path}")
+        return entry.get('file')
+
+    def summary(self, backup_path):
+        """读取备份摘要 (时间和 telemetry.* 字段)
+
+        摘要缓存在目录中，只有备份内容变化时才重新读取备份，且只读取需要的键。
+        """
+        entry = self.find(backup_path)
+        if entry is None:
+            raise FileNotFoundError(f"备份不存在: {backup_path}")
+        key = entry.get('blob') or [entry['timestamp'], entry['size']]
+        summary = self.catalog.get(entry['name'], key)
+        if summary is None:
+            if 'file' in entry:
+                fields = read_keys(entry['file'], prefixes=SUMMARY_PREFIXES)
+            else:
+                fields = scan_keys(self.read(backup_path), prefixes=SUMMARY_PREFIXES)
+            summary = summarize(fields)
+            self.catalog.put(entry['name'], key, summary)
+        return dict(summary, name=entry['name'], timestamp=entry['timestamp'])
+
+    # ------------------------------------------------------------ 修改
+
+    def add(self, data, timestamp=None):
+        """保存一份快照，返回备份路径
+
+        内容相同的快照只保存一个对象，新增的只是清单中的一条记录。
+        """
+        timestamp = timestamp or datetime.datetime.now()
+        digest = hashlib.sha256(data).hexdigest()
+
+        with sync_batch():
+            return self._add(data, timestamp, digest)
+
+    def _add(self, data, timestamp, digest):
+        manifest = self._load_manifest()
+        config = None
+        if digest not in manifest['objects'] and not os.path.exists(self._object_path(digest)):
+            config = self._store_object(manifest, digest, data)
+            # 清单引用对象之前，对象必须已经持久化
+            sync_pending()
+
+        names = {entry['name'] for entry in manifest['entries']}
+        names.update(entry['name'] for entry in self._legacy_entries())
+        stamp = timestamp.strftime('%Y%m%d_%H%M%S')
+        name = self.name_format.format(timestamp=stamp)
+        counter = 1
+        while name in names:
+            name = self.name_format.format(timestamp=f"{stamp}_{counter}")
+            counter += 1
+
+        entry = {
+            'name': name,
+            'timestamp': timestamp.timestamp(),
+            'size': len(data),
+            'blob': digest,
+        }
+        manifest['entries'].append(entry)
+        self._save_manifest(manifest)
+
+        # 新快照已解析过，顺便写入摘要目录
+        if config is not None:
+            self.catalog.put(name, digest, summarize(config))
+        else:
+            summary = self.catalog.get_by_key(digest)
+            if summary is not None:
+                self.catalog.put(name, digest, summary)
+        return self.path_of(entry)
+
+    def add_file(self, source_path, timestamp=None):
+        """保存文件快照，返回备份路径"""
+        with open(source_path, 'rb') as f:
+            return self.add(f.read(), timestamp)
+
+    def remove(self, backup_path):
+        """删除备份，不再被引用的对象一并删除"""
+        name = os.path.basename(str(backup_path))
+        self._load_manifest()
+        if name not in self._index:
+            # 不在清单中，按旧版本备份文件删除
+            self.catalog.discard(name)
+            os.remove(os.path.join(self.backup_dir, name))
+            self.legacy.discard([name])
+            return
+        self.remove_many([name])
+
+    def remove_many(self, backup_paths):
+        """一次删除多个备份 (清单只写入一次)，不存在的备份忽略"""
+        names = {os.path.basename(str(path)) for path in backup_paths}
+        manifest = self._load_manifest()
+        files = []
+        for name in names:
+            self.catalog.discard(name)
+            if name not in self._index:
+                try:
+                    os.remove(os.path.join(self.backup_dir, name))
+                except FileNotFoundError:
+                    pass
+                files.append(name)
+        if files:
+            # 索引随删除同步更新，不需要重新扫描目录
+            self.legacy.discard(files)
+
+        removed = {entry['blob'] for entry in manifest['entries'] if entry['name'] in names}
+        if not removed:
+            return
+        manifest['entries'] = [entry for entry in manifest['entries'] if entry['name'] not in names]
+        garbage = self._collect_garbage(manifest, removed)
+        # 先保存不再引用这些对象的清单，再删除对象文件：
+        # 中途崩溃或清单写入失败时只会留下未被引用的对象，不会有引用已删除对象的备份
+        self._save_manifest(manifest)
+        for digest in garbage:
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+
+    def _collect_garbage(self, manifest, candidates):
+        """从清单中移除不再被备份或差异引用的对象，返回这些对象ID (文件由调用者删除)"""
+        live = {entry['blob'] for entry in manifest['entries']}
+        # 差异依赖的基准也必须保留
+        live.update({self._object_info(manifest, blob).get('base') for blob in live})
+        # 被删除差异的基准也可能不再被引用
+        candidates = set(candidates)
+        candidates.update({self._object_info(manifest, blob).get('base') for blob in candidates})
+        garbage = candidates - live - {None}
+        for digest in garbage:
+            manifest['objects'].pop(digest, None)
+            if manifest['base'] == digest:
+                manifest['base'] = None
+                self._base_cache = (None, None)
+        return garbage
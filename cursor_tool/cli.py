@@ -0,0 +1,301 @@
+"""命令行入口 (不导入 PyQt6，不需要显示器)
+
+    python -m cursor_tool view-config
+    python -m cursor_tool backup
+    python -m cursor_tool --json list-backups
+    python -m cursor_tool restore storage.json.backup_20250101_120000
+    python -m cursor_tool prune --keep 10 --daily 7 --max-size 100 --dry-run
+    python -m cursor_tool update off
+    python -m cursor_tool batch ops.txt        # 每行一个命令，省略文件或 - 时读取标准输入
+    python -m cursor_tool --trace trace.json backup   # 记录各步骤的耗时 (.jsonl 为 JSON-lines)
+    python -m cursor_tool --memory list-backups       # 报告每个命令的内存峰值和分配位置
+
+batch 中的命令在同一个进程中依次执行，共用一个 CursorCore：storage.json 只在
+变化后才重新读取，macOS 上只启动一次特权助手 (只输入一次密码)。
+
+--json 时每个命令输出一行 JSON: {"command": ..., "ok": true, "result": ...}，
+失败时为 {"command": ..., "ok": false, "error": ...}。有命令失败时退出码为 1。
+"""
+import argparse
+import datetime
+import getpass
+import json
+import os
+import shlex
+import sys
+
+from . import memprof, trace
+from .core import CursorCore
+from .platforms import PLATFORMS, current_platform
+from .retention import DEFAULT_POLICY, RetentionPolicy
+
+# 写入 Cursor 配置的命令 (macOS 上非 root 时需要特权助手)
+PRIVILEGED_COMMANDS = {'restore', 'update'}
+
+
+class CommandError(Exception):
+    """命令无法执行 (如配置文件或备份不存在)"""
+
+
+def _format_time(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+# ---------------------------------------------------------------- 命令
+# 每个命令返回 (JSON 结果, 文本输出)
+
+def cmd_view_config(core, args):
+    config = core.read_config()
+    if config is None:
+        raise CommandError(f"配置文件不存在: {core.storage_file}")
+    return config, '\n'.join(f"{key}: {value}" for key, value in config.items())
+
+
+def cmd_backup(core, args):
+    backup_path = core.create_backup(prune=False)
+    if backup_path is None:
+        raise CommandError(f"配置文件不存在: {core.storage_file}")
+    # --prune 时按默认保留策略删除旧备份 (旧版本的完整备份文件除外)
+    policy = (core.retention or DEFAULT_POLICY) if args.prune else None
+    pruned = [item['name'] for item in core.apply_retention(backup_path, policy)]
+    lines = [f"已创建备份: {backup_path}"]
+    if pruned:
+        lines.append(f"按保留策略删除了 {len(pruned)} 个旧备份")
+    return {'path': backup_path, 'pruned': pruned}, '\n'.join(lines)
+
+
+def cmd_list_backups(core, args):
+    backups = []
+    total = core.backup_count()
+    for backup_path in core.list_backups(args.offset, args.limit, args.newest_first):
+        summary = core.backup_summary(backup_path)
+        backups.append({
+            'name': summary['name'],
+            'path': backup_path,
+            'timestamp': summary['timestamp'],
+            'machineId': summary['telemetry'].get('telemetry.machineId'),
+        })
+    lines = [f"{backup['name']}  {_format_time(backup['timestamp'])}  {backup['machineId'] or 'N/A'}"
+             for backup in backups]
+    if len(backups) < total:
+        lines.append(f"第 {args.offset + 1} - {args.offset + len(backups)} 个，共 {total} 个备份")
+    else:
+        lines.append(f"共 {total} 个备份")
+    return {'total': total, 'offset': args.offset, 'backups': backups}, '\n'.join(lines)
+
+
+def cmd_restore(core, args):
+    if not core.backup_store.exists(args.backup):
+        raise CommandError(f"备份不存在: {args.backup}")
+    core.restore_backup(args.backup)
+    name = os.path.basename(args.backup)
+    return {'restored': name}, f"已恢复备份: {name}"
+
+
+def _policy(args):
+    """命令行参数中的保留策略，没有指定任何规则时返回 None (使用默认策略)"""
+    if not any((args.keep, args.hourly, args.daily, args.weekly, args.max_size)):
+        return None
+    max_bytes = int(args.max_size * 1024 * 1024) if args.max_size else None
+    return RetentionPolicy(keep_last=args.keep, hourly=args.hourly, daily=args.daily,
+                           weekly=args.weekly, max_bytes=max_bytes)
+
+
+def cmd_prune(core, args):
+    policy = _policy(args) or core.retention or DEFAULT_POLICY
+    removed = core.prune(policy, dry_run=args.dry_run)
+    kept = len(core.list_backups()) - (len(removed) if args.dry_run else 0)
+    verb = "将删除" if args.dry_run else "已删除"
+    reasons = {'policy': '策略', 'size': '大小限制'}
+    lines = [f"{verb}: {entry['name']}  {_format_time(entry['timestamp'])}  ({reasons[entry['reason']]})"
+             for entry in removed]
+    lines.append(f"{verb} {len(removed)} 个备份，保留 {kept} 个")
+    result = {
+        'policy': policy.as_dict(),
+        'removed': [{'name': entry['name'], 'timestamp': entry['timestamp'], 'reason': entry['reason']}
+                    for entry in removed],
+        'kept': kept,
+        'dry_run': args.dry_run,
+    }
+    return result, '\n'.join(lines)
+
+
+def cmd_update(core, args):
+    if args.state != 'status':
+        core.set_auto_update(args.state == 'on')
+    enabled = core.is_auto_update_enabled()
+    return {'enabled': enabled}, "自动更新: " + ("已启用" if enabled else "已禁用")
+
+
+COMMANDS = {
+    'view-config': cmd_view_config,
+    'backup': cmd_backup,
+    'list-backups': cmd_list_backups,
+    'restore': cmd_restore,
+    'prune': cmd_prune,
+    'update': cmd_update,
+}
+
+
+# ---------------------------------------------------------------- 参数
+
+def _add_commands(subparsers):
+    subparsers.add_parser('view-config', help='显示当前的设备标识')
+    backup = subparsers.add_parser('backup', help='备份当前配置')
+    backup.add_argument('--prune', action='store_true', help='备份后按默认保留策略删除旧备份')
+    list_backups = subparsers.add_parser('list-backups', help='列出备份 (默认全部，从旧到新)')
+    list_backups.add_argument('--newest-first', action='store_true', help='最新的备份在前')
+    list_backups.add_argument('--offset', type=int, default=0, help='跳过前 N 个备份')
+    list_backups.add_argument('--limit', type=int, help='最多列出 N 个备份')
+    restore = subparsers.add_parser('restore', help='恢复备份 (恢复前先备份当前配置)')
+    restore.add_argument('backup', help='备份名称或路径')
+    prune = subparsers.add_parser('prune', help='按保留策略删除旧备份 (不指定规则时使用默认策略)')
+    prune.add_argument('--keep', type=int, default=0, help='保留最新的 N 个备份')
+    prune.add_argument('--hourly', type=int, default=0, help='保留最近 N 个小时中每小时最新的备份')
+    prune.add_argument('--daily', type=int, default=0, help='保留最近 N 天中每天最新的备份')
+    prune.add_argument('--weekly', type=int, default=0, help='保留最近 N 周中每周最新的备份')
+    prune.add_argument('--max-size', type=float, default=0, metavar='MB', help='备份总大小上限 (MB)')
+    prune.add_argument('--dry-run', action='store_true', help='只列出将要删除的备份')
+    update = subparsers.add_parser('update', help='启用或禁用自动更新')
+    update.add_argument('state', choices=['on', 'off', 'status'])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m cursor_tool', description='Cursor 配置命令行工具')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出结果 (每个命令一行)')
+    parser.add_argument('--platform', choices=sorted(PLATFORMS), help='按指定平台的路径操作 (默认当前系统)')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='记录各操作的耗时、读写字节数和子进程数，导出为 Chrome trace (.jsonl 为 JSON-lines)')
+    parser.add_argument('--memory', action='store_true',
+                        help='报告每个命令的内存峰值、保留的内存和主要分配位置 (输出到标准错误)')
+    subparsers = parser.add_subparsers(dest='command', required=True, metavar='command')
+    _add_commands(subparsers)
+    batch = subparsers.add_parser('batch', help='在一个进程中依次执行文件中的命令')
+    batch.add_argument('file', nargs='?', default='-', help='命令文件，每行一个命令 (默认标准输入)')
+    batch.add_argument('--keep-going', action='store_true', help='某个命令失败后继续执行后面的命令')
+    return parser
+
+
+class _BatchParser(argparse.ArgumentParser):
+    """batch 文件中单行命令的解析器，参数错误时抛出 CommandError 而不是退出"""
+    def error(self, message):
+        raise CommandError(message)
+
+
+def _command_parser():
+    parser = _BatchParser(prog='batch', add_help=False)
+    subparsers = parser.add_subparsers(dest='command', required=True, metavar='command')
+    _add_commands(subparsers)
+    return parser
+
+
+def _read_batch(path):
+    """读取 batch 文件，返回 [(行号, 命令行), ...] (跳过空行和 # 注释)"""
+    if path == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    return [(number, line.strip()) for number, line in enumerate(lines, 1)
+            if line.strip() and not line.strip().startswith('#')]
+
+
+# ---------------------------------------------------------------- 执行
+
+def _needs_privilege(args):
+    return args.command in PRIVILEGED_COMMANDS and getattr(args, 'state', None) != 'status'
+
+
+def open_core(platform, commands):
+    """创建 CursorCore；需要时先用密码启动特权助手，整个进程只启动一次"""
+    session = None
+    if (platform.privileged_helper and not platform.is_admin()
+            and any(_needs_privilege(args) for args in commands)):
+        session = platform.open_session(getpass.getpass("请输入管理员密码: "))
+    return CursorCore(platform, session)
+
+
+def _emit(as_json, command, result=None, text=None, error=None):
+    if as_json:
+        record = {'command': command, 'ok': error is None}
+        if error is None:
+            record['result'] = result
+        else:
+            record['error'] = error
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+    elif error is None:
+        print(text, flush=True)
+    else:
+        print(f"[错误] {command}: {error}", file=sys.stderr, flush=True)
+
+
+def run_command(core, args, as_json):
+    """执行一个命令并输出结果，成功时返回 True"""
+    try:
+        with trace.span('command.' + args.command):
+            result, text = COMMANDS[args.command](core, args)
+    except Exception as e:
+        _emit(as_json, args.command, error=str(e))
+        return False
+    _emit(as_json, args.command, result, text)
+    return True
+
+
+def _report_memory(as_json, report):
+    if as_json:
+        print(json.dumps(report.as_dict(), ensure_ascii=False), file=sys.stderr, flush=True)
+    else:
+        print(report, file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # 也可以用环境变量 CURSOR_TRACE / CURSOR_MEMORY 启用
+    tracer = trace.enable() if args.trace else trace.from_env()
+    profiler = memprof.enable() if args.memory else memprof.from_env()
+    if profiler is not None:
+        profiler.add_sink(lambda report: _report_memory(args.json, report))
+    try:
+        return _main(args)
+    finally:
+        if args.trace:
+            trace.disable()
+            tracer.export(args.trace)
+
+
+def _main(args):
+    platform = PLATFORMS[args.platform]() if args.platform else current_platform()
+
+    if args.command != 'batch':
+        core = open_core(platform, [args])
+        try:
+            return 0 if run_command(core, args, args.json) else 1
+        finally:
+            core.close()
+
+    # 先解析所有命令，有错误时一个也不执行
+    try:
+        lines = _read_batch(args.file)
+    except OSError as e:
+        _emit(args.json, 'batch', error=str(e))
+        return 1
+    parser = _command_parser()
+    commands = []
+    for number, line in lines:
+        try:
+            commands.append(parser.parse_args(shlex.split(line)))
+        except (CommandError, ValueError) as e:
+            _emit(args.json, 'batch', error=f"第 {number} 行 ({line}): {e}")
+            return 1
+
+    core = open_core(platform, commands)
+    status = 0
+    try:
+        for command in commands:
+            if not run_command(core, command, args.json):
+                status = 1
+                if not args.keep_going:
+                    break
+    finally:
+        core.close()
+    return status
@@ -0,0 +1,396 @@
+"""不依赖 GUI 的 Cursor 配置操作
+
+Windows / macOS 的 GUI 和命令行都建立在 CursorCore 之上，平台差异 (路径、
+更新控制方式、写入后的权限、系统级设备标识) 由 Platform 提供，所有写操作都
+通过会话 (LocalSession 或 macOS 的特权助手) 批量执行。
+
+CursorCore 的方法出错时抛出异常，由调用方决定如何提示。
+
+    core = CursorCore()                 # 当前系统
+    core.read_config()                  # {'telemetry.machineId': ..., ...}
+    core.create_backup()
+    core.set_auto_update(False)
+"""
+import os
+
+from . import trace
+from .atomic import sync_batch
+from .backup_store import BackupStore
+from .install import InstallProbe
+from .json_scan import read_keys, scan_keys
+from .platforms import current_platform
+from .retention import RetentionEngine, plan
+
+# storage.json 中的设备标识和更新设置
+TELEMETRY_KEYS = ('telemetry.machineId', 'telemetry.macMachineId',
+                  'telemetry.devDeviceId', 'telemetry.sqmId')
+UPDATE_KEYS = ('update.mode', 'update.channel', 'update.enableDownload')
+
+UPDATE_DISABLED = {'update.mode': 'none', 'update.channel': 'none', 'update.enableDownload': False}
+UPDATE_ENABLED = {'update.mode': 'default', 'update.channel': 'default', 'update.enableDownload': True}
+
+# machineId 的固定前缀 ("auth0|user_" 的十六进制)
+MACHINE_ID_PREFIX = 'auth0|user_'.encode('utf-8').hex()
+
+
+def generate_ids():
+    """生成一组新的设备标识 (键不带 telemetry. 前缀)"""
+    import uuid
+    return {
+        'machineId': MACHINE_ID_PREFIX + os.urandom(32).hex(),
+        'macMachineId': str(uuid.uuid4()),
+        'devDeviceId': str(uuid.uuid4()),
+        'sqmId': '{' + str(uuid.uuid4()).upper() + '}',
+    }
+
+
+class CursorCore:
+    """一个平台上的 Cursor 配置、备份和更新设置"""
+    def __init__(self, platform=None, session=None, retention=None):
+        self.platform = platform or current_platform()
+        # 执行写操作的会话，macOS 上非 root 时是特权助手；未指定时在第一次写入时创建
+        self._session = session
+        self.storage_file = self.platform.storage_file
+        # 内容寻址的备份存储 (兼容旧版本的完整备份)
+        self.backup_store = BackupStore(self.platform.backup_dir,
+                                        self.platform.backup_name_format,
+                                        self.platform.legacy_backup_pattern)
+        # Cursor 安装探测，package.json 不变时直接使用缓存
+        self.install_probe = InstallProbe(self.platform.install_candidates())
+        # 每次备份后自动应用的保留策略 (默认 None: 不自动删除任何备份，需要时显式启用)
+        self.retention = retention
+        self._retention_engine = None
+        # storage.json 的读取缓存 (文件签名, 内容, {(keys, prefixes): 结果})，
+        # 同一进程中的多个操作共用，文件变化后自动失效
+        self._storage_cache = (None, None, {})
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self.platform.open_session()
+        return self._session
+
+    def close(self):
+        """关闭会话"""
+        if self._session is not None:
+            self._session.close()
+
+    @trace.traced()
+    def claim_backup_dir(self):
+        """备份目录中有当前用户不能写入的内容时 (如旧版本以 root 身份创建)，通过会话改为当前用户所有
+
+        备份存储在当前进程中直接写入和删除文件，启动时检查一次即可。返回是否做了修改。
+        """
+        backup_dir = self.backup_store.backup_dir
+        if not hasattr(os, 'getuid') or not os.path.isdir(backup_dir) or self._backup_dir_writable():
+            return False
+        self.session.run([{'op': 'chown', 'path': backup_dir, 'uid': os.getuid(),
+                           'gid': os.getgid(), 'recursive': True}])
+        self.backup_store.invalidate()
+        return True
+
+    def _backup_dir_writable(self):
+        """备份目录下的目录和文件 (摘要目录会被追加写入) 是否都可由当前用户写入"""
+        backup_dir = self.backup_store.backup_dir
+        if not os.access(backup_dir, os.R_OK | os.W_OK | os.X_OK):
+            return False
+        unreadable = []
+        for root, _, files in os.walk(backup_dir, onerror=unreadable.append):
+            if not os.access(root, os.W_OK | os.X_OK):
+                return False
+            if any(not os.access(os.path.join(root, name), os.W_OK) for name in files):
+                return False
+        return not unreadable
+
+    # ------------------------------------------------------------ 读取
+
+    @trace.traced()
+    def get_install(self):
+        """Cursor 安装信息 (安装目录、版本、资源路径)，未安装时返回 None"""
+        return self.install_probe.probe()
+
+    def has_storage(self):
+        return os.path.exists(self.storage_file)
+
+    def _storage_signature(self):
+        st = os.stat(self.storage_file)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _cached_storage(self):
+        """文件未变化时返回缓存，否则返回新的空缓存"""
+        signature = self._storage_signature()
+        cache = self._storage_cache
+        if cache[0] != signature:
+            cache = (signature, None, {})
+            self._storage_cache = cache
+        return cache
+
+    @trace.traced()
+    def read_storage(self):
+        """读取 storage.json (bytes)，当前用户不可读时通过会话读取"""
+        signature, data, keys = self._cached_storage()
+        if data is not None:
+            return data
+        try:
+            with open(self.storage_file, 'rb') as f:
+                data = f.read()
+            trace.count('bytes_read', len(data))
+        except PermissionError:
+            result = self.session.run([{'op': 'read', 'path': self.storage_file}])
+            data = result[0]['data'].encode('utf-8')
+        self._storage_cache = (signature, data, keys)
+        return data
+
+    @trace.traced()
+    def read_keys(self, keys=(), prefixes=()):
+        """只读取 storage.json 中指定的顶层键
+
+        文件未变化时直接使用缓存的结果；已读入整个文件时在内存中扫描。
+        """
+        signature, data, results = self._cached_storage()
+        request = (tuple(keys), tuple(prefixes))
+        if request in results:
+            return dict(results[request])
+        if data is not None:
+            config = scan_keys(data, keys, prefixes)
+        else:
+            try:
+                config = read_keys(self.storage_file, keys, prefixes)
+            except PermissionError:
+                result = self.session.run([{'op': 'read_keys', 'path': self.storage_file,
+                                            'keys': list(keys), 'prefixes': list(prefixes)}])
+                config = result[0]['data']
+        results[request] = config
+        return dict(config)
+
+    def read_config(self):
+        """当前的 telemetry.* 字段，配置文件不存在时返回 None"""
+        if not self.has_storage():
+            return None
+        return self.read_keys(prefixes=('telemetry.',))
+
+    # ------------------------------------------------------------ 自动更新
+
+    def update_state_path(self):
+        """决定自动更新状态的文件 (用于监视变化)"""
+        if self.platform.update_control == 'updater_file':
+            return self.platform.updater_path
+        return self.storage_file
+
+    def is_auto_update_enabled(self):
+        """检查自动更新是否启用"""
+        if self.platform.update_control == 'updater_file':
+            # 更新器被替换为空文件表示已禁用
+            try:
+                return os.stat(self.platform.updater_path).st_size > 0
+            except FileNotFoundError:
+                return True
+
+        if not self.has_storage():
+            return True
+        try:
+            config = self.read_keys(keys=UPDATE_KEYS)
+        except ValueError:
+            return True
+        return not (
+            config.get('update.mode', 'default') == 'none' or
+            config.get('update.channel', 'default') == 'none' or
+            config.get('update.enableDownload', True) is False
+        )
+
+    def auto_update_ops(self, enabled):
+        """启用或禁用自动更新的操作"""
+        if self.platform.update_control == 'updater_file':
+            updater_path = self.platform.updater_path
+            ops = []
+            if os.path.lexists(updater_path):
+                ops.append({'op': 'remove', 'path': updater_path})
+            if not enabled:
+                # 替换为只读空文件，防止被更新器重新写入
+                ops.append({'op': 'touch', 'path': updater_path, 'mode': 0o444})
+            return ops
+        updates = UPDATE_ENABLED if enabled else UPDATE_DISABLED
+        return [{'op': 'patch_keys', 'path': self.storage_file, 'updates': updates,
+                 'mode': self.platform.config_mode}]
+
+    @trace.traced()
+    def set_auto_update(self, enabled):
+        """启用或禁用自动更新"""
+        ops = self.auto_update_ops(enabled)
+        if ops:
+            self.session.run(ops)
+
+    def disable_auto_update(self):
+        self.set_auto_update(False)
+
+    def enable_auto_update(self):
+        self.set_auto_update(True)
+
+    # ------------------------------------------------------------ 备份
+
+    def list_backups(self, offset=0, limit=None, newest_first=False):
+        """备份的路径 (默认全部，从旧到新)
+
+        列表来自内存中的有序索引，备份目录和清单不变时不重新扫描。
+        """
+        return self.backup_store.paths(offset, limit, newest_first)
+
+    def backup_count(self):
+        return self.backup_store.count()
+
+    def backup_summary(self, backup_path):
+        """备份的时间和 telemetry.* 字段"""
+        return self.backup_store.summary(backup_path)
+
+    @trace.traced()
+    def create_backup(self, prune=True):
+        """备份当前配置，返回备份路径；配置文件不存在时返回 None
+
+        内容相同的备份只存储一次。prune 为 True 且设置了 self.retention 时随后应用保留策略。
+        """
+        if not self.has_storage():
+            return None
+        backup_path = self.backup_store.add(self.read_storage())
+        if prune:
+            self.apply_retention(backup_path)
+        return backup_path
+
+    @trace.traced()
+    def apply_retention(self, backup_path, policy=None):
+        """把新备份加入保留策略 (默认为 self.retention)，删除因此不再保留的备份
+
+        只处理新增的备份 (第一次调用时读取已有备份)。旧版本留下的完整备份文件
+        不参与自动删除，只能用 prune 显式删除。
+        返回删除的备份 [{'name', 'reason'}, ...]。
+        """
+        policy = policy or self.retention
+        if policy is None:
+            return []
+        entry = self.backup_store.usage_entry(backup_path)
+        if entry is None or 'blob' not in entry:
+            return []
+        engine = self._retention_engine
+        removed = []
+        if engine is None or engine.policy is not policy:
+            # 第一次调用时加入已有的备份，已超出策略的备份一并删除
+            engine = RetentionEngine(policy)
+            removed = engine.extend(item for item in self.backup_store.usage_entries()
+                                    if 'blob' in item and item['name'] != entry['name'])
+            self._retention_engine = engine
+        removed.extend(engine.add(entry))
+        if removed:
+            try:
+                self.backup_store.remove_many([item['name'] for item in removed])
+            except BaseException:
+                # 与磁盘上的状态不一致，下次重新读取
+                self._retention_engine = None
+                raise
+        return removed
+
+    @trace.traced()
+    def prune(self, policy=None, dry_run=False):
+        """对全部备份应用保留策略 (默认为 self.retention)
+
+        返回删除 (dry_run 时为将要删除) 的备份条目，带 'reason'。
+        """
+        policy = policy or self.retention
+        if policy is None:
+            return []
+        _, remove = plan(self.backup_store.usage_entries(), policy)
+        if remove and not dry_run:
+            self._retention_engine = None
+            self.backup_store.remove_many([entry['name'] for entry in remove])
+        return remove
+
+    @trace.traced()
+    def restore_backup(self, backup_path):
+        """恢复备份，恢复前先备份当前配置
+
+        旧版本的完整备份文件直接复制 (支持时为写时复制克隆)，清单中的备份解码后写入。
+        """
+        mode = self.platform.config_mode
+        source = self.backup_store.file_of(backup_path)
+        if source is not None:
+            op = {'op': 'copy', 'src': source, 'dst': self.storage_file, 'mode': mode}
+        else:
+            data = self.backup_store.read(backup_path)
+            op = {'op': 'write', 'path': self.storage_file, 'data': data.decode('utf-8'), 'mode': mode}
+        with sync_batch():
+            # 保留策略在复制之后应用，以免删除正在恢复的备份
+            current = self.create_backup(prune=False)
+            self.session.run([op])
+            if current is not None:
+                self.apply_retention(current)
+
+    @trace.traced()
+    def delete_backup(self, backup_path):
+        self.backup_store.remove(backup_path)
+        if self._retention_engine is not None:
+            self._retention_engine.discard(os.path.basename(str(backup_path)))
+
+    # ------------------------------------------------------------ 新配置
+
+    def generate_ids(self):
+        return generate_ids()
+
+    @trace.traced()
+    def update_system_id(self):
+        """更新系统级设备标识 (只有 macOS 需要)，返回新标识，不需要时返回 None"""
+        import uuid
+        new_uuid = str(uuid.uuid4())
+        ops = self.platform.system_id_ops(new_uuid)
+        if not ops:
+            return None
+        self.session.run(ops)
+        return new_uuid
+
+    @trace.traced()
+    def apply_ids(self, ids):
+        """写入新的设备标识，并把缓存目录移到一旁 (所有操作合并为一次请求)
+
+        ids 的键不带 telemetry. 前缀。storage.json 写入失败时抛出 HelperError，
+        其余操作的失败以 [(操作, 错误信息), ...] 返回。
+        """
+        mode = self.platform.config_mode
+        updates = {f'telemetry.{key}': value for key, value in ids.items()}
+        ops = [{'op': 'patch_keys', 'path': self.storage_file, 'updates': updates, 'mode': mode}]
+
+        state_file = self.platform.state_file
+        if self.platform.patch_state_file and os.path.exists(state_file):
+            ops.append({'op': 'patch_keys', 'path': state_file,
+                        'updates': {'machineId': ids['machineId']}, 'mode': mode})
+
+        # 缓存目录先原子地移到一旁，内容由 purge_caches 在后台删除
+        ops.extend({'op': 'stash', 'path': cache_dir}
+                   for cache_dir in self.platform.cache_dirs() if os.path.exists(cache_dir))
+
+        results = self.session.run(ops, stop_on_error=False, check=False)
+        if not results[0]['ok']:
+            from .mac_helper import HelperError
+            raise HelperError(results[0]['error'])
+        return [(op, result['error']) for op, result in zip(ops[1:], results[1:])
+                if not result['ok']]
+
+    @trace.traced()
+    def purge_caches(self, progress=None):
+        """并行删除已移到一旁的缓存目录，progress(event) 接收进度
+
+        返回清理结果，没有需要清理的目录时返回 None。
+        """
+        from .purge import stashed
+        paths = [path for cache_dir in self.platform.cache_dirs() for path in stashed(cache_dir)]
+        if not paths:
+            return None
+        result = self.session.run([{'op': 'purge', 'paths': paths}], progress=progress)[0]
+        trace.count('files_deleted', result.get('files', 0))
+        trace.count('bytes_deleted', result.get('bytes', 0))
+        return result
+
+    # ------------------------------------------------------------ 进程
+
+    @trace.traced()
+    def close_cursor(self):
+        """结束 Cursor 进程树 (按进程名匹配，已知安装目录下的先结束)，返回 TerminationReport"""
+        # psutil 只在需要时导入，缩短启动时间
+        from .processes import close_processes
+        return close_processes(self.platform.process_names, self.platform.install_roots())
@@ -0,0 +1,185 @@
+"""快速复制文件内容
+
+按文件系统的支持程度依次尝试，前一种不可用时使用下一种:
+    1. 写时复制克隆，只复制元数据，不读写数据块:
+       Linux FICLONE (Btrfs、XFS)，macOS clonefile (APFS)，
+       Windows CopyFileW (系统在 ReFS / Dev Drive 上使用块克隆)
+    2. 内核内复制，数据不经过用户空间: os.copy_file_range，Linux 上的 os.sendfile
+    3. 普通的缓冲复制
+
+    method = copy_file(src, dst)    # 'reflink'、'clonefile'、'copyfile'、'copy_file_range'、'sendfile' 或 'buffered'
+
+某种方式返回不支持 (如跨文件系统、文件系统不支持克隆) 时改用下一种方式；
+系统本身没有实现 (ENOSYS) 的方式记住结果，之后不再尝试。
+"""
+import errno
+import os
+import sys
+
+from . import trace
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+BUFFER_SIZE = 1024 * 1024
+
+# 表示文件系统或内核不支持该方式的错误 (改用下一种方式)
+UNSUPPORTED_ERRORS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.ENOTTY,
+                      errno.ENOTSUP, getattr(errno, 'EOPNOTSUPP', errno.ENOTSUP)}
+
+# 系统没有实现的方式
+_unavailable = set()
+
+
+def _load_clonefile():
+    """macOS libc 的 clonefile(src, dst, flags)，不可用时返回 None"""
+    if sys.platform != 'darwin':
+        return None
+    import ctypes.util
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        clonefile = libc.clonefile
+    except (OSError, AttributeError):
+        return None
+    clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+    clonefile.restype = ctypes.c_int
+    return clonefile
+
+
+def _load_copyfile():
+    """Windows 的 CopyFileW(src, dst, fail_if_exists)，不可用时返回 None"""
+    if os.name != 'nt':
+        return None
+    import ctypes
+    try:
+        copyfile = ctypes.WinDLL('kernel32', use_last_error=True).CopyFileW
+    except (OSError, AttributeError):
+        return None
+    copyfile.argtypes = [ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_int]
+    copyfile.restype = ctypes.c_int
+    return copyfile
+
+
+# (clonefile, CopyFileW)，第一次复制时加载 (ctypes 不在启动时导入)
+_path_functions = None
+
+
+def _load_path_functions():
+    global _path_functions
+    if _path_functions is None:
+        _path_functions = (_load_clonefile(), _load_copyfile())
+    return _path_functions
+
+
+def _unsupported(method, error):
+    """error 表示不支持该方式时返回 True (系统没有实现时记住)，其他错误返回 False"""
+    if error.errno == errno.ENOSYS:
+        _unavailable.add(method)
+    return error.errno in UNSUPPORTED_ERRORS
+
+
+def _clone_path(src, dst):
+    """按路径克隆 (macOS、Windows)，成功时返回使用的方式"""
+    clonefile, copyfile = _load_path_functions()
+    if clonefile is not None and 'clonefile' not in _unavailable:
+        # clonefile 要求目标不存在
+        try:
+            os.remove(dst)
+        except FileNotFoundError:
+            pass
+        if clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return 'clonefile'
+        import ctypes
+        error = ctypes.get_errno()
+        if not _unsupported('clonefile', OSError(error, os.strerror(error))):
+            raise OSError(error, os.strerror(error), src)
+    if copyfile is not None:
+        # 失败时由后面的方式复制并报告错误
+        if copyfile(src, dst, False):
+            return 'copyfile'
+    return None
+
+
+def _copy_range(src_fd, dst_fd, size):
+    """用 os.copy_file_range 复制，不支持时返回 False"""
+    copied = 0
+    try:
+        while copied < size:
+            n = os.copy_file_range(src_fd, dst_fd, size - copied)
+            if n == 0:
+                break
+            copied += n
+    except OSError as e:
+        # 已经复制了一部分时不能换用其他方式从头复制
+        if copied == 0 and _unsupported('copy_file_range', e):
+            return False
+        raise
+    return True
+
+
+def _sendfile(src_fd, dst_fd, size):
+    """用 os.sendfile 复制 (只有 Linux 支持写入普通文件)，不支持时返回 False"""
+    offset = 0
+    try:
+        while offset < size:
+            n = os.sendfile(dst_fd, src_fd, offset, min(size - offset, 0x7ffff000))
+            if n == 0:
+                break
+            offset += n
+    except OSError as e:
+        if offset == 0 and _unsupported('sendfile', e):
+            return False
+        raise
+    return True
+
+
+def _buffered(src_fd, dst_fd):
+    buffer = bytearray(BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(src_fd, 'rb', buffering=0, closefd=False) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            written = 0
+            while written < n:
+                written += os.write(dst_fd, view[written:n])
+
+
+def copy_fd(src_fd, dst_fd):
+    """把 src_fd 的全部内容复制到 dst_fd (都位于开头、dst 为空)，返回使用的方式"""
+    size = os.fstat(src_fd).st_size
+    if fcntl is not None and sys.platform.startswith('linux') and 'reflink' not in _unavailable:
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return 'reflink'
+        except OSError as e:
+            if not _unsupported('reflink', e):
+                raise
+    if hasattr(os, 'copy_file_range') and 'copy_file_range' not in _unavailable:
+        if _copy_range(src_fd, dst_fd, size):
+            return 'copy_file_range'
+    if sys.platform.startswith('linux') and 'sendfile' not in _unavailable:
+        if _sendfile(src_fd, dst_fd, size):
+            return 'sendfile'
+    _buffered(src_fd, dst_fd)
+    return 'buffered'
+
+
+def copy_file(src, dst):
+    """把 src 的内容复制到 dst (覆盖；权限和属主由调用者设置)，返回使用的方式"""
+    src, dst = os.fspath(src), os.fspath(dst)
+    with trace.span('copy_file') as span:
+        size = os.path.getsize(src)
+        method = _clone_path(src, dst)
+        if method is None:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                method = copy_fd(fsrc.fileno(), fdst.fileno())
+        span.set(method=method)
+        span.count('bytes_copied', size)
+        return method
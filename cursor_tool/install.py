@@ -0,0 +1,98 @@
+"""Cursor 安装探测
+
+按候选安装位置查找 Cursor 的 package.json，结果按文件的 (路径, mtime, size) 缓存，
+只有 package.json 实际变化 (如 Cursor 升级) 时才重新读取。
+安装根目录、版本和资源路径都由同一次探测得到。
+"""
+import os
+import threading
+
+from .json_scan import read_keys
+
+
+class CursorInstall:
+    """一次探测得到的 Cursor 安装信息"""
+    def __init__(self, root, app_dir, executable, version):
+        self.root = root              # 安装根目录
+        self.app_dir = app_dir        # resources/app 目录
+        self.resources_dir = os.path.dirname(app_dir)
+        self.package_json = os.path.join(app_dir, 'package.json')
+        self.executable = executable  # 主程序路径
+        self.version = version
+
+    def __repr__(self):
+        return f"CursorInstall({self.root!r}, version={self.version!r})"
+
+
+class InstallProbe:
+    """带缓存的 Cursor 安装探测"""
+    def __init__(self, candidates):
+        """
+        candidates: [(安装根目录, resources/app 目录, 主程序路径), ...]，按优先级排列
+        """
+        self.candidates = list(candidates)
+        self.lock = threading.Lock()
+        self._cache = {}  # package.json 路径 -> ((mtime, size), CursorInstall)
+
+    def probe(self):
+        """返回 CursorInstall，未安装时返回 None"""
+        with self.lock:
+            for root, app_dir, executable in self.candidates:
+                package_path = os.path.join(app_dir, 'package.json')
+                try:
+                    st = os.stat(package_path)
+                except OSError:
+                    self._cache.pop(package_path, None)
+                    continue
+                signature = (st.st_mtime_ns, st.st_size)
+
+                cached = self._cache.get(package_path)
+                if cached is not None and cached[0] == signature:
+                    install = cached[1]
+                else:
+                    try:
+                        version = read_keys(package_path, keys=('version',)).get('version')
+                    except (OSError, ValueError) as e:
+                        print(f"读取 {package_path} 失败: {e}")
+                        version = None
+                    install = CursorInstall(root, app_dir, executable, version)
+                    self._cache[package_path] = (signature, install)
+                if install.version:
+                    return install
+            return None
+
+    def invalidate(self):
+        """清空缓存，下次探测时重新读取"""
+        with self.lock:
+            self._cache.clear()
+
+
+def windows_candidates(localappdata=None):
+    """Windows 上的候选安装位置"""
+    localappdata = localappdata or os.getenv('LOCALAPPDATA') or ''
+    roots = [
+        os.path.join(localappdata, 'Programs', 'cursor'),  # 主要安装路径
+        os.path.join(localappdata, 'cursor'),              # 备用路径
+    ]
+    return [(root, os.path.join(root, 'resources', 'app'), os.path.join(root, 'Cursor.exe'))
+            for root in roots]
+
+
+def macos_candidates(applications='/Applications'):
+    """macOS 上的候选安装位置"""
+    root = os.path.join(applications, 'Cursor.app')
+    return [(root, os.path.join(root, 'Contents', 'Resources', 'app'),
+             os.path.join(root, 'Contents', 'MacOS', 'Cursor'))]
+
+
+def linux_candidates(home=None):
+    """Linux 上的候选安装位置 (deb/rpm 包和解压的 tar 包)"""
+    home = home or os.path.expanduser('~')
+    roots = [
+        '/usr/share/cursor',
+        '/opt/Cursor',
+        '/opt/cursor',
+        os.path.join(home, '.local', 'share', 'cursor'),
+    ]
+    return [(root, os.path.join(root, 'resources', 'app'), os.path.join(root, 'cursor'))
+            for root in roots]
@@ -0,0 +1,93 @@
+"""只改写 storage.json 中变化的顶层键
+
+修改 ID 或更新设置时只涉及三四个顶层键，不必解析整个 storage.json
+再用 json.dump(indent=2) 重新序列化。patch_keys 找到这些键的值在原文中的位置，
+直接替换为新值，其余内容逐字节保留；不存在的键追加到对象末尾。
+"""
+import json
+import re
+
+from .atomic import atomic_write
+from .json_scan import find_members
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+
+
+def _indent_of(data):
+    """顶层成员的缩进，单行 JSON 返回 None"""
+    start = data.find(b'{') + 1
+    space = data[start:_WHITESPACE.match(data, start).end()]
+    if b'\n' not in space:
+        return None
+    return space.rsplit(b'\n', 1)[1].decode('ascii') or '  '
+
+
+def _dump(value, indent):
+    """按顶层成员的缩进序列化一个值"""
+    if indent is None:
+        return json.dumps(value).encode('utf-8')
+    text = json.dumps(value, indent=indent)
+    return text.replace('\n', '\n' + indent).encode('utf-8')
+
+
+def patch_keys(data, updates):
+    """把 updates 中的顶层键写入 JSON 文本 data，返回新的文本 (bytes)
+
+    已有的键原位替换值 (重复出现的键全部替换)，新键追加到末尾，其他内容不变。
+    data 为空时生成新的对象。
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if not data.strip():
+        return json.dumps(updates, indent=2).encode('utf-8')
+
+    indent = _indent_of(data)
+    splices = []  # (开始位置, 结束位置, 新内容)
+    found = set()
+    for key, _, start, end in find_members(data, keys=updates):
+        splices.append((start, end, _dump(updates[key], indent)))
+        found.add(key)
+
+    missing = [key for key in updates if key not in found]
+    if missing:
+        close = len(data.rstrip()) - 1
+        if data[close:close + 1] != b'}':
+            raise json.JSONDecodeError("Expecting '}'", '', close)
+        last = len(data[:close].rstrip())  # 最后一个成员之后 (或 '{' 之后)
+        empty = data[last - 1:last] == b'{'
+        if empty and indent is None:
+            indent = '  '  # 空对象按 json.dump(indent=2) 的格式写入
+
+        if indent is None:
+            members = [json.dumps(key).encode('utf-8') + b': ' + _dump(updates[key], None)
+                       for key in missing]
+            text = b', ' + b', '.join(members)
+        else:
+            prefix = b'\n' + indent.encode('ascii')
+            members = [prefix + json.dumps(key).encode('utf-8') + b': ' + _dump(updates[key], indent)
+                       for key in missing]
+            text = (b'' if empty else b',') + b','.join(members)
+            if empty:
+                text += b'\n'
+        # 空对象中原有的空白一并替换
+        splices.append((last, close if empty else last, text))
+
+    splices.sort(key=lambda item: item[0])
+    parts = []
+    pos = 0
+    for start, end, text in splices:
+        parts.append(data[pos:start])
+        parts.append(text)
+        pos = end
+    parts.append(data[pos:])
+    return b''.join(parts)
+
+
+def patch_file(path, updates, mode=None):
+    """改写 JSON 文件中的顶层键 (原子写入)，文件不存在时新建"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        data = b''
+    atomic_write(path, patch_keys(data, updates), mode)
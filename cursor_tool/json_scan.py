@@ -0,0 +1,204 @@
+"""按键读取 storage.json 的顶层字段
+
+storage.json 中保存着 Cursor 的全部全局状态，可能有几 MB，但查看配置、
+检查更新状态和生成备份摘要只需要其中几个 telemetry.* / update.* 键。
+read_keys 逐个扫描顶层键，跳过不需要的值 (不解析、不创建对象)，
+只解析请求的值；只按完整键名查找时，找到全部键后立即停止。
+
+文件通过 mmap 读取，停止扫描后文件的剩余部分不会被读入内存。
+"""
+import json
+import mmap
+import os
+import re
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+# 容器内部只需要找到字符串的开头和括号，字符串本身用 find 跳过 (memchr 速度)
+_SPECIAL = re.compile(rb'["\[\]{}]')
+_SCALAR = re.compile(rb'[^\s,\]}]+')
+# 含转义序列的键: { 或 , 之后的字符串 (字符串内部的引号都有转义，不会紧跟在 { 或 , 之后)，
+# 其中有反斜杠，后面跟着冒号
+_ESCAPED_KEY = re.compile(rb'[{,][ \t\n\r]*"[^"\\]*\\(?:[^"\\]|\\.)*"[ \t\n\r]*:')
+
+_QUOTE = ord('"')
+_BACKSLASH = ord('\\')
+_OPEN = (ord('{'), ord('['))
+
+
+def _error(message, pos):
+    return json.JSONDecodeError(message, '', pos)
+
+
+def _skip_whitespace(buf, pos):
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def _skip_string(buf, pos):
+    """跳过从 pos 开始的字符串，返回结束引号之后的位置"""
+    end = buf.find(b'"', pos + 1)
+    while end >= 0:
+        # 前面有奇数个反斜杠时引号是转义的
+        i = end - 1
+        while buf[i] == _BACKSLASH:
+            i -= 1
+        if (end - 1 - i) % 2 == 0:
+            return end + 1
+        end = buf.find(b'"', end + 1)
+    raise _error("Unterminated string", pos)
+
+
+def _skip_value(buf, pos):
+    """跳过一个 JSON 值，返回值结束的位置"""
+    if pos >= len(buf):
+        raise _error("Expecting value", pos)
+    c = buf[pos]
+    if c == _QUOTE:
+        return _skip_string(buf, pos)
+    if c in _OPEN:
+        depth = 0
+        search = _SPECIAL.search
+        while True:
+            m = search(buf, pos)
+            if m is None:
+                raise _error("Unterminated container", pos)
+            i = m.start()
+            c = buf[i]
+            if c == _QUOTE:
+                pos = _skip_string(buf, i)
+                continue
+            if c in _OPEN:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            pos = i + 1
+    m = _SCALAR.match(buf, pos)
+    if m is None:
+        raise _error("Expecting value", pos)
+    return m.end()
+
+
+def _decode_key(buf, start, end):
+    raw = buf[start + 1:end - 1]
+    if b'\\' in raw:
+        return json.loads(buf[start:end])
+    return raw.decode('utf-8')
+
+
+def _plain(text):
+    """编码器不会转义的键 (可以按原文在文本中查找)"""
+    return text.isascii() and text.isprintable() and not any(c in text for c in '"\\/')
+
+
+def _count(buf, needle):
+    """统计 needle 在文本中出现的次数"""
+    count = 0
+    i = buf.find(needle)
+    while i >= 0:
+        count += 1
+        i = buf.find(needle, i + 1)
+    return count
+
+
+def _budget(buf, keys, prefixes):
+    """每个请求在文本中最多可能匹配的顶层键数量
+
+    键名按原文出现的次数是顶层出现次数的上限；全部找到后就可以停止扫描，
+    完全不出现的键也不需要扫描。不能按原文查找的键返回 None (扫描到末尾)；
+    文本中有含转义序列的键时 (如 "a\\u002eb")，原文次数不是上限，全部返回 None。
+    """
+    escaped = buf.find(b'\\') >= 0 and _ESCAPED_KEY.search(buf) is not None
+    budget = {}
+    for key in keys:
+        plain = _plain(key) and not escaped
+        budget[('key', key)] = _count(buf, b'"' + key.encode() + b'"') if plain else None
+    for prefix in prefixes:
+        plain = _plain(prefix) and not escaped
+        budget[('prefix', prefix)] = _count(buf, b'"' + prefix.encode()) if plain else None
+    return budget
+
+
+def _consume(remaining, key):
+    """记录找到的键，返回是否已经不可能再找到请求的键"""
+    for request in list(remaining):
+        kind, text = request
+        if remaining[request] is None:
+            continue
+        if key == text if kind == 'key' else key.startswith(text):
+            remaining[request] -= 1
+            if remaining[request] <= 0:
+                del remaining[request]
+    return not remaining
+
+
+def find_members(buf, keys=(), prefixes=()):
+    """依次产生请求的顶层成员 (键, 键的开始位置, 值的开始位置, 值的结束位置)
+
+    buf 为 bytes 或 mmap；请求的键不可能再出现时停止扫描。
+    """
+    wanted = set(keys)
+    prefixes = tuple(prefixes)
+
+    # 剩余可能出现的次数，全部为 0 时停止扫描
+    budget = _budget(buf, wanted, prefixes)
+    remaining = {request: count for request, count in budget.items() if count != 0}
+
+    pos = _skip_whitespace(buf, 0)
+    if buf[pos:pos + 1] != b'{':
+        raise _error("Expecting '{'", pos)
+    pos = _skip_whitespace(buf, pos + 1)
+    if buf[pos:pos + 1] == b'}' or not remaining:
+        return
+
+    while True:
+        if buf[pos:pos + 1] != b'"':
+            raise _error("Expecting property name enclosed in double quotes", pos)
+        key_start = pos
+        end = _skip_string(buf, pos)
+        key = _decode_key(buf, pos, end)
+        pos = _skip_whitespace(buf, end)
+        if buf[pos:pos + 1] != b':':
+            raise _error("Expecting ':' delimiter", pos)
+        pos = _skip_whitespace(buf, pos + 1)
+        end = _skip_value(buf, pos)
+
+        if key in wanted or (prefixes and key.startswith(prefixes)):
+            yield key, key_start, pos, end
+            if _consume(remaining, key):
+                return  # 已找到全部可能的键，不再扫描剩余部分
+
+        pos = _skip_whitespace(buf, end)
+        c = buf[pos:pos + 1]
+        if c == b'}':
+            return
+        if c != b',':
+            raise _error("Expecting ',' delimiter", pos)
+        pos = _skip_whitespace(buf, pos + 1)
+
+
+def scan_keys(buf, keys=(), prefixes=()):
+    """在已读入内存的 JSON 文本 (bytes/str/mmap) 中读取指定的顶层键
+
+    参数和返回值同 read_keys。
+    """
+    if isinstance(buf, str):
+        buf = buf.encode('utf-8')
+    # 重复的键以最后一次出现为准，与 json.load 一致
+    return {key: json.loads(buf[start:end])
+            for key, _, start, end in find_members(buf, keys, prefixes)}
+
+
+def read_keys(path, keys=(), prefixes=()):
+    """读取 JSON 文件中指定的顶层键
+
+    keys: 需要的完整键名
+    prefixes: 需要的键名前缀，如 ('telemetry.',)
+    返回 {键: 值}，不存在的键不会出现在结果中。
+    扫描到的部分格式错误时抛出 json.JSONDecodeError。
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise _error("Expecting value", 0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return scan_keys(buf, keys, prefixes)
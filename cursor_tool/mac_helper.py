@@ -0,0 +1,318 @@
+"""macOS 特权助手进程
+
+run_as_admin 只调用一次 sudo 启动本助手，之后所有需要 root 权限的文件操作
+都批量发送给它执行，一次操作只需一次 IPC 往返，不再为每个文件操作 fork 一个 sudo。
+
+协议: 每行一个 JSON。
+    请求  {"id": 1, "ops": [{"op": "patch_keys", "path": "...", "updates": {...}}, ...], "stop_on_error": true}
+    进度  {"id": 1, "progress": {...}}   (purge 等耗时操作执行期间，可能有多条)
+    响应  {"id": 1, "results": [{"ok": true}, {"ok": false, "error": "..."}, ...]}
+
+助手以 root 身份连接 GUI 进程创建的 Unix 套接字 (位于仅当前用户可访问的临时目录中)。
+"""
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from . import trace
+from .atomic import atomic_copy, atomic_write, sync_batch
+from .json_patch import patch_keys
+from .json_scan import read_keys
+
+
+class HelperError(Exception):
+    """特权操作失败"""
+
+
+# ---------------------------------------------------------------- 操作实现
+
+def _atomic_write(path, data, mode=None):
+    """原子写入，保留原文件的属主"""
+    atomic_write(path, data, mode, keep_owner=True)
+
+
+def _op_read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return {'data': f.read()}
+
+
+def _op_read_keys(path, keys=(), prefixes=()):
+    return {'data': read_keys(path, keys, prefixes)}
+
+
+def _op_write(path, data, mode=None):
+    _atomic_write(path, data.encode('utf-8'), mode)
+
+
+def _op_patch_keys(path, updates, mode=None):
+    # 文件不存在时新建
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        data = b''
+    _atomic_write(path, patch_keys(data, updates), mode)
+
+
+def _op_copy(src, dst, mode=None):
+    # 支持时为写时复制克隆，内容不经过助手进程
+    return {'method': atomic_copy(src, dst, mode, keep_owner=True)}
+
+
+def _op_chmod(path, mode):
+    os.chmod(path, mode)
+
+
+def _op_remove(path):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def _op_stash(path):
+    from .purge import stash
+    return {'path': stash(path)}
+
+
+def _op_purge(paths, workers=None, progress=None):
+    from .purge import purge
+    return purge(paths, workers, progress)
+
+
+def _op_chown(path, uid, gid, recursive=False):
+    """修改属主 (不跟随符号链接)，recursive 时包括目录下的全部文件"""
+    os.chown(path, uid, gid, follow_symlinks=False)
+    if recursive and os.path.isdir(path) and not os.path.islink(path):
+        for root, dirs, files in os.walk(path):
+            for name in dirs + files:
+                os.chown(os.path.join(root, name), uid, gid, follow_symlinks=False)
+
+
+def _op_touch(path, mode=None):
+    with open(path, 'a'):
+        os.utime(path, None)
+    if mode is not None:
+        os.chmod(path, mode)
+
+
+def _op_makedirs(path, mode=0o755):
+    os.makedirs(path, mode=mode, exist_ok=True)
+
+
+def _op_nvram(name, value):
+    trace.count('subprocesses')
+    subprocess.run(['nvram', f'{name}={value}'], check=True, capture_output=True)
+
+
+OPERATIONS = {
+    'read': _op_read,
+    'read_keys': _op_read_keys,
+    'write': _op_write,
+    'patch_keys': _op_patch_keys,
+    'copy': _op_copy,
+    'chmod': _op_chmod,
+    'chown': _op_chown,
+    'remove': _op_remove,
+    'stash': _op_stash,
+    'purge': _op_purge,
+    'touch': _op_touch,
+    'makedirs': _op_makedirs,
+    'nvram': _op_nvram,
+}
+
+# 执行期间报告进度的操作
+PROGRESS_OPERATIONS = {'purge'}
+
+
+def execute(ops, stop_on_error=True, progress=None):
+    """依次执行一批操作，返回每个操作的结果
+
+    一批操作中写入的文件在批次结束时统一同步目录。
+    progress: progress(event)，接收 PROGRESS_OPERATIONS 中操作的进度
+    """
+    with sync_batch():
+        return _execute(ops, stop_on_error, progress)
+
+
+def _execute(ops, stop_on_error, progress):
+    results = []
+    failed = False
+    for op in ops:
+        if failed and stop_on_error:
+            results.append({'ok': False, 'error': 'skipped'})
+            continue
+        args = dict(op)
+        name = args.pop('op', None)
+        try:
+            if name not in OPERATIONS:
+                raise ValueError(f"未知操作: {name}")
+            if name in PROGRESS_OPERATIONS:
+                args['progress'] = progress
+            result = OPERATIONS[name](**args) or {}
+            result['ok'] = True
+        except Exception as e:
+            failed = True
+            result = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        results.append(result)
+    return results
+
+
+def check_results(ops, results):
+    """有操作失败时抛出 HelperError"""
+    for op, result in zip(ops, results):
+        if not result.get('ok'):
+            raise HelperError(f"{op.get('op')} {op.get('path') or op.get('dst') or ''}: {result.get('error')}")
+    return results
+
+
+# ---------------------------------------------------------------- 客户端
+
+class LocalSession:
+    """在当前进程中直接执行操作 (已经是 root 或无需提权时使用)"""
+    @trace.traced()
+    def run(self, ops, stop_on_error=True, check=True, progress=None):
+        """执行一批操作"""
+        results = execute(ops, stop_on_error, progress)
+        if check:
+            check_results(ops, results)
+        return results
+
+    def close(self):
+        pass
+
+
+class HelperSession:
+    """与特权助手进程的会话"""
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.stream = conn.makefile('rwb')
+        self.lock = threading.Lock()
+        self.next_id = 1
+
+    @classmethod
+    @trace.traced()
+    def start(cls, password, timeout=30):
+        """使用管理员密码启动助手进程"""
+        temp_dir = tempfile.mkdtemp(prefix='cursor-helper-')
+        sock_path = os.path.join(temp_dir, 'helper.sock')
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(sock_path)
+            server.listen(1)
+            server.settimeout(0.2)
+
+            trace.count('subprocesses')
+            process = subprocess.Popen(
+                ['sudo', '-S', '-p', '', *helper_command(), sock_path],
+                stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            )
+            # 只提供一次密码，密码错误时 sudo 读到 EOF 直接退出
+            process.stdin.write((password + '\n').encode('utf-8'))
+            process.stdin.close()
+
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    conn, _ = server.accept()
+                    break
+                except socket.timeout:
+                    if process.poll() is not None:
+                        error = process.stderr.read().decode('utf-8', 'replace').strip()
+                        raise HelperError(f"助手进程启动失败: {error or process.returncode}")
+                    if time.monotonic() > deadline:
+                        process.kill()
+                        raise HelperError("助手进程启动超时")
+        finally:
+            server.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        conn.settimeout(None)
+        session = cls(process, conn)
+        hello = session._receive()
+        if not hello.get('ready') or hello.get('uid') != 0:
+            session.close()
+            raise HelperError("助手进程没有 root 权限")
+        return session
+
+    def _send(self, message):
+        self.stream.write(json.dumps(message).encode('utf-8') + b'\n')
+        self.stream.flush()
+
+    def _receive(self):
+        line = self.stream.readline()
+        if not line:
+            raise HelperError("助手进程已退出")
+        return json.loads(line)
+
+    @trace.traced()
+    def run(self, ops, stop_on_error=True, check=True, progress=None):
+        """执行一批操作 (一次 IPC 往返)
+
+        progress: progress(event)，接收助手在执行期间发送的进度
+        """
+        with self.lock:
+            request_id = self.next_id
+            self.next_id += 1
+            self._send({'id': request_id, 'ops': ops, 'stop_on_error': stop_on_error})
+            response = self._receive()
+            while 'progress' in response:
+                if progress is not None:
+                    progress(response['progress'])
+                response = self._receive()
+        results = response['results']
+        if check:
+            check_results(ops, results)
+        return results
+
+    def close(self):
+        """关闭会话，助手进程读到 EOF 后退出"""
+        try:
+            self.stream.close()
+            self.conn.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def helper_command():
+    """启动助手进程的命令 (打包后的程序通过参数进入助手模式)"""
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, '--privileged-helper']
+    return [sys.executable, '-m', 'cursor_tool.mac_helper']
+
+
+# ---------------------------------------------------------------- 服务端
+
+def serve(sock_path):
+    """助手进程主循环"""
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.connect(sock_path)
+    stream = conn.makefile('rwb')
+
+    def send(message):
+        stream.write(json.dumps(message).encode('utf-8') + b'\n')
+        stream.flush()
+
+    send({'ready': True, 'pid': os.getpid(), 'uid': os.geteuid()})
+    for line in stream:
+        request = json.loads(line)
+        request_id = request.get('id')
+        results = execute(request.get('ops', []), request.get('stop_on_error', True),
+                          lambda event: send({'id': request_id, 'progress': event}))
+        send({'id': request_id, 'results': results})
+
+
+if __name__ == '__main__':
+    serve(sys.argv[1])
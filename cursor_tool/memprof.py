@@ -0,0 +1,168 @@
+"""内存诊断
+
+在每个顶层操作 (GUI 的后台任务、命令行的每个命令) 期间用 tracemalloc 跟踪分配，
+报告该操作的内存峰值、操作结束后仍保留的内存、进程 RSS，以及保留内存最多的
+分配位置。建立在 trace 的 span 之上，启用后追踪也一并启用。
+
+每个操作开始时清空 tracemalloc 的记录，结束时的快照只包含操作期间分配且仍然存活的
+内存块，不需要在操作前对整个堆取快照。tracemalloc 启动后不再停止 (在其他线程仍在分配
+内存时停止并不安全)。如果 tracemalloc 已经由外部启用 (如 PYTHONTRACEMALLOC)，
+则不清空它的记录，改为比较操作前后的快照。
+
+    profiler = memprof.enable(top=10)    # 或设置环境变量 CURSOR_MEMORY=1 (=N 时报告前 N 个位置)
+    profiler.add_sink(print_report)      # 每个操作结束时回调 (如 GUI 日志面板)
+    profiler.reports                     # [MemoryReport, ...]
+
+tracemalloc 会明显拖慢 Python 代码的执行，只用于诊断；同一时间只分析一个操作。
+"""
+import os
+import threading
+
+from . import trace
+
+# 当前的 MemoryProfiler，未启用时为 None
+_profiler = None
+
+# 快照中忽略的分配位置 (追踪代码自身和导入机制，另外还有 tracemalloc 自身)
+# tracemalloc 在第一次分析时才导入，不增加启动耗时
+IGNORED_FILES = (trace.__file__, __file__, '<frozen importlib._bootstrap>',
+                 '<frozen importlib._bootstrap_external>')
+
+
+def _rss():
+    """当前进程的 RSS (字节)，无法获取时返回 None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def _kb(size):
+    return f"{size / 1024:,.1f} KB"
+
+
+class MemoryReport:
+    """一个操作的内存使用"""
+    def __init__(self, name, peak, retained, rss, top):
+        self.name = name
+        self.peak = peak            # 操作期间相对开始时的内存峰值 (字节)
+        self.retained = retained    # 操作结束后仍保留的内存 (字节，可能为负)
+        self.rss = rss              # 操作结束时进程的 RSS (字节)
+        self.top = top              # [(位置, 保留的字节数, 分配次数), ...]
+
+    def as_dict(self):
+        return {'name': self.name, 'peak': self.peak, 'retained': self.retained, 'rss': self.rss,
+                'top': [{'site': site, 'size': size, 'count': count} for site, size, count in self.top]}
+
+    def lines(self):
+        """文本报告 (每行一条，用于日志)"""
+        rss = f", RSS {self.rss / 1024 / 1024:,.1f} MB" if self.rss is not None else ""
+        lines = [f"[内存] {self.name}: 峰值 {_kb(self.peak)}，保留 {_kb(self.retained)}{rss}"]
+        lines.extend(f"    {_kb(size):>12}  {count:>6} 次  {site}" for site, size, count in self.top)
+        return lines
+
+    def __str__(self):
+        return '\n'.join(self.lines())
+
+
+class MemoryProfiler:
+    """trace 的钩子，在指定深度 (默认顶层) 的 span 前后取快照"""
+    def __init__(self, top=10, frames=1, depth=0):
+        self.top = top
+        self.frames = frames
+        self.depth = depth
+        self.reports = []
+        self.sinks = []
+        self.lock = threading.Lock()
+        self._active = None
+        self._owner = False     # tracemalloc 是否由这里启动 (可以清空记录)
+        self._baseline = 0
+        self._before = None
+
+    def add_sink(self, sink):
+        """sink(report) 在每个操作结束时调用 (可能在工作线程中)"""
+        with self.lock:
+            self.sinks.append(sink)
+
+    def remove_sink(self, sink):
+        with self.lock:
+            if sink in self.sinks:
+                self.sinks.remove(sink)
+
+    def _snapshot(self):
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot()
+        ignored = IGNORED_FILES + (tracemalloc.__file__,)
+        return snapshot.filter_traces([tracemalloc.Filter(False, name) for name in ignored])
+
+    def span_started(self, span):
+        if span.depth != self.depth:
+            return
+        with self.lock:
+            if self._active is not None:
+                return  # 其他线程的操作正在分析
+            self._active = span
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owner = True
+        if self._owner:
+            tracemalloc.clear_traces()
+        else:
+            self._before = self._snapshot()
+            tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+
+    def span_finished(self, span):
+        if self._active is not span:
+            return
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        after = self._snapshot()
+        if self._owner:
+            top = [(str(stat.traceback), stat.size, stat.count)
+                   for stat in after.statistics('lineno')[:self.top]]
+        else:
+            stats = [stat for stat in after.compare_to(self._before, 'lineno') if stat.size_diff > 0]
+            stats.sort(key=lambda stat: stat.size_diff, reverse=True)
+            top = [(str(stat.traceback), stat.size_diff, stat.count_diff) for stat in stats[:self.top]]
+        report = MemoryReport(span.name, peak - self._baseline, current - self._baseline, _rss(), top)
+        self._before = None
+        with self.lock:
+            self._active = None
+            self.reports.append(report)
+            sinks = list(self.sinks)
+
+        # 也写入 span，随 trace 一起导出
+        span.counters['mem_peak_bytes'] = report.peak
+        span.counters['mem_retained_bytes'] = report.retained
+        for sink in sinks:
+            try:
+                sink(report)
+            except Exception as e:
+                print(f"[警告] 内存报告输出失败: {e}")
+
+
+def enable(top=10, frames=1):
+    """启用内存诊断 (需要时同时启用追踪)，返回 MemoryProfiler"""
+    global _profiler
+    tracer = trace.active() or trace.enable()
+    _profiler = MemoryProfiler(top, frames)
+    tracer.add_hook(_profiler)
+    return _profiler
+
+
+def active():
+    """当前的 MemoryProfiler，未启用时返回 None"""
+    return _profiler
+
+
+def from_env(environ=None):
+    """环境变量 CURSOR_MEMORY 为 1 (或报告的位置数) 时启用内存诊断"""
+    value = (os.environ if environ is None else environ).get('CURSOR_MEMORY', '')
+    if not value or value == '0':
+        return None
+    if _profiler is not None:
+        return _profiler
+    return enable(top=int(value) if value.isdigit() and int(value) > 1 else 10)
@@ -0,0 +1,192 @@
+"""各平台上 Cursor 的文件位置和特权操作方式
+
+GUI、命令行和基准测试都通过 Platform 获取路径和特权会话，不再各自拼接
+APPDATA / ~/Library / ~/.config。三个平台的差异:
+
+    Windows  %APPDATA%\\Cursor，更新设置保存在 storage.json 的 update.* 键中，
+             管理员权限由程序启动时的 UAC 提权获得
+    macOS    ~/Library/Application Support/Cursor，用只读的空 cursor-updater 文件禁用更新，
+             写入后配置文件设为只读，需要 root 的操作交给特权助手 (mac_helper)
+    Linux    $XDG_CONFIG_HOME/Cursor (默认 ~/.config/Cursor)，更新设置同 Windows
+
+environ 和 home 可以替换，用于在临时目录中测试。
+"""
+import os
+import sys
+
+from .install import linux_candidates, macos_candidates, windows_candidates
+
+
+class Platform:
+    """平台相关的路径和行为"""
+    name = None
+    # 备份名称格式和旧版本完整备份的匹配模式
+    backup_name_format = 'backup_{timestamp}.json'
+    legacy_backup_pattern = '*.json'
+    # Cursor 的进程名 (其他子进程按进程树查找)
+    process_names = ()
+    # 写入后配置文件的权限，None 表示保持原权限
+    config_mode = None
+    # 生成新配置时同时改写 state.json 中的 machineId
+    patch_state_file = False
+    # 'storage': storage.json 中的 update.* 键；'updater_file': 只读的空更新器文件
+    update_control = 'storage'
+    # 非 root 时写入 Cursor 配置需要用密码启动特权助手
+    privileged_helper = False
+
+    def __init__(self, environ=None, home=None):
+        self.environ = os.environ if environ is None else environ
+        self.home = home or self.environ.get('HOME') or os.path.expanduser('~')
+
+    # ------------------------------------------------------------ 路径
+
+    def config_dir(self):
+        """Cursor 的用户数据目录"""
+        raise NotImplementedError
+
+    @property
+    def global_storage(self):
+        return os.path.join(self.config_dir(), 'User', 'globalStorage')
+
+    @property
+    def storage_file(self):
+        return os.path.join(self.global_storage, 'storage.json')
+
+    @property
+    def state_file(self):
+        return os.path.join(self.global_storage, 'state.json')
+
+    @property
+    def backup_dir(self):
+        return os.path.join(self.global_storage, 'backups')
+
+    @property
+    def updater_path(self):
+        """禁用更新时替换为只读空文件的更新器 (只用于 update_control == 'updater_file')"""
+        return None
+
+    def cache_dirs(self):
+        """生成新配置时清理的缓存目录"""
+        return []
+
+    def install_candidates(self):
+        """候选安装位置 [(安装根目录, resources/app 目录, 主程序路径), ...]"""
+        return []
+
+    def install_roots(self):
+        """结束进程时可执行文件必须位于的目录"""
+        return [root for root, _, _ in self.install_candidates()]
+
+    # ------------------------------------------------------------ 特权
+
+    def system_id_ops(self, new_uuid):
+        """更新系统级设备标识的特权操作 (没有时返回空列表)"""
+        return []
+
+    def is_admin(self):
+        """当前进程是否已有管理员权限"""
+        try:
+            return os.geteuid() == 0
+        except AttributeError:
+            return False
+
+    def open_session(self, password=None):
+        """创建执行文件操作的会话 (默认在当前进程中执行)"""
+        from .mac_helper import LocalSession
+        return LocalSession()
+
+
+class WindowsPlatform(Platform):
+    name = 'windows'
+    process_names = ('cursor.exe', 'cursor')
+
+    def config_dir(self):
+        return os.path.join(self.environ.get('APPDATA') or '', 'Cursor')
+
+    def install_candidates(self):
+        return windows_candidates(self.environ.get('LOCALAPPDATA'))
+
+    def is_admin(self):
+        try:
+            import ctypes
+            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except Exception:
+            return False
+
+
+class MacPlatform(Platform):
+    name = 'macos'
+    backup_name_format = 'storage.json.backup_{timestamp}'
+    legacy_backup_pattern = 'storage.json.backup_*'
+    process_names = ('Cursor', 'Cursor Helper', 'Cursor Helper (GPU)',
+                     'Cursor Helper (Renderer)', 'Cursor Helper (Plugin)')
+    config_mode = 0o444
+    patch_state_file = True
+    update_control = 'updater_file'
+    privileged_helper = True
+    applications = '/Applications'
+
+    def config_dir(self):
+        return os.path.join(self.home, 'Library', 'Application Support', 'Cursor')
+
+    @property
+    def updater_path(self):
+        return os.path.join(self.home, 'Library', 'Application Support', 'Caches', 'cursor-updater')
+
+    def cache_dirs(self):
+        return [
+            os.path.join(self.home, 'Library', 'Caches', 'Cursor'),
+            os.path.join(self.config_dir(), 'Cache'),
+            os.path.join(self.config_dir(), 'Code Cache'),
+            os.path.join(self.config_dir(), 'Session Storage'),
+        ]
+
+    def install_candidates(self):
+        return macos_candidates(self.applications)
+
+    def system_id_ops(self, new_uuid):
+        return [{'op': 'nvram', 'name': 'SystemUUID', 'value': new_uuid}]
+
+    def open_session(self, password=None):
+        """已经是 root 时直接执行，否则用密码启动特权助手 (只调用一次 sudo)"""
+        from .mac_helper import HelperSession, LocalSession
+        if self.is_admin() or password is None:
+            return LocalSession()
+        return HelperSession.start(password)
+
+
+class LinuxPlatform(Platform):
+    name = 'linux'
+    process_names = ('cursor', 'Cursor')
+
+    def config_dir(self):
+        config_home = self.environ.get('XDG_CONFIG_HOME') or os.path.join(self.home, '.config')
+        return os.path.join(config_home, 'Cursor')
+
+    def cache_dirs(self):
+        return [
+            os.path.join(self.config_dir(), 'Cache'),
+            os.path.join(self.config_dir(), 'Code Cache'),
+            os.path.join(self.config_dir(), 'Session Storage'),
+        ]
+
+    def install_candidates(self):
+        return linux_candidates(self.home)
+
+
+PLATFORMS = {
+    'windows': WindowsPlatform,
+    'macos': MacPlatform,
+    'linux': LinuxPlatform,
+}
+
+
+def current_platform(environ=None, home=None):
+    """当前系统对应的 Platform"""
+    if sys.platform.startswith('win'):
+        name = 'windows'
+    elif sys.platform == 'darwin':
+        name = 'macos'
+    else:
+        name = 'linux'
+    return PLATFORMS[name](environ, home)
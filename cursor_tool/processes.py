@@ -0,0 +1,160 @@
+"""Cursor 进程的查找和结束
+
+按进程名精确匹配 Cursor 进程，再沿父子关系找出整个进程树 (渲染、GPU、扩展宿主等子进程)。
+名称匹配的进程都会被结束；可执行文件路径 (位于已知安装目录下) 只用于确认和排序：
+已确认的进程先结束，不在已知目录下或无法读取路径的进程 (如其他位置的安装、
+AppImage 挂载) 记录在报告的 unconfirmed 中，而不是被跳过。
+整棵树一次性发送 terminate，用 psutil.wait_procs 等待退出，超时后 kill 剩余进程并再次等待。
+系统进程表只遍历一次，且只读取进程名和父进程号，只对候选进程读取可执行文件路径，
+总耗时由 timeout 和 kill_timeout 限定。
+
+本程序自身及其上级进程 (例如从 Cursor 的终端中启动时) 不会被结束。
+"""
+import os
+import time
+
+import psutil
+
+from . import trace
+
+
+class TerminationReport:
+    """一次结束进程的结果"""
+    def __init__(self):
+        self.found = []       # 匹配到的进程 [(pid, 进程名)]，父进程在前
+        self.unconfirmed = [] # 名称匹配但不在已知安装目录下的进程 [(pid, 进程名)]
+        self.terminated = 0   # 收到 terminate 后退出的进程数
+        self.killed = 0       # 被 kill 的进程数
+        self.remaining = []   # 仍未退出的 pid
+        self.scan_time = 0.0  # 查找进程耗时 (秒)
+        self.elapsed = 0.0    # 总耗时 (秒)
+
+    @property
+    def ok(self):
+        """所有匹配的进程都已退出"""
+        return not self.remaining
+
+    def __str__(self):
+        text = (f"找到 {len(self.found)} 个进程, 正常退出 {self.terminated} 个, "
+                f"强制结束 {self.killed} 个, 查找耗时 {self.scan_time * 1000:.0f} ms, "
+                f"总耗时 {self.elapsed * 1000:.0f} ms")
+        if self.unconfirmed:
+            text += f", 其中不在已知安装目录下: {self.unconfirmed}"
+        if self.remaining:
+            text += f", 未能结束: {self.remaining}"
+        return text
+
+
+def _protected_pids():
+    """本程序自身和上级进程"""
+    pids = {os.getpid()}
+    try:
+        pids.update(parent.pid for parent in psutil.Process().parents())
+    except psutil.Error:
+        pass
+    return pids
+
+
+def _normalize(path):
+    return os.path.normcase(os.path.realpath(path))
+
+
+def _under(path, roots):
+    path = _normalize(path)
+    return any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in roots)
+
+
+def find_processes(names, roots=(), report=None):
+    """查找 Cursor 进程树
+
+    names: 进程名 (不区分大小写，精确匹配)
+    roots: 已知的安装目录；可执行文件位于其中的进程排在前面，
+           其余名称匹配的进程 (含无法读取路径的) 仍然返回，并记入 report.unconfirmed
+    返回 psutil.Process 列表，父进程在子进程之前。
+    """
+    names = {name.lower() for name in names}
+    roots = [_normalize(root) for root in roots if root]
+    protected = _protected_pids()
+
+    children = {}  # 父进程号 -> [子进程]
+    matched = []
+    unconfirmed = []
+    for proc in psutil.process_iter(['ppid', 'name']):
+        info = proc.info
+        children.setdefault(info['ppid'], []).append(proc)
+        if proc.pid in protected or (info['name'] or '').lower() not in names:
+            continue
+        if roots:
+            try:
+                exe = proc.exe()
+            except psutil.Error:
+                exe = None  # 无权访问或已退出
+            if not exe or not _under(exe, roots):
+                unconfirmed.append(proc)
+                continue
+        matched.append(proc)
+    matched.extend(unconfirmed)
+    if report is not None:
+        report.unconfirmed.extend((proc.pid, proc.info['name']) for proc in unconfirmed)
+
+    # 按层展开进程树，子进程即使名称不同也一并结束
+    result = []
+    seen = set()
+    queue = list(matched)
+    while queue:
+        proc = queue.pop(0)
+        if proc.pid in seen or proc.pid in protected:
+            continue
+        seen.add(proc.pid)
+        result.append(proc)
+        queue.extend(children.get(proc.pid, ()))
+    return result
+
+
+def terminate_processes(procs, timeout=5.0, kill_timeout=2.0, report=None):
+    """结束进程：先 terminate 并等待 timeout 秒，仍未退出的再 kill 并等待 kill_timeout 秒"""
+    report = report or TerminationReport()
+    start = time.perf_counter()
+
+    alive = []
+    for proc in procs:
+        info = getattr(proc, 'info', None) or {}  # process_iter 读取的进程名
+        report.found.append((proc.pid, info.get('name')))
+        try:
+            proc.terminate()
+            alive.append(proc)
+        except psutil.NoSuchProcess:
+            report.terminated += 1
+        except psutil.Error as e:
+            print(f"结束进程 {proc.pid} 失败: {e}")
+            alive.append(proc)
+
+    if alive:
+        gone, alive = psutil.wait_procs(alive, timeout=timeout)
+        report.terminated += len(gone)
+
+    if alive:
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+            except psutil.Error as e:
+                print(f"强制结束进程 {proc.pid} 失败: {e}")
+        gone, alive = psutil.wait_procs(alive, timeout=kill_timeout)
+        report.killed += len(gone)
+
+    report.remaining = [proc.pid for proc in alive]
+    report.elapsed += time.perf_counter() - start
+    return report
+
+
+@trace.traced()
+def close_processes(names, roots=(), timeout=5.0, kill_timeout=2.0):
+    """查找并结束 Cursor 进程树，返回 TerminationReport"""
+    report = TerminationReport()
+    start = time.perf_counter()
+    procs = find_processes(names, roots, report)
+    report.scan_time = time.perf_counter() - start
+    report.elapsed = report.scan_time
+    return terminate_processes(procs, timeout, kill_timeout, report)
@@ -0,0 +1,156 @@
+"""并行清理缓存目录
+
+缓存目录 (Cache、Code Cache 等) 可能包含几十万个小文件。清理分两步:
+1. stash: 在同一目录下把缓存目录原子地重命名为 .<名称>.purge-<随机串>，
+   原路径立即空出，Cursor 可以马上重新启动并创建新的缓存；
+2. purge: 用线程池并行删除移走的目录，os.scandir 遍历 (直接使用目录项中的类型信息)，
+   定期通过 progress 报告已删除的文件数和字节数。
+
+purge 也会清理之前中断时遗留的 .purge-* 目录 (见 stashed)。
+"""
+import concurrent.futures
+import os
+import threading
+import time
+import uuid
+
+PURGE_MARK = '.purge-'
+
+
+class PurgeStats:
+    """清理进度和结果"""
+    MAX_ERRORS = 20  # 只保留前几个错误
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.files = 0
+        self.bytes = 0
+        self.dirs = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    def add(self, files, size, dirs=0):
+        with self.lock:
+            self.files += files
+            self.bytes += size
+            self.dirs += dirs
+
+    def error(self, path, e):
+        with self.lock:
+            if len(self.errors) < self.MAX_ERRORS:
+                self.errors.append(f"{path}: {e}")
+
+    def as_dict(self):
+        with self.lock:
+            return {'files': self.files, 'bytes': self.bytes, 'dirs': self.dirs,
+                    'errors': list(self.errors), 'elapsed': self.elapsed}
+
+
+def stash(path):
+    """把目录原子地移到同一目录下的 .<名称>.purge-<随机串>，返回新路径；不存在时返回 None"""
+    path = os.fspath(path)
+    if not os.path.lexists(path):
+        return None
+    parent, name = os.path.split(path.rstrip(os.sep))
+    target = os.path.join(parent, f".{name}{PURGE_MARK}{uuid.uuid4().hex[:8]}")
+    os.rename(path, target)
+    return target
+
+
+def stashed(path):
+    """path 被 stash 后 (包括以前遗留) 的全部目录"""
+    path = os.fspath(path)
+    parent, name = os.path.split(path.rstrip(os.sep))
+    prefix = f".{name}{PURGE_MARK}"
+    try:
+        with os.scandir(parent) as entries:
+            return [entry.path for entry in entries if entry.name.startswith(prefix)]
+    except OSError:
+        return []
+
+
+def _clear_directory(path, stats):
+    """删除目录中的文件，返回子目录列表 (由调用方继续并行处理)"""
+    subdirs = []
+    files = 0
+    size = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    entry_size = entry.stat(follow_symlinks=False).st_size
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    stats.error(entry.path, e)
+                    continue
+                files += 1
+                size += entry_size
+    except OSError as e:
+        stats.error(path, e)
+    stats.add(files, size)
+    return subdirs
+
+
+def purge(paths, workers=None, progress=None, interval=0.2):
+    """并行删除目录 (及其全部内容) 或文件
+
+    workers: 线程数，默认按 CPU 核数 (最多 8 个)；删除主要是系统调用，线程不受 GIL 限制
+    progress: progress(stats_dict)，在调用线程中大约每 interval 秒调用一次
+    返回 PurgeStats.as_dict() 的结果。
+    """
+    stats = PurgeStats()
+    start = time.perf_counter()
+    roots = []
+    for path in map(os.fspath, paths):
+        if os.path.isdir(path) and not os.path.islink(path):
+            roots.append(path)
+        elif os.path.lexists(path):
+            try:
+                size = os.lstat(path).st_size
+                os.unlink(path)
+                stats.add(1, size)
+            except OSError as e:
+                stats.error(path, e)
+
+    if workers is None:
+        workers = min(8, os.cpu_count() or 1)
+
+    directories = list(roots)
+    last_report = start
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_clear_directory, root, stats) for root in roots}
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, timeout=interval, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                subdirs = future.result()
+                directories.extend(subdirs)
+                pending.update(pool.submit(_clear_directory, subdir, stats) for subdir in subdirs)
+            now = time.perf_counter()
+            if progress is not None and now - last_report >= interval:
+                last_report = now
+                progress(stats.as_dict())
+
+    # 目录已经清空，从最深的一层开始删除
+    directories.sort(key=lambda path: path.count(os.sep), reverse=True)
+    removed = 0
+    for directory in directories:
+        try:
+            os.rmdir(directory)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            stats.error(directory, e)
+    stats.add(0, 0, removed)
+
+    stats.elapsed = time.perf_counter() - start
+    result = stats.as_dict()
+    if progress is not None:
+        progress(result)
+    return result
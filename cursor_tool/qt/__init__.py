@@ -0,0 +1 @@
+"""Cursor ID 修改器的 Qt 共享组件"""
@@ -0,0 +1,327 @@
+"""虚拟化的备份列表
+
+备份列表使用 QListView + QAbstractListModel，每一行由委托直接绘制
+(备份信息和 恢复/删除 两个按钮)，不再为每个备份创建 QFrame/QLabel/QPushButton。
+模型按批次加载行 (canFetchMore/fetchMore)，备份信息只在行第一次显示时读取；
+删除备份时只移除对应的行，打开对话框的时间和内存与备份数量基本无关。
+提供 formatter 时模型缓存与语言无关的备份信息 (摘要)，切换语言只重新格式化文本。
+提供 TaskEngine 时备份信息在后台任务中读取，读取完成前行显示占位文本。
+"""
+from PyQt6 import sip
+from PyQt6.QtCore import (QAbstractListModel, QEvent, QModelIndex, QRect, QRectF,
+                          QSize, Qt, QTimer, pyqtSignal)
+from PyQt6.QtGui import QColor, QFontMetrics, QPainter
+from PyQt6.QtWidgets import QAbstractItemView, QListView, QStyledItemDelegate
+
+# 备份路径对应的数据角色
+BackupRole = Qt.ItemDataRole.UserRole + 1
+
+
+class BackupListModel(QAbstractListModel):
+    """备份列表模型"""
+    def __init__(self, backups, info_provider, infos=None, batch_size=100, formatter=None,
+                 tasks=None, placeholder='...', parent=None):
+        """
+        backups: 备份路径列表 (按显示顺序)
+        info_provider: info_provider(backup) 返回备份信息 (没有 formatter 时为文本)
+        infos: 已读取的备份信息 {备份路径: 信息}
+        formatter: formatter(信息) 返回显示的文本
+        tasks: 执行 info_provider 的 TaskEngine，为 None 时在绘制时直接读取
+        placeholder: 后台读取完成前显示的文本
+        """
+        super().__init__(parent)
+        self.backups = list(backups)
+        self.info_provider = info_provider
+        self.infos = dict(infos or {})
+        self.formatter = formatter
+        self.tasks = tasks
+        self.placeholder = placeholder
+        self.texts = {}  # 已格式化的文本
+        self.errors = {}  # 读取失败的备份 -> 错误信息
+        self.batch_size = batch_size
+        self.loaded = 0  # 已经交给视图的行数
+        self._requested = []      # 等待提交读取的备份
+        self._pending = set()     # 已请求、尚未读取完成的备份
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.backups)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.batch_size, len(self.backups) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        backup = self.backups[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.text(backup)
+        if role == BackupRole:
+            return backup
+        return None
+
+    def text(self, backup):
+        """备份信息的显示文本，优先使用已读取的结果"""
+        text = self.texts.get(backup)
+        if text is None:
+            if backup in self.errors:
+                return self.errors[backup]
+            try:
+                info = self.infos.get(backup)
+                if info is None:
+                    if self.tasks is not None:
+                        self._request(backup)
+                        return self.placeholder
+                    info = self.infos[backup] = self.info_provider(backup)
+                text = info if self.formatter is None else self.formatter(info)
+            except Exception as e:
+                return str(e)
+            self.texts[backup] = text
+        return text
+
+    def _request(self, backup):
+        """请求在后台读取备份信息 (同一轮事件中请求的备份合并为一个任务)"""
+        if backup in self._pending:
+            return
+        self._pending.add(backup)
+        if not self._requested:
+            QTimer.singleShot(0, self._submit)
+        self._requested.append(backup)
+
+    def _submit(self):
+        backups, self._requested = self._requested, []
+        if backups:
+            self.tasks.submit('backup_info', self._read_infos, backups,
+                              on_done=self._on_infos, background=True)
+
+    def _read_infos(self, backups):
+        """读取一批备份信息 (工作线程)，返回 (信息, 错误信息)"""
+        infos, errors = {}, {}
+        for backup in backups:
+            try:
+                infos[backup] = self.info_provider(backup)
+            except Exception as e:
+                errors[backup] = str(e)
+        return infos, errors
+
+    def _on_infos(self, result):
+        if sip.isdeleted(self):
+            return  # 读取完成前对话框已经关闭
+        infos, errors = result
+        self._pending.difference_update(infos)
+        self._pending.difference_update(errors)
+        # 读取期间已删除的备份不再缓存
+        present = set(self.backups)
+        self.infos.update((backup, info) for backup, info in infos.items() if backup in present)
+        self.errors.update((backup, error) for backup, error in errors.items() if backup in present)
+        # 只刷新已加载的、读取到信息的行
+        rows = [row for row, backup in enumerate(self.backups[:self.loaded])
+                if backup in infos or backup in errors]
+        for row in rows:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+    def set_infos(self, infos):
+        """替换缓存的备份信息，只刷新已加载的行"""
+        self.infos = dict(infos)
+        self._reformat()
+
+    def set_formatter(self, formatter):
+        """替换格式化函数 (如切换语言后)，不重新读取备份"""
+        self.formatter = formatter
+        self._reformat()
+
+    def _reformat(self):
+        self.texts = {}
+        if self.loaded:
+            self.dataChanged.emit(self.index(0), self.index(self.loaded - 1),
+                                  [Qt.ItemDataRole.DisplayRole])
+
+    def remove_backup(self, backup):
+        """移除一个备份对应的行"""
+        try:
+            row = self.backups.index(backup)
+        except ValueError:
+            return False
+        self._remove_row(row)
+        return True
+
+    def set_backups(self, backups):
+        """更新备份列表，只插入和移除发生变化的行
+
+        新列表与当前列表的排序方式需要一致。
+        """
+        keep = set(backups)
+        for row in reversed(range(len(self.backups))):
+            if self.backups[row] not in keep:
+                self._remove_row(row)
+
+        present = set(self.backups)
+        for row, backup in enumerate(backups):
+            if backup not in present:
+                self._insert_row(row, backup)
+
+    def _remove_row(self, row):
+        backup = self.backups[row]
+        if row < self.loaded:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.backups[row]
+            self.loaded -= 1
+            self.endRemoveRows()
+        else:
+            del self.backups[row]
+        self.infos.pop(backup, None)
+        self.texts.pop(backup, None)
+        self.errors.pop(backup, None)
+
+    def _insert_row(self, row, backup):
+        if row < self.loaded:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.backups.insert(row, backup)
+            self.loaded += 1
+            self.endInsertRows()
+        else:
+            # 还未加载的位置，由 fetchMore 按需加载
+            self.backups.insert(row, backup)
+
+
+class BackupDelegate(QStyledItemDelegate):
+    """绘制备份信息和 恢复/删除 按钮的委托"""
+    restore_clicked = pyqtSignal(object)  # 备份路径
+    delete_clicked = pyqtSignal(object)   # 备份路径
+
+    MARGIN = 6
+    PADDING = 10
+    SPACING = 10
+    BUTTON_HEIGHT = 32
+
+    def __init__(self, font, restore_text, delete_text, button_width=None, parent=None):
+        """
+        font: 备份信息的字体
+        button_width: 按钮宽度，为 None 时两个按钮平分一行
+        """
+        super().__init__(parent)
+        self.font = font
+        self.metrics = QFontMetrics(font)
+        self.restore_text = restore_text
+        self.delete_text = delete_text
+        self.button_width = button_width
+        self.hover = None  # (行号, 'restore' | 'delete')
+
+    def set_texts(self, restore_text, delete_text):
+        """更新按钮文本"""
+        self.restore_text = restore_text
+        self.delete_text = delete_text
+
+    @staticmethod
+    def _text(index):
+        return (index.data(Qt.ItemDataRole.DisplayRole) or '').strip('\n')
+
+    def _layout(self, rect, text):
+        """计算卡片、信息文本和两个按钮的位置"""
+        card = rect.adjusted(self.MARGIN, self.MARGIN // 2, -self.MARGIN, -self.MARGIN // 2)
+        inner = card.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        text_height = (text.count('\n') + 1) * self.metrics.lineSpacing()
+        text_rect = QRect(inner.left(), inner.top(), inner.width(), text_height)
+
+        top = text_rect.bottom() + 1 + self.SPACING
+        if self.button_width is None:
+            width = (inner.width() - self.SPACING) // 2
+        else:
+            width = self.button_width
+        restore_rect = QRect(inner.left(), top, width, self.BUTTON_HEIGHT)
+        delete_rect = QRect(restore_rect.right() + 1 + self.SPACING, top, width, self.BUTTON_HEIGHT)
+        return card, text_rect, restore_rect, delete_rect
+
+    def sizeHint(self, option, index):
+        text = self._text(index)
+        height = ((text.count('\n') + 1) * self.metrics.lineSpacing()
+                  + 2 * self.PADDING + self.SPACING + self.BUTTON_HEIGHT + self.MARGIN)
+        # 宽度随视图变化 (见 create_backup_view)，这里只决定行高
+        return QSize(200, height)
+
+    def paint(self, painter, option, index):
+        text = self._text(index)
+        card, text_rect, restore_rect, delete_rect = self._layout(option.rect, text)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # 卡片背景
+        painter.setPen(QColor('#dcdde1'))
+        painter.setBrush(QColor('#ffffff'))
+        painter.drawRoundedRect(QRectF(card).adjusted(0.5, 0.5, -0.5, -0.5), 5, 5)
+
+        # 备份信息
+        painter.setFont(self.font)
+        painter.setPen(QColor('#2f3542'))
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, text)
+
+        # 按钮
+        painter.setFont(option.font)
+        for kind, rect, label in (('restore', restore_rect, self.restore_text),
+                                  ('delete', delete_rect, self.delete_text)):
+            hovered = self.hover == (index.row(), kind)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor('#6a89cc' if hovered else '#4a69bd'))
+            painter.drawRoundedRect(QRectF(rect), 5, 5)
+            painter.setPen(QColor('#ffffff'))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, label)
+
+        painter.restore()
+
+    def _button_at(self, option, index, pos):
+        _, _, restore_rect, delete_rect = self._layout(option.rect, self._text(index))
+        if restore_rect.contains(pos):
+            return 'restore'
+        if delete_rect.contains(pos):
+            return 'delete'
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseMove:
+            kind = self._button_at(option, index, event.position().toPoint())
+            hover = (index.row(), kind) if kind else None
+            if hover != self.hover:
+                self.hover = hover
+                view = self.parent()
+                if isinstance(view, QAbstractItemView):
+                    view.viewport().update()
+            return False
+
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton):
+            kind = self._button_at(option, index, event.position().toPoint())
+            backup = index.data(BackupRole)
+            if kind == 'restore':
+                self.restore_clicked.emit(backup)
+                return True
+            if kind == 'delete':
+                self.delete_clicked.emit(backup)
+                return True
+        return False
+
+
+def create_backup_view(model, delegate):
+    """创建显示备份列表的 QListView"""
+    view = QListView()
+    view.setModel(model)
+    view.setItemDelegate(delegate)
+    delegate.setParent(view)
+    view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+    view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+    view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+    view.setResizeMode(QListView.ResizeMode.Adjust)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    view.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+    view.setMouseTracking(True)
+    view.setObjectName('backup_list')  # 样式由应用级样式表设置 (见 theme.BASE)
+    return view
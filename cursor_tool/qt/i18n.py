@@ -0,0 +1,97 @@
+"""界面文本的翻译绑定
+
+每个需要翻译的控件在创建时登记一次它的文本键，切换语言时只遍历一次登记表，
+不再用 findChildren 查找控件、按位置对应按钮，也不重新读取文件。
+
+语言字典在创建 Translator 时展开为 {'buttons.others.about': 文本} 的平面表
+(字符串驻留)，之后每次查找只是一次字典访问。
+
+    i18n = Translator({'zh': Language.CHINESE, 'en': Language.ENGLISH}, 'zh')
+    i18n.bind(button, 'buttons.others.about')
+    i18n.bind(label, 'version', args=lambda: (version,))
+    i18n.bind(window, 'title', 'setWindowTitle')
+    i18n.switch('en')
+"""
+import functools
+import sys
+
+
+def flatten(table, prefix=''):
+    """嵌套的语言字典 -> {'a.b.c': 文本}，字符串驻留"""
+    flat = {}
+    for key, value in table.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        else:
+            flat[sys.intern(name)] = sys.intern(value) if isinstance(value, str) else value
+    return flat
+
+
+class Translator:
+    """已登记控件的文本，切换语言时一次更新"""
+    def __init__(self, languages, language):
+        """
+        languages: {语言: 嵌套的文本字典}
+        language: 当前语言
+        """
+        self.tables = {name: flatten(table) for name, table in languages.items()}
+        self.language = language
+        self.table = self.tables[language]
+        self._bindings = {}  # id(target) -> {setter: (target, keys, setter, args)}
+        self._callbacks = []
+
+    def text(self, key):
+        return self.table[key]
+
+    def bind(self, target, key, setter='setText', args=None):
+        """登记 target 的文本并立即设置
+
+        key: 文本键，或多个键的元组 (setter 按顺序接收多个文本)
+        setter: target 的方法名，或接收文本的函数
+        args: args() 返回格式化文本的参数 (如版本号)，参数变化后调用 refresh(target)
+        """
+        keys = key if isinstance(key, tuple) else (key,)
+        bindings = self._bindings.get(id(target))
+        if bindings is None:
+            bindings = self._bindings[id(target)] = {}
+            # Qt 对象销毁 (如关闭的对话框) 时自动注销
+            if hasattr(target, 'destroyed'):
+                target.destroyed.connect(functools.partial(self._forget, id(target)))
+        bindings[setter] = (target, keys, setter, args)
+        self._apply(target, keys, setter, args)
+        return target
+
+    def unbind(self, target):
+        self._forget(id(target))
+
+    def _forget(self, target_id, *_):
+        self._bindings.pop(target_id, None)
+
+    def on_switch(self, callback):
+        """callback() 在每次切换语言后调用 (用于依赖其他状态的文本)"""
+        self._callbacks.append(callback)
+
+    def _apply(self, target, keys, setter, args):
+        texts = [self.table[key] for key in keys]
+        if args is not None:
+            texts = [text.format(*args()) for text in texts]
+        if isinstance(setter, str):
+            getattr(target, setter)(*texts)
+        else:
+            setter(*texts)
+
+    def refresh(self, target):
+        """格式化参数变化后重新设置 target 的文本"""
+        for binding in self._bindings.get(id(target), {}).values():
+            self._apply(*binding)
+
+    def switch(self, language):
+        """切换语言，依次更新所有已登记的控件"""
+        self.language = language
+        self.table = self.tables[language]
+        for bindings in list(self._bindings.values()):
+            for binding in bindings.values():
+                self._apply(*binding)
+        for callback in self._callbacks:
+            callback()
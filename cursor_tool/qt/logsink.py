@@ -0,0 +1,70 @@
+"""批量日志输出
+
+日志先进入缓冲区，由定时器大约每帧一次合并写入 QTextEdit，
+避免每条日志都强制重绘和嵌套事件循环。缓冲区和文档都有行数上限。
+"""
+import collections
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtGui import QTextCursor
+
+
+class LogSink(QObject):
+    """QTextEdit 的批量日志输出 (只能在 GUI 线程中调用)"""
+    def __init__(self, text_edit, max_lines=5000, interval_ms=16, rich_text=False):
+        super().__init__(text_edit)
+        self.text_edit = text_edit
+        self.rich_text = rich_text
+        self.pending = collections.deque(maxlen=max_lines)  # 环形缓冲区
+        self.dropped = 0
+
+        # 文档只保留最近的 max_lines 行，且不记录撤销历史
+        document = text_edit.document()
+        document.setMaximumBlockCount(max_lines)
+        document.setUndoRedoEnabled(False)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def write(self, line):
+        """写入一行日志，在下一次刷新时显示"""
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(line)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        """把缓冲区中的日志一次性写入文本框"""
+        if not self.pending:
+            return
+
+        lines = list(self.pending)
+        self.pending.clear()
+        if self.dropped:
+            lines.insert(0, f"... (省略 {self.dropped} 行日志)")
+            self.dropped = 0
+
+        # 只有在用户停留在底部时才自动滚动
+        scrollbar = self.text_edit.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+
+        document = self.text_edit.document()
+        first = document.isEmpty()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for line in lines:
+            if not first:
+                cursor.insertBlock()
+            first = False
+            if self.rich_text:
+                cursor.insertHtml(line)
+            else:
+                cursor.insertText(line)
+        cursor.endEditBlock()
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
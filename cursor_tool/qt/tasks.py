@@ -0,0 +1,133 @@
+"""后台任务引擎
+
+基于 QThreadPool/QRunnable，把 CursorModifier 的耗时操作移出 GUI 线程。
+进度、完成和错误都通过 Qt 信号排队回到 GUI 线程，回调里可以直接操作界面。
+"""
+import itertools
+import traceback
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from .. import trace
+
+
+class TaskSignals(QObject):
+    """任务信号 (在 GUI 线程创建，由工作线程发射)"""
+    progress = pyqtSignal(int, int, str)   # 任务ID, 百分比(-1 表示未知), 消息
+    finished = pyqtSignal(int, object)     # 任务ID, 返回值
+    error = pyqtSignal(int, str)           # 任务ID, 错误信息
+
+
+class Task(QRunnable):
+    """在线程池中执行的单个任务"""
+    def __init__(self, task_id, name, fn, args=(), kwargs=None, with_progress=False):
+        super().__init__()
+        # 任务对象由 TaskEngine 持有，不交给线程池释放
+        self.setAutoDelete(False)
+        self.task_id = task_id
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.with_progress = with_progress
+        self.signals = TaskSignals()
+
+    def report(self, message, percent=-1):
+        """报告进度，可在任务函数中调用"""
+        self.signals.progress.emit(self.task_id, int(percent), str(message))
+
+    def run(self):
+        """执行任务"""
+        try:
+            # 每个任务是一个顶层 span，CursorModifier 的操作记录在它下面
+            with trace.span('task.' + self.name):
+                if self.with_progress:
+                    result = self.fn(*self.args, progress=self.report, **self.kwargs)
+                else:
+                    result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(self.task_id, str(e))
+        else:
+            self.signals.finished.emit(self.task_id, result)
+
+
+class TaskEngine(QObject):
+    """后台任务引擎
+
+    默认只使用一个工作线程，保证对 storage.json 的操作按提交顺序串行执行。
+    """
+    task_started = pyqtSignal(str)             # 任务名
+    task_progress = pyqtSignal(str, int, str)  # 任务名, 百分比, 消息
+    task_failed = pyqtSignal(str, str)         # 任务名, 错误信息
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, max_threads=1):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._tasks = {}  # 任务ID -> (任务, 完成回调, 错误回调)
+        self._background = set()  # 不影响忙碌状态的任务ID
+
+    def submit(self, name, fn, *args, on_done=None, on_error=None,
+               with_progress=False, background=False, **kwargs):
+        """提交任务
+
+        fn 在工作线程中执行；on_done(result) 和 on_error(message) 在 GUI 线程中调用。
+        with_progress 为 True 时，fn 会收到 progress(message, percent=-1) 关键字参数。
+        background 为 True 时任务仍按顺序执行，但不改变忙碌状态，也不发射 task_started
+        (如界面按需读取的数据)。
+        """
+        task = Task(next(self._ids), name, fn, args, kwargs, with_progress)
+        task.signals.progress.connect(self._on_progress)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.error.connect(self._on_error)
+
+        was_busy = self.is_busy()
+        self._tasks[task.task_id] = (task, on_done, on_error)
+        if background:
+            self._background.add(task.task_id)
+        else:
+            if not was_busy:
+                self.busy_changed.emit(True)
+            self.task_started.emit(name)
+        self.pool.start(task)
+        return task
+
+    def is_busy(self):
+        """是否有未完成的任务 (后台任务除外)"""
+        return len(self._tasks) > len(self._background)
+
+    def wait(self, msecs=-1):
+        """等待所有任务结束 (仅用于退出时)"""
+        return self.pool.waitForDone(msecs)
+
+    @pyqtSlot(int, int, str)
+    def _on_progress(self, task_id, percent, message):
+        entry = self._tasks.get(task_id)
+        if entry:
+            self.task_progress.emit(entry[0].name, percent, message)
+
+    @pyqtSlot(int, object)
+    def _on_finished(self, task_id, result):
+        task, on_done, _ = self._tasks.pop(task_id, (None, None, None))
+        # 回调中可能弹出模态对话框，先更新忙碌状态
+        self._after_task(task_id)
+        if on_done:
+            on_done(result)
+
+    @pyqtSlot(int, str)
+    def _on_error(self, task_id, message):
+        task, _, on_error = self._tasks.pop(task_id, (None, None, None))
+        self._after_task(task_id)
+        if on_error:
+            on_error(message)
+        elif task:
+            self.task_failed.emit(task.name, message)
+
+    def _after_task(self, task_id):
+        if task_id in self._background:
+            self._background.discard(task_id)
+        elif not self.is_busy():
+            self.busy_changed.emit(False)
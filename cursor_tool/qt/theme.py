@@ -0,0 +1,38 @@
+"""应用级样式表
+
+整个程序只安装一个样式表 (QApplication.setStyleSheet)，由 Qt 解析一次，
+窗口和对话框不再各自设置样式表，创建对话框时也不需要重新解析。
+控件的状态用动态属性表示，样式表中用属性选择器匹配:
+
+    QPushButton[state="active"] { background-color: #95a5a6; }
+
+    set_state(button, 'active')   # 只重新计算这个控件的样式
+
+BASE 是两个平台共用的规则 (如备份列表)，各平台的样式表接在后面。
+"""
+from PyQt6.QtWidgets import QApplication
+
+BASE = """
+QListView#backup_list {
+    border: none;
+    background-color: transparent;
+}
+"""
+
+
+def install(stylesheet):
+    """把 BASE + stylesheet 安装为应用级样式表 (内容相同时不重复安装)"""
+    app = QApplication.instance()
+    stylesheet = BASE + stylesheet
+    if app is not None and app.styleSheet() != stylesheet:
+        app.setStyleSheet(stylesheet)
+
+
+def set_state(widget, value, name='state'):
+    """设置控件的状态属性，值变化时只重新 polish 这个控件"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
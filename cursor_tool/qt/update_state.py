@@ -0,0 +1,129 @@
+"""自动更新状态模型
+
+自动更新状态保存在内存中，只有状态文件 (Windows 的 storage.json、
+macOS 的 cursor-updater) 发生变化时才重新读取。文件变化由 QFileSystemWatcher
+监听 (Linux 上基于 inotify，macOS 上基于 kqueue/FSEvents)，
+状态变化时发射 changed 信号，按钮直接绑定该信号。
+提供 TaskEngine 时读取在工作线程中执行，GUI 线程只检查文件签名，结果在完成回调中应用。
+"""
+import os
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+
+class UpdateStateModel(QObject):
+    """自动更新是否启用 (只能在 GUI 线程中使用)"""
+    changed = pyqtSignal(bool)  # 自动更新是否启用
+
+    def __init__(self, path, reader, tasks=None, debounce_ms=100, parent=None):
+        """
+        path: 决定更新状态的文件
+        reader: reader() 返回自动更新是否启用
+        tasks: 执行 reader 的 TaskEngine，为 None 时在 GUI 线程中直接读取
+               (使用单独的引擎，读取不必等待其他操作，也不改变它们的忙碌状态)
+        debounce_ms: 文件连续变化时合并为一次读取
+        """
+        super().__init__(parent)
+        self.path = os.fspath(path)
+        self.reader = reader
+        self.tasks = tasks
+        self.enabled = None
+        self._signature = None  # 上次读取时文件的 (inode, mtime, size)
+        self._reading = False   # 后台读取尚未完成
+        self._stale = False     # 读取期间文件又发生了变化
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._schedule)
+        self.watcher.directoryChanged.connect(self._schedule)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(self.refresh)
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _watch(self):
+        """监听文件和它所在的目录
+
+        原子替换 (rename) 后文件监听会失效，目录监听负责发现文件被替换、创建或删除，
+        每次读取后重新添加文件监听。目录不存在时监听最近的上级目录。
+        """
+        wanted = []
+        if os.path.exists(self.path):
+            wanted.append(self.path)
+        directory = os.path.dirname(self.path)
+        while directory and not os.path.isdir(directory):
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+        if directory and os.path.isdir(directory):
+            wanted.append(directory)
+
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        stale = [path for path in watched if path not in wanted]
+        if stale:
+            self.watcher.removePaths(stale)
+        missing = [path for path in wanted if path not in watched]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def _schedule(self, path=None):
+        self.timer.start()
+
+    def refresh(self, force=False):
+        """重新读取状态 (文件未变化时跳过)，状态变化时发射 changed
+
+        使用 TaskEngine 时在后台读取，返回的是当前已知的状态 (首次读取完成前为 None)。
+        """
+        self.timer.stop()
+        self._watch()
+        signature = self._stat()
+        if not force and self.enabled is not None and signature == self._signature:
+            return self.enabled
+        self._signature = signature
+
+        if self.tasks is None:
+            try:
+                self._apply(self.reader())
+            except Exception as e:
+                self._failed(str(e))
+            return self.enabled
+
+        if self._reading:
+            # 当前读取完成后再读一次
+            self._stale = True
+        else:
+            self._reading = True
+            self.tasks.submit('update_state', self.reader, on_done=self._on_read, on_error=self._on_failed)
+        return self.enabled
+
+    def _on_read(self, enabled):
+        self._reading = False
+        self._apply(enabled)
+        self._reread()
+
+    def _on_failed(self, message):
+        self._reading = False
+        self._failed(message)
+        self._reread()
+
+    def _reread(self):
+        if self._stale:
+            self._stale = False
+            self.refresh(force=True)
+
+    def _failed(self, message):
+        print(f"读取更新状态失败: {message}")
+
+    def _apply(self, enabled):
+        enabled = bool(enabled)
+        if enabled != self.enabled:
+            self.enabled = enabled
+            self.changed.emit(enabled)
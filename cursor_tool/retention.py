@@ -0,0 +1,207 @@
+"""备份保留策略
+
+    RetentionPolicy(keep_last=20, hourly=24, daily=7, weekly=8, max_bytes=200 * 1024 * 1024)
+
+keep_last 保留最新的 N 个备份；hourly / daily / weekly 在最近的 N 个小时 / 天 / 周
+(按本地时间分组，有备份的时段才计数) 中各保留该时段最新的一个备份。被任一规则保留的
+备份都不删除；没有配置任何规则时保留全部备份。max_bytes 限制备份占用的空间，超出时
+从最旧的备份开始删除 (不受上述规则保护，但最新的备份总是保留)。只删除能释放空间的
+备份：与其他备份共享对象、或是其他备份的差异基准的备份会被跳过。
+
+RetentionEngine 按时间顺序接收备份，每新增一个备份只需 O(1) 的工作 (均摊)，
+所以每次备份后都可以直接调用 add，而不必重新扫描全部备份。
+"""
+import collections
+import datetime
+
+# 时间分组规则 -> 分组键的格式
+BUCKET_FORMATS = {
+    'hourly': '%Y-%m-%d %H',
+    'daily': '%Y-%m-%d',
+    'weekly': '%G-W%V',
+}
+
+
+class RetentionPolicy:
+    """备份保留策略 (0 / None 表示不使用该规则)"""
+    def __init__(self, keep_last=None, hourly=0, daily=0, weekly=0, max_bytes=None):
+        self.keep_last = keep_last
+        self.hourly = hourly
+        self.daily = daily
+        self.weekly = weekly
+        self.max_bytes = max_bytes
+
+    def rules(self):
+        """[(规则名称, 保留数量), ...]，只包括启用的规则"""
+        rules = [('last', self.keep_last)]
+        rules.extend((name, getattr(self, name)) for name in BUCKET_FORMATS)
+        return [(name, count) for name, count in rules if count]
+
+    def as_dict(self):
+        return {'keep_last': self.keep_last, 'hourly': self.hourly, 'daily': self.daily,
+                'weekly': self.weekly, 'max_bytes': self.max_bytes}
+
+    def __repr__(self):
+        fields = ', '.join(f"{key}={value!r}" for key, value in self.as_dict().items() if value)
+        return f"RetentionPolicy({fields})"
+
+
+# 默认策略: 最近 20 个、24 小时、7 天和 8 周中的备份，总大小不超过 200 MB
+DEFAULT_POLICY = RetentionPolicy(keep_last=20, hourly=24, daily=7, weekly=8,
+                                 max_bytes=200 * 1024 * 1024)
+
+
+class RetentionEngine:
+    """增量地应用保留策略
+
+    条目是 {'name', 'timestamp', 'size'} 字典，可以带 'blob' (共享内容的对象ID，
+    同一对象只计一次大小)、'stored' (实际占用的字节数，缺省为 size)，
+    以及差异备份的 'base' / 'base_stored' (依赖的基准对象及其大小)。
+    """
+    def __init__(self, policy):
+        self.policy = policy
+        self.rules = policy.rules()
+        self._alive = {}                      # 名称 -> 条目
+        self._order = collections.deque()     # 按时间排列的名称 (已删除的名称在取出时跳过)
+        self._kept = {rule: collections.deque() for rule, _ in self.rules}  # 规则 -> [(分组, 名称)]
+        self._protect = collections.Counter() # 名称 -> 保留它的规则数
+        self._blobs = collections.Counter()   # 对象ID -> 引用数 (含作为差异基准的引用)
+        self.total_bytes = 0
+        self.newest = None
+
+    def __len__(self):
+        return len(self._alive)
+
+    def extend(self, entries):
+        """按时间顺序加入多个备份，返回应删除的备份"""
+        removed = []
+        for entry in sorted(entries, key=lambda entry: entry['timestamp']):
+            removed.extend(self.add(entry))
+        return removed
+
+    def _bucket(self, rule, entry):
+        if rule == 'last':
+            return entry['name']
+        moment = datetime.datetime.fromtimestamp(entry['timestamp'])
+        return moment.strftime(BUCKET_FORMATS[rule])
+
+    def _objects(self, entry):
+        """条目占用的对象 [(对象ID, 字节数)]: 自身的对象，以及差异依赖的基准"""
+        objects = [(entry.get('blob') or entry['name'], entry.get('stored', entry['size']))]
+        if entry.get('base'):
+            objects.append((entry['base'], entry.get('base_stored', 0)))
+        return objects
+
+    def _frees(self, name):
+        """删除 name 能否释放空间 (有只被它引用的对象)"""
+        return any(self._blobs[key] == 1 for key, _ in self._objects(self._alive[name]))
+
+    def _release(self, name, removed):
+        """name 失去一个规则的保护，不再受保护时删除"""
+        self._protect[name] -= 1
+        if self._protect[name] <= 0:
+            self._protect.pop(name, None)
+            if self.rules and name in self._alive:
+                self._drop(name)
+                removed.append({'name': name, 'reason': 'policy'})
+
+    def _drop(self, name):
+        entry = self._alive.pop(name)
+        for key, size in self._objects(entry):
+            self._blobs[key] -= 1
+            if self._blobs[key] <= 0:
+                del self._blobs[key]
+                self.total_bytes -= size
+
+    def add(self, entry):
+        """加入一个比已有备份都新的备份，返回因此应删除的备份 [{'name', 'reason'}, ...]
+
+        比最新备份更旧的条目 (如时钟回拨) 按正常顺序重新计算全部备份。
+        """
+        if self.newest is not None and entry['timestamp'] < self.newest['timestamp']:
+            return self._rebuild_with(entry)
+
+        name = entry['name']
+        self._alive[name] = entry
+        self._order.append(name)
+        self.newest = entry
+        for key, size in self._objects(entry):
+            if self._blobs[key] == 0:
+                self.total_bytes += size
+            self._blobs[key] += 1
+
+        removed = []
+        for rule, count in self.rules:
+            bucket = self._bucket(rule, entry)
+            kept = self._kept[rule]
+            self._protect[name] += 1
+            if kept and kept[-1][0] == bucket:
+                # 同一时段中只保留最新的备份
+                self._release(kept.pop()[1], removed)
+            kept.append((bucket, name))
+            if len(kept) > count:
+                self._release(kept.popleft()[1], removed)
+
+        max_bytes = self.policy.max_bytes
+        if max_bytes and self.total_bytes > max_bytes:
+            self._limit_size(max_bytes, removed)
+
+        # 定期清理队列中已删除的名称
+        if len(self._order) > 2 * len(self._alive) + 16:
+            self._order = collections.deque(name for name in self._order if name in self._alive)
+        return removed
+
+    def _limit_size(self, max_bytes, removed):
+        """从最旧的备份开始删除能释放空间的备份，直到不超过 max_bytes (最新的备份总是保留)"""
+        skipped = []
+        while self.total_bytes > max_bytes and self._order:
+            name = self._order.popleft()
+            if name not in self._alive:
+                continue
+            if name == self.newest['name']:
+                skipped.append(name)
+                break
+            if not self._frees(name):
+                # 对象仍被其他备份引用 (共享内容或差异基准)，删除它不释放空间
+                skipped.append(name)
+                continue
+            for rule in self._kept:
+                kept = self._kept[rule]
+                if kept and kept[0][1] == name:
+                    kept.popleft()
+                elif any(item[1] == name for item in kept):
+                    # 跳过了更旧的备份时，被删除的备份不一定在队列最前面
+                    self._kept[rule] = collections.deque(item for item in kept if item[1] != name)
+            self._protect.pop(name, None)
+            self._drop(name)
+            removed.append({'name': name, 'reason': 'size'})
+        self._order.extendleft(reversed(skipped))
+
+    def _rebuild_with(self, entry):
+        engine = RetentionEngine(self.policy)
+        removed = engine.extend(list(self._alive.values()) + [entry])
+        self.__dict__.update(engine.__dict__)
+        return removed
+
+    def discard(self, name):
+        """备份已在别处删除 (如用户手动删除)，从记录中移除"""
+        if name not in self._alive:
+            return
+        for rule in self._kept:
+            self._kept[rule] = collections.deque(item for item in self._kept[rule] if item[1] != name)
+        self._protect.pop(name, None)
+        self._drop(name)
+        if self.newest is not None and self.newest['name'] == name:
+            self.newest = max(self._alive.values(), key=lambda entry: entry['timestamp'], default=None)
+
+
+def plan(entries, policy):
+    """对全部备份应用策略，返回 (保留的条目, 删除的条目)
+
+    删除的条目带 'reason' ('policy' 或 'size')，用于预览 (dry run)。
+    """
+    ordered = sorted(entries, key=lambda entry: entry['timestamp'])
+    reasons = {item['name']: item['reason'] for item in RetentionEngine(policy).extend(ordered)}
+    keep = [entry for entry in ordered if entry['name'] not in reasons]
+    remove = [dict(entry, reason=reasons[entry['name']]) for entry in ordered if entry['name'] in reasons]
+    return keep, remove
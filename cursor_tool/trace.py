@@ -0,0 +1,269 @@
+"""操作耗时追踪
+
+用 span 记录每个操作及其子步骤的耗时、读写的字节数和启动的子进程数，
+可以导出为 Chrome trace (chrome://tracing、Perfetto) 或 JSON-lines。
+
+    from cursor_tool import trace
+
+    @trace.traced()
+    def restore_backup(self, path): ...
+
+    with trace.span('copy', path=path) as s:
+        ...
+        s.count('bytes_written', len(data))
+    trace.count('subprocesses')          # 计入当前线程正在执行的 span
+
+未启用时 span() 返回同一个空对象，traced 的函数只多一次全局变量判断。
+启用方式:
+
+    tracer = trace.enable()              # 或设置环境变量 CURSOR_TRACE=trace.json
+    tracer.add_sink(print_span)          # 每个 span 结束时回调 (如 GUI 日志面板)
+    tracer.export('trace.json')          # .jsonl 为 JSON-lines，其他为 Chrome trace
+
+子 span 的计数会累加到父 span，所以顶层操作的计数是全部子步骤的总和。
+add_hook 登记的对象在 span 开始和结束时收到 span_started(span) / span_finished(span)
+(在计时范围之外调用，如 memprof 的内存快照)。
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+# 当前的 Tracer，未启用时为 None
+_tracer = None
+_local = threading.local()
+
+
+class Span:
+    """一次操作的记录"""
+    __slots__ = ('tracer', 'name', 'args', 'counters', 'thread', 'depth', 'start', 'end', 'error')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.counters = {}
+        self.thread = threading.get_ident()
+        self.depth = 0
+        self.start = self.end = None
+        self.error = None
+
+    def __enter__(self):
+        stack = _stack()
+        self.depth = len(stack)
+        stack.append(self)
+        for hook in self.tracer.hooks:
+            hook.span_started(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        for hook in self.tracer.hooks:
+            hook.span_finished(self)
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        parent = stack[-1] if stack else None
+        if parent is not None:
+            for key, value in self.counters.items():
+                parent.counters[key] = parent.counters.get(key, 0) + value
+        self.tracer._finish(self)
+        return False
+
+    @property
+    def duration_ms(self):
+        return (self.end - self.start) / 1e6
+
+    def count(self, key, n=1):
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+class _NullSpan:
+    """未启用追踪时使用的空 span"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def count(self, key, n=1):
+        pass
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class Tracer:
+    """收集已结束的 span"""
+    def __init__(self, max_spans=100_000):
+        self.origin = time.perf_counter_ns()
+        self.max_spans = max_spans
+        self.spans = []
+        self.sinks = []
+        self.hooks = []
+        self.lock = threading.Lock()
+
+    def span(self, name, args=None):
+        return Span(self, name, args or {})
+
+    def _finish(self, span):
+        with self.lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+            sinks = list(self.sinks)
+        for sink in sinks:
+            try:
+                sink(span)
+            except Exception as e:
+                print(f"[警告] trace 输出失败: {e}")
+
+    def add_sink(self, sink):
+        """sink(span) 在每个 span 结束时调用 (可能在工作线程中)"""
+        with self.lock:
+            self.sinks.append(sink)
+
+    def add_hook(self, hook):
+        """hook.span_started(span) / hook.span_finished(span) 在每个 span 开始和结束时调用"""
+        with self.lock:
+            self.hooks = self.hooks + [hook]
+
+    def remove_sink(self, sink):
+        with self.lock:
+            if sink in self.sinks:
+                self.sinks.remove(sink)
+
+    def _us(self, ns):
+        return (ns - self.origin) / 1000
+
+    def records(self):
+        """已结束的 span (JSON-lines 的每一行)"""
+        with self.lock:
+            spans = list(self.spans)
+        return [{
+            'name': span.name,
+            'ts_us': round(self._us(span.start), 3),
+            'dur_us': round((span.end - span.start) / 1000, 3),
+            'thread': span.thread,
+            'depth': span.depth,
+            'args': span.args,
+            'counters': span.counters,
+            'error': span.error,
+        } for span in spans]
+
+    def chrome_events(self):
+        """Chrome trace 格式的完整事件 (ph = "X")"""
+        pid = os.getpid()
+        events = []
+        for record in self.records():
+            args = dict(record['args'], **record['counters'])
+            if record['error']:
+                args['error'] = record['error']
+            events.append({'name': record['name'], 'cat': 'cursor', 'ph': 'X', 'pid': pid,
+                           'tid': record['thread'], 'ts': record['ts_us'],
+                           'dur': record['dur_us'], 'args': args})
+        return events
+
+    def export(self, path):
+        """按扩展名导出: .jsonl 为 JSON-lines，其他为 Chrome trace"""
+        with open(path, 'w', encoding='utf-8') as f:
+            if str(path).endswith('.jsonl'):
+                for record in self.records():
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            else:
+                json.dump({'traceEvents': self.chrome_events(), 'displayTimeUnit': 'ms'},
+                          f, ensure_ascii=False, default=str)
+
+
+# ---------------------------------------------------------------- 接口
+
+def enable(tracer=None):
+    """启用追踪，返回使用的 Tracer"""
+    global _tracer
+    _tracer = tracer or Tracer()
+    return _tracer
+
+
+def disable():
+    """停用追踪，返回之前的 Tracer"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def active():
+    """当前的 Tracer，未启用时返回 None"""
+    return _tracer
+
+
+def from_env(environ=None):
+    """环境变量 CURSOR_TRACE 指定输出文件时启用追踪，并在退出时导出"""
+    path = (os.environ if environ is None else environ).get('CURSOR_TRACE')
+    if not path:
+        return None
+    if _tracer is not None:
+        return _tracer
+    tracer = enable()
+    atexit.register(tracer.export, path)
+    return tracer
+
+
+def span(name, **args):
+    """记录一个操作 (with 语句)，未启用时返回空 span"""
+    tracer = _tracer
+    if tracer is None:
+        return NULL_SPAN
+    return Span(tracer, name, args)
+
+
+def count(key, n=1):
+    """给当前线程正在执行的 span 计数"""
+    if _tracer is None:
+        return
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        stack[-1].count(key, n)
+
+
+def traced(name=None):
+    """把函数的每次调用记录为一个 span (默认以函数的限定名命名)"""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with Span(tracer, label, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def format_span(span):
+    """一行文本 (用于日志)，按嵌套深度缩进"""
+    parts = [f"{'  ' * span.depth}{span.name} {span.duration_ms:.1f} ms"]
+    parts.extend(f"{key}={value}" for key, value in span.counters.items())
+    if span.error:
+        parts.append(f"error={span.error}")
+    return ' '.join(parts)
@@ -1,19 +1,25 @@
 import sys
 import os
-from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QPushButton, QLabel, QMessageBox, QTextEdit, 
-                            QScrollArea, QFrame, QDialog, QHBoxLayout,
+                            QFrame, QDialog, QHBoxLayout,
                             QSizePolicy, QSpacerItem)
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon, QPalette, QColor
 import ctypes
-import json
 import datetime
-import shutil
-import uuid
-import random
-import psutil
+from cursor_tool import memprof, trace
+from cursor_tool.atomic import sync_batch
+from cursor_tool.core import TELEMETRY_KEYS, CursorCore
+from cursor_tool.platforms import WindowsPlatform
+from cursor_tool.qt.i18n import Translator
+from cursor_tool.qt.logsink import LogSink
+from cursor_tool.qt.tasks import TaskEngine
+from cursor_tool.qt.theme import install as install_theme, set_state
+from cursor_tool.qt.update_state import UpdateStateModel
+
+# 打开备份对话框时预先读取信息的备份数量
+BACKUP_PAGE_SIZE = 100
 
 # 添加消息常量
 MESSAGES = {
@@ -24,41 +30,33 @@ MESSAGES = {
     'info': '信息'
 }
 
-class CursorModifier:
+class CursorModifier(CursorCore):
     def __init__(self):
         """初始化 CursorModifier"""
-        # 获取 Cursor 配置文件路径
-        self.storage_file = self.get_storage_path()
+        # 路径、备份存储和安装探测由 CursorCore 按 Windows 平台创建
+        super().__init__(WindowsPlatform())
+        self._reported_version = None
 
     def get_storage_path(self):
         """获取 Cursor 配置文件路径"""
-        appdata = os.getenv('APPDATA')
-        return os.path.join(appdata, 'Cursor', 'User', 'globalStorage', 'storage.json')
+        return self.platform.storage_file
 
+    @trace.traced()
     def get_cursor_version(self):
         """获取 Cursor 版本"""
         try:
-            # 主要检测路径
-            package_path = os.path.join(os.getenv('LOCALAPPDATA'), 'Programs', 'cursor', 'resources', 'app', 'package.json')
-            
-            if os.path.exists(package_path):
-                with open(package_path, 'r', encoding='utf-8') as f:
-                    package_json = json.load(f)
-                    if package_json.get('version'):
-                        print(f"[信息] 当前安装的 Cursor 版本: v{package_json['version']}")
-                        return package_json['version']
-
-            # 备用路径检测
-            alt_path = os.path.join(os.getenv('LOCALAPPDATA'), 'cursor', 'resources', 'app', 'package.json')
-            if os.path.exists(alt_path):
-                with open(alt_path, 'r', encoding='utf-8') as f:
-                    package_json = json.load(f)
-                    if package_json.get('version'):
-                        print(f"[信息] 当前安装的 Cursor 版本: v{package_json['version']}")
-                        return package_json['version']
-
-            print("[警告] 无法检测到 Cursor 版本")
-            print("[提示] 请确保 Cursor 已正确安装")
+            install = self.get_install()
+            if install is not None:
+                # 只在版本变化时输出
+                if install.version != self._reported_version:
+                    print(f"[信息] 当前安装的 Cursor 版本: v{install.version}")
+                    self._reported_version = install.version
+                return install.version
+
+            if self._reported_version != MESSAGES['not_found']:
+                print("[警告] 无法检测到 Cursor 版本")
+                print("[提示] 请确保 Cursor 已正确安装")
+                self._reported_version = MESSAGES['not_found']
             return MESSAGES['not_found']
             
         except Exception as e:
@@ -68,157 +66,93 @@ class CursorModifier:
     def is_auto_update_enabled(self):
         """检查自动更新是否启用"""
         try:
-            if not os.path.exists(self.storage_file):
-                return True
-            
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            update_mode = config.get('update.mode', 'default')
-            update_channel = config.get('update.channel', 'default')
-            enable_download = config.get('update.enableDownload', True)
-            
-            is_disabled = (
-                update_mode == 'none' or
-                update_channel == 'none' or
-                enable_download is False
-            )
-            
-            return not is_disabled
-        
-        except json.JSONDecodeError:
-            return True
+            return super().is_auto_update_enabled()
         except Exception as e:
             print(f"检查更新状态时出错: {str(e)}")
             return True
 
+    @trace.traced()
     def disable_auto_update(self):
         """禁用自动更新"""
         try:
-            if not os.path.exists(self.storage_file):
-                config = {}
-            else:
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-            
-            config.update({
-                'update.mode': 'none',
-                'update.channel': 'none',
-                'update.enableDownload': False
-            })
-            
-            os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
-            
+            # 只改写更新相关的键，文件不存在时新建
+            super().disable_auto_update()
             return True
         except Exception as e:
             print(f"禁用自动更新时出错: {str(e)}")
             return False
 
+    @trace.traced()
     def enable_auto_update(self):
         """启用自动更新"""
         try:
-            if not os.path.exists(self.storage_file):
-                config = {}
-            else:
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-            
-            config.update({
-                'update.mode': 'default',
-                'update.channel': 'default',
-                'update.enableDownload': True
-            })
-            
-            os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
-            
+            # 只改写更新相关的键，文件不存在时新建
+            super().enable_auto_update()
             return True
         except Exception as e:
             print(f"启用自动更新时出错: {str(e)}")
             return False
 
-    def list_backups(self):
-        """列出所有备份"""
-        backup_dir = os.path.join(os.path.dirname(self.storage_file), 'backups')
-        if not os.path.exists(backup_dir):
-            return []
-        return [os.path.join(backup_dir, f) for f in os.listdir(backup_dir) 
-                if f.endswith('.json')]
-
     def get_backup_info(self, backup_path, current_language):
         """获取备份信息"""
         try:
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                backup_data = json.load(f)
-            
-            # 获取文件信息
-            file_stat = os.stat(backup_path)
-            create_time = datetime.datetime.fromtimestamp(file_stat.st_ctime)
-            
-            # 只获取关键配置信息
-            important_configs = {
-                'machineId': backup_data.get('telemetry.machineId', 'N/A'),
-                'macMachineId': backup_data.get('telemetry.macMachineId', 'N/A'),
-                'devDeviceId': backup_data.get('telemetry.devDeviceId', 'N/A'),
-                'sqmId': backup_data.get('telemetry.sqmId', 'N/A')
-            }
-            
-            # 格式化信息
-            config_info = "\n".join([
-                f"{key} ({current_language['messages']['current_config'].get(key, key)}): {value}"
-                for key, value in important_configs.items()
-            ])
-            
-            return current_language['messages']['log']['backup_info'].format(
-                os.path.basename(backup_path),
-                create_time.strftime("%Y-%m-%d %H:%M:%S"),
-                config_info
-            )
+            # 摘要来自备份目录，只在备份变化时才解析备份内容
+            return self.format_backup_info(self.backup_summary(backup_path), current_language)
         except Exception as e:
             return f"读取备份信息失败: {str(e)}"
 
+    def format_backup_info(self, summary, current_language):
+        """按语言格式化备份摘要 (不读取文件，切换语言时直接重新格式化)"""
+        telemetry = summary['telemetry']
+        
+        # 获取备份时间
+        create_time = datetime.datetime.fromtimestamp(summary['timestamp'])
+        
+        # 只获取关键配置信息
+        important_configs = {
+            'machineId': telemetry.get('telemetry.machineId', 'N/A'),
+            'macMachineId': telemetry.get('telemetry.macMachineId', 'N/A'),
+            'devDeviceId': telemetry.get('telemetry.devDeviceId', 'N/A'),
+            'sqmId': telemetry.get('telemetry.sqmId', 'N/A')
+        }
+        
+        # 格式化信息
+        config_info = "\n".join([
+            f"{key} ({current_language['messages']['current_config'].get(key, key)}): {value}"
+            for key, value in important_configs.items()
+        ])
+        
+        return current_language['messages']['log']['backup_info'].format(
+            summary['name'],
+            create_time.strftime("%Y-%m-%d %H:%M:%S"),
+            config_info
+        )
+
+    @trace.traced()
     def create_manual_backup(self):
         """创建手动备份"""
         try:
-            if not os.path.exists(self.storage_file):
-                return None
-            
-            # 创建备份目录
-            backup_dir = os.path.join(os.path.dirname(self.storage_file), 'backups')
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            # 生成备份文件名
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = os.path.join(backup_dir, f'backup_{timestamp}.json')
-            
-            # 复制配置文件
-            shutil.copy2(self.storage_file, backup_path)
-            
-            return backup_path
+            # 保存快照，内容相同的备份只存储一次
+            return self.create_backup()
         except Exception as e:
             print(f"创建备份时出错: {str(e)}")
             return None
 
+    @trace.traced()
     def restore_backup(self, backup_path):
         """恢复备份"""
         try:
-            if not os.path.exists(backup_path):
+            if not self.backup_store.exists(backup_path):
                 return False
             
-            # 先创建一个当前配置的备份
-            self.create_manual_backup()
-            
-            # 恢复选定的备份
-            shutil.copy2(backup_path, self.storage_file)
-            
+            # 先创建一个当前配置的备份，再原子写入选定的备份
+            super().restore_backup(backup_path)
             return True
         except Exception as e:
             print(f"恢复备份时出错: {str(e)}")
             return False
 
+    @trace.traced()
     def generate_new_config(self):
         """生成新的配置"""
         try:
@@ -229,51 +163,21 @@ class CursorModifier:
             
             # 生成新的 ID
             print("[信息] 正在生成新的 ID...")
+            ids = self.generate_ids()
             
-            # 生成 MAC_MACHINE_ID (标准UUID格式)
-            mac_machine_id = str(uuid.uuid4())
-            
-            # 生成 UUID (标准UUID格式)
-            device_id = str(uuid.uuid4())
-            
-            # 生成 MACHINE_ID (特殊格式: auth0|user_ + 随机字符)
-            prefix = "auth0|user_"
-            prefix_hex = prefix.encode('utf-8').hex()
-            random_part = ''.join(random.choices('0123456789abcdef', k=64))
-            machine_id = f"{prefix_hex}{random_part}"
-            
-            # 生成 SQM_ID (大写的UUID，带花括号)
-            sqm_id = "{" + str(uuid.uuid4()).upper() + "}"
-            
-            # 读取现有配置
             if not os.path.exists(self.storage_file):
                 print("[信息] 未找到配置文件，将创建新配置")
-                config = {}
-            else:
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-            
-            # 创建备份
-            self.create_manual_backup()
             
-            # 更新配置
-            config.update({
-                'telemetry.machineId': machine_id,
-                'telemetry.macMachineId': mac_machine_id,
-                'telemetry.devDeviceId': device_id,
-                'telemetry.sqmId': sqm_id
-            })
-            
-            # 保存配置
-            os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
+            with sync_batch():
+                # 创建备份
+                self.create_manual_backup()
+                
+                # 只改写 telemetry 键，其余内容保持不变
+                self.apply_ids(ids)
             
             print("[信息] 配置已更新:")
-            print(f"machineId: {machine_id}")
-            print(f"macMachineId: {mac_machine_id}")
-            print(f"devDeviceId: {device_id}")
-            print(f"sqmId: {sqm_id}")
+            for key, value in ids.items():
+                print(f"{key}: {value}")
             
             return True
             
@@ -281,14 +185,17 @@ class CursorModifier:
             print(f"[错误] 生成配置时出错: {str(e)}")
             return False
 
+    @trace.traced()
     def close_cursor_process(self):
-        """关闭 Cursor 进程"""
+        """关闭 Cursor 进程树，进程全部退出后才返回 True"""
         try:
-            for proc in psutil.process_iter(['name']):
-                if proc.info['name'].lower() in ['cursor.exe', 'cursor']:
-                    print(f"[信息] 发现 Cursor 进程 (PID: {proc.pid})")
-                    proc.kill()
-                    print("[信息] 已终止 Cursor 进程")
+            # 按进程名匹配，已知安装目录下的进程先结束，其他位置的也一并结束
+            report = self.close_cursor()
+            if report.found:
+                print(f"[信息] 已关闭 Cursor 进程: {report}")
+            if not report.ok:
+                print(f"[错误] 部分 Cursor 进程未能结束: {report.remaining}")
+                return False
             return True
         except Exception as e:
             print(f"[错误] 关闭进程时出错: {str(e)}")
@@ -547,9 +454,9 @@ Last Update: 2025
     }
 
 class StyleSheet:
-    """样式表"""
+    """应用级样式表 (启动时安装一次，控件状态用动态属性表示)"""
     MAIN = """
-    QMainWindow {
+    QMainWindow, QDialog {
         background-color: #f5f6fa;
     }
     
@@ -571,14 +478,31 @@ class StyleSheet:
         background-color: #3c55a5;
     }
     
+    /* 当前已生效的更新设置对应的按钮 */
+    QPushButton[state="active"] {
+        background-color: #95a5a6;
+    }
+    
     QTextEdit {
         background-color: #ffffff;
         border: 1px solid #dcdde1;
         border-radius: 5px;
-        padding: 5px;
+        padding: 10px;
+        color: #2f3542;
         font-family: Consolas;
     }
     
+    /* 备份管理对话框 */
+    BackupDialog QFrame {
+        background-color: white;
+        border-radius: 5px;
+        border: 1px solid #dcdde1;
+    }
+    
+    BackupDialog QLabel {
+        padding: 10px;
+    }
+    
     QLabel#version_label {
         color: #2f3542;
         padding: 10px;
@@ -611,21 +535,71 @@ def main():
     sys.exit(app.exec())
 
 class MainWindow(QMainWindow):
+    # 工作线程中的日志通过该信号排队到 GUI 线程
+    log_requested = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.modifier = CursorModifier()
         self.current_language = Language.CHINESE  # 默认中文
         self.current_backup_dialog = None  # 添加对话框引用
+        # 界面文本在创建控件时登记，切换语言时一次更新
+        self.i18n = Translator({'zh': Language.CHINESE, 'en': Language.ENGLISH}, 'zh')
+        self.cursor_version = "..."  # 后台获取后更新
+        
+        # 后台任务引擎，CursorModifier 的操作都在工作线程中执行
+        self.tasks = TaskEngine(self)
+        self.tasks.task_progress.connect(self.on_task_progress)
+        self.tasks.task_failed.connect(self.on_task_failed)
+        self.tasks.busy_changed.connect(self.on_tasks_busy)
+        # 只读的状态查询使用单独的工作线程: 不排在耗时操作之后，也不改变忙碌状态
+        self.readers = TaskEngine(self)
+        self.log_requested.connect(self.log)
+        
+        # 自动更新状态，storage.json 变化时才重新读取
+        # (在后台任务中读取，不阻塞 GUI 线程)
+        self.update_state = UpdateStateModel(self.modifier.update_state_path(),
+                                             self.modifier.is_auto_update_enabled,
+                                             tasks=self.readers, parent=self)
+        
+        self.started = False
         self.setup_ui()
         
+        # 设置 CURSOR_TRACE 时记录各操作的耗时，同时显示在日志中
+        # (窗口销毁时注销，不再输出到已关闭的窗口)
+        tracer = trace.from_env()
+        if tracer is not None:
+            trace_sink = lambda span: self.log(f"[trace] {trace.format_span(span)}")
+            tracer.add_sink(trace_sink)
+            self.destroyed.connect(lambda *_: tracer.remove_sink(trace_sink))
+        
+        # 设置 CURSOR_MEMORY 时报告每个操作的内存峰值和主要分配位置
+        profiler = memprof.from_env()
+        if profiler is not None:
+            memory_sink = self._log_memory_report
+            profiler.add_sink(memory_sink)
+            self.destroyed.connect(lambda *_: profiler.remove_sink(memory_sink))
+        
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # 窗口第一次绘制后再执行启动时的其他工作
+        if not self.started:
+            self.started = True
+            QTimer.singleShot(0, self.deferred_startup)
+    
+    def deferred_startup(self):
+        """首次绘制后执行: 获取版本、读取更新状态、显示关于信息"""
+        self.refresh_version_label()
+        self.update_state.refresh()
+        
         # 启动后自动显示关于信息
         QTimer.singleShot(100, self.show_about)  # 使用计时器延迟显示，确保窗口已完全加载
         
     def setup_ui(self):
         """设置主界面"""
-        self.setWindowTitle(self.current_language['title'])
+        self.i18n.bind(self, 'title', 'setWindowTitle')
         self.setMinimumSize(1000, 600)
-        self.setStyleSheet(StyleSheet.MAIN)
+        install_theme(StyleSheet.MAIN)
         
         # 创建中心部件
         central_widget = QWidget()
@@ -642,11 +616,10 @@ class MainWindow(QMainWindow):
         left_layout.setSpacing(15)
         left_layout.setContentsMargins(0, 0, 0, 0)
         
-        # 版本信息
-        version = self.modifier.get_cursor_version()
-        version_label = QLabel(self.current_language['version'].format(
-            version or MESSAGES['not_found']))
+        # 版本信息 (后台获取)
+        self.version_label = version_label = QLabel()
         version_label.setObjectName("version_label")
+        self.i18n.bind(version_label, 'version', args=lambda: (self.cursor_version,))
         version_label.setFont(QFont('Arial', 10))
         version_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         left_layout.addWidget(version_label)
@@ -664,8 +637,7 @@ class MainWindow(QMainWindow):
         right_layout.setContentsMargins(0, 0, 0, 0)
         
         # 日志标题
-        log_title = QLabel(self.current_language['log_title'])
-        log_title.setObjectName("log_title")
+        log_title = self.i18n.bind(QLabel(), 'log_title')
         log_title.setFont(QFont('Arial', 12, QFont.Weight.Bold))
         log_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         right_layout.addWidget(log_title)
@@ -675,15 +647,8 @@ class MainWindow(QMainWindow):
         self.log_area.setReadOnly(True)
         self.log_area.setFont(QFont('Consolas', 10))
         self.log_area.setMinimumWidth(400)
-        self.log_area.setStyleSheet("""
-            QTextEdit {
-                background-color: #ffffff;
-                border: 1px solid #dcdde1;
-                border-radius: 5px;
-                padding: 10px;
-                color: #2f3542;
-            }
-        """)
+        # 日志批量写入，约每帧刷新一次
+        self.log_sink = LogSink(self.log_area)
         
         # 添加初始日志
         self.log("程序启动...")
@@ -695,14 +660,15 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(right_panel, 2)  # 2是拉伸因子，使右侧更宽
         
         # 状态栏
-        self.statusBar().showMessage(self.current_language['status_ready'])
+        self.i18n.bind(self.statusBar(), 'status_ready', 'showMessage')
         
-        # 初始化更新控制按钮状态
-        self.update_update_control_buttons()
+        # 更新控制按钮绑定到更新状态 (首次绘制后读取)
+        self.update_state.changed.connect(self._apply_update_state)
         
     def create_buttons(self, layout):
         """创建功能按钮"""
         button_frame = QFrame()
+        self.button_frame = button_frame  # 任务执行期间禁用
         button_layout = QVBoxLayout(button_frame)
         button_layout.setSpacing(10)
         button_layout.setContentsMargins(0, 0, 0, 0)
@@ -730,10 +696,12 @@ class MainWindow(QMainWindow):
         for group_name, buttons in groups:
             # 添加分组按钮
             for btn_name, handler in buttons:
-                btn = QPushButton(self.current_language['buttons'][group_name][btn_name])
+                btn = self.i18n.bind(QPushButton(), f"buttons.{group_name}.{btn_name}")
                 btn.setMinimumHeight(50)
                 btn.clicked.connect(handler)
                 button_layout.addWidget(btn)
+                if group_name == 'update_control':
+                    setattr(self, f"{btn_name}_btn", btn)
             
             # 在组之间添加一点空间
             if group_name != 'others':  # 最后一组不需要添加间距
@@ -741,18 +709,27 @@ class MainWindow(QMainWindow):
         
         # 添加语言切换按钮
         button_layout.addSpacing(20)
-        lang_btn = QPushButton(self.current_language['buttons']['others']['switch_lang'])
+        lang_btn = self.i18n.bind(QPushButton(), 'buttons.others.switch_lang')
         lang_btn.setMinimumHeight(50)
         lang_btn.clicked.connect(self.switch_language)
         button_layout.addWidget(lang_btn)
         
         layout.addWidget(button_frame)
 
+    def _log_memory_report(self, report):
+        for line in report.lines():
+            self.log(line)
+
     def log(self, message):
         """添加日志"""
+        # 工作线程中的日志排队到 GUI 线程
+        if QThread.currentThread() != self.thread():
+            self.log_requested.emit(str(message))
+            return
+        
         try:
-            # 检查 log_area 是否存在
-            if not hasattr(self, 'log_area'):
+            # 检查 log_sink 是否存在
+            if not hasattr(self, 'log_sink'):
                 print("Error: log_area not initialized")
                 return
             
@@ -760,78 +737,73 @@ class MainWindow(QMainWindow):
             timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             formatted_message = f"[{timestamp}] {message}"
             
-            # 添加日志到文本框并立即刷新
-            self.log_area.append(formatted_message)
-            self.log_area.repaint()
-            
-            # 确保滚动到最新内容
-            cursor = self.log_area.textCursor()
-            cursor.movePosition(cursor.End)
-            self.log_area.setTextCursor(cursor)
-            
-            # 强制处理事件
-            QApplication.processEvents()
+            # 写入缓冲区，由定时器合并刷新到文本框
+            self.log_sink.write(formatted_message)
             
         except Exception as e:
             print(f"Error in logging: {str(e)}")
             import traceback
             traceback.print_exc()
 
+    def on_task_progress(self, name, percent, message):
+        """在状态栏显示任务进度"""
+        if percent >= 0:
+            self.statusBar().showMessage(f"{message} ({percent}%)")
+        else:
+            self.statusBar().showMessage(message)
+
+    def on_task_failed(self, name, message):
+        """记录未处理的任务错误"""
+        self.log(f"任务执行出错 ({name}): {message}")
+
+    def on_tasks_busy(self, busy):
+        """任务执行期间禁用功能按钮"""
+        if hasattr(self, 'button_frame'):
+            self.button_frame.setEnabled(not busy)
+
+    def refresh_version_label(self):
+        """在后台获取 Cursor 版本并更新版本标签"""
+        self.tasks.submit('version', self.modifier.get_cursor_version,
+                          on_done=self._set_version_label)
+
+    def _set_version_label(self, version):
+        self.cursor_version = version or MESSAGES['not_found']
+        self.i18n.refresh(self.version_label)
+
     def generate_new_config(self):
         """生成新的配置"""
+        self.tasks.submit('generate', self._generate_new_config, with_progress=True)
+
+    def _generate_new_config(self, progress):
+        """生成新的配置 (工作线程)"""
         try:
             # 检查并关闭 Cursor 进程
             self.log("检查 Cursor 进程...")
+            progress(self.current_language['messages']['closing_cursor'], 0)
             if not self.modifier.close_cursor_process():
                 return False
             
             # 生成新的 ID
             self.log("正在生成新的 ID...")
+            progress("正在生成新的 ID...", 25)
+            ids = self.modifier.generate_ids()
             
-            # 生成 MAC_MACHINE_ID (标准UUID格式)
-            mac_machine_id = str(uuid.uuid4())
-            
-            # 生成 UUID (标准UUID格式)
-            device_id = str(uuid.uuid4())
-            
-            # 生成 MACHINE_ID (特殊格式: auth0|user_ + 随机字符)
-            prefix = "auth0|user_"
-            prefix_hex = prefix.encode('utf-8').hex()
-            random_part = ''.join(random.choices('0123456789abcdef', k=64))
-            machine_id = f"{prefix_hex}{random_part}"
-            
-            # 生成 SQM_ID (大写的UUID，带花括号)
-            sqm_id = "{" + str(uuid.uuid4()).upper() + "}"
-            
-            # 读取现有配置
             if not os.path.exists(self.modifier.storage_file):
                 self.log("未找到配置文件，将创建新配置")
-                config = {}
-            else:
-                with open(self.modifier.storage_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
             
-            # 创建备份
-            self.modifier.create_manual_backup()
-            
-            # 更新配置
-            config.update({
-                'telemetry.machineId': machine_id,
-                'telemetry.macMachineId': mac_machine_id,
-                'telemetry.devDeviceId': device_id,
-                'telemetry.sqmId': sqm_id
-            })
-            
-            # 保存配置
-            os.makedirs(os.path.dirname(self.modifier.storage_file), exist_ok=True)
-            with open(self.modifier.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
+            with sync_batch():
+                # 创建备份
+                progress("正在创建备份...", 50)
+                self.modifier.create_manual_backup()
+                
+                # 只改写 telemetry 键，其余内容保持不变
+                progress("正在保存配置...", 75)
+                self.modifier.apply_ids(ids)
             
+            progress(self.current_language['messages']['config_updated'], 100)
             self.log("配置已更新:")
-            self.log(f"machineId: {machine_id}")
-            self.log(f"macMachineId: {mac_machine_id}")
-            self.log(f"devDeviceId: {device_id}")
-            self.log(f"sqmId: {sqm_id}")
+            for key, value in ids.items():
+                self.log(f"{key}: {value}")
             
             return True
             
@@ -842,8 +814,32 @@ class MainWindow(QMainWindow):
     def manage_backups(self):
         """管理备份"""
         self.log("正在查看备份...")
+        self.tasks.submit('list_backups', self._load_backups,
+                          with_progress=True, on_done=self._show_backup_dialog)
+
+    def _load_backups(self, progress):
+        """读取备份列表及备份信息 (工作线程)"""
+        # 最新的备份显示在最前面；只预先读取第一页的备份信息，其余在滚动到时读取
+        backups = self.modifier.list_backups(newest_first=True)
+        infos = {}
+        if not backups:
+            return backups, infos
         
-        backups = self.modifier.list_backups()
+        self.log(f"找到 {len(backups)} 个备份")
+        
+        first_page = backups[:BACKUP_PAGE_SIZE]
+        for i, backup in enumerate(first_page, 1):
+            # 对话框缓存与语言无关的摘要，切换语言时只重新格式化
+            try:
+                infos[backup] = self.modifier.backup_summary(backup)
+            except Exception:
+                pass  # 读取失败时由对话框显示错误
+            progress(os.path.basename(backup), i * 100 // len(first_page))
+        return backups, infos
+
+    def _show_backup_dialog(self, result):
+        """显示备份管理对话框"""
+        backups, infos = result
         if not backups:
             self.log("未找到任何备份")
             QMessageBox.information(
@@ -853,28 +849,20 @@ class MainWindow(QMainWindow):
             )
             return
         
-        self.log(f"找到 {len(backups)} 个备份")
-        
-        # 添加详细的备份信息到日志
-        self.log("\n" + self.current_language['messages']['log']['backup_title'])
-        
-        for i, backup in enumerate(backups, 1):
-            self.log("\n" + "-" * 20 + f" 备份 {i} " + "-" * 20 + "\n")
-            
-            # 获取并显示备份详细信息
-            backup_info = self.modifier.get_backup_info(backup, self.current_language)
-            self.log(backup_info)
-        
-        self.log("\n" + "-" * 50)  # 分隔线
-        
-        # 显示备份管理对话框
-        self.current_backup_dialog = BackupDialog(self, backups, self.modifier)
+        self.current_backup_dialog = BackupDialog(self, backups, self.modifier, infos)
         self.current_backup_dialog.exec()
+        # 关闭后销毁对话框，其控件随之从翻译登记中移除
+        self.current_backup_dialog.deleteLater()
+        self.current_backup_dialog = None
 
     def disable_auto_update(self):
         """禁用自动更新"""
         self.log("正在禁用自动更新...")
-        if self.modifier.disable_auto_update():
+        self.tasks.submit('disable_update', self.modifier.disable_auto_update,
+                          on_done=self._on_update_disabled)
+
+    def _on_update_disabled(self, ok):
+        if ok:
             success_msg = self.current_language['messages']['update_disabled']
             self.log(success_msg)
             QMessageBox.information(
@@ -883,14 +871,18 @@ class MainWindow(QMainWindow):
                 success_msg
             )
             # 更新按钮状态
-            self.update_update_control_buttons()
+            self.update_state.refresh()
         else:
             self.log("禁用自动更新失败")
-            
+        
     def enable_auto_update(self):
         """恢复自动更新"""
         self.log("正在启用自动更新...")
-        if self.modifier.enable_auto_update():
+        self.tasks.submit('enable_update', self.modifier.enable_auto_update,
+                          on_done=self._on_update_enabled)
+
+    def _on_update_enabled(self, ok):
+        if ok:
             success_msg = self.current_language['messages']['update_enabled']
             self.log(success_msg)
             QMessageBox.information(
@@ -899,14 +891,17 @@ class MainWindow(QMainWindow):
                 success_msg
             )
             # 更新按钮状态
-            self.update_update_control_buttons()
+            self.update_state.refresh()
         else:
             self.log("启用自动更新失败")
-            
+        
     def manual_backup(self):
         """手动备份"""
         self.log("开始创建手动备份...")
-        backup_path = self.modifier.create_manual_backup()
+        self.tasks.submit('backup', self.modifier.create_manual_backup,
+                          on_done=self._on_manual_backup)
+
+    def _on_manual_backup(self, backup_path):
         if backup_path:
             success_msg = self.current_language['messages']['backup_success'].format(backup_path)
             self.log(success_msg)
@@ -917,7 +912,7 @@ class MainWindow(QMainWindow):
             )
         else:
             self.log("备份创建失败")
-            
+        
     def show_about(self):
         """显示关于信息"""
         self.log("正在显示关于信息...")
@@ -946,262 +941,129 @@ class MainWindow(QMainWindow):
             Language.ENGLISH if self.current_language == Language.CHINESE 
             else Language.CHINESE
         )
-        # 更新界面文本
-        self.update_ui_text()
-        
-        # 更新所有打开的对话框
-        for dialog in self.findChildren(BackupDialog):
-            dialog.current_language = self.current_language
-            dialog.update_ui_text()
+        # 一次更新所有已登记的控件 (包括打开的对话框)
+        self.i18n.switch('en' if self.current_language == Language.ENGLISH else 'zh')
         
         self.log(f"语言切换完成: {new_lang}")
-    
-    def update_ui_text(self):
-        """更新界面文本"""
-        try:
-            # 更新窗口标题
-            self.setWindowTitle(self.current_language['title'])
-            
-            # 更新版本标签
-            version_label = self.findChild(QLabel, "version_label")
-            if version_label:
-                version = self.modifier.get_cursor_version()
-                version_label.setText(
-                    self.current_language['version'].format(version or MESSAGES['not_found'])
-                )
-            
-            # 更新日志标题
-            log_title = self.findChild(QLabel, "log_title")
-            if log_title:
-                log_title.setText(self.current_language['log_title'])
-            
-            # 更新状态栏
-            self.statusBar().showMessage(self.current_language['status_ready'])
-            
-            # 更新按钮文本
-            buttons = self.findChildren(QPushButton)
-            if not buttons:
-                return
-            
-            # 获取所有按钮的文本
-            button_texts = []
-            for group_name, group_buttons in [
-                ('id_management', ['generate', 'view_current']),
-                ('backup_management', ['view_backup', 'create_backup']),
-                ('update_control', ['disable_update', 'enable_update']),
-                ('others', ['about'])
-            ]:
-                for btn_name in group_buttons:
-                    button_texts.append(
-                        self.current_language['buttons'][group_name][btn_name]
-                    )
-            
-            # 更新功能按钮
-            for i, btn in enumerate(buttons[:-1]):  # 除了最后一个语言切换按钮
-                if i < len(button_texts):
-                    btn.setText(button_texts[i])
-            
-            # 更新语言切换按钮
-            buttons[-1].setText(self.current_language['buttons']['others']['switch_lang'])
-            
-        except Exception as e:
-            print(f"更新界面文本时出错: {e}")
 
     def view_current_config(self):
         """查看当前配置"""
         self.log("正在查看当前配置...")
-        try:
-            storage_path = self.modifier.get_storage_path()
-            if not os.path.exists(storage_path):
-                raise FileNotFoundError(f"配置文件不存在: {storage_path}")
-            
-            with open(storage_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                
-            # 直接读取特定字段
-            important_configs = {
-                'machineId': config.get('telemetry.machineId', '61757468307c757365725fb38b5fabb389d433be1468bdb64b93a96adc9c101c'),
-                'macMachineId': config.get('telemetry.macMachineId', 'e5b16fc8-03f8-4700-8b2c-a1c8904f6dc3'),
-                'devDeviceId': config.get('telemetry.devDeviceId', '46595587-da2f-4af1-afc4-4bdd58e9ecf2'),
-                'sqmId': config.get('telemetry.sqmId', '{6215A058-DE11-47EF-8B82-A030DFDA47D1}')
-            }
-            
-            # 记录配置信息到日志
-            self.log("\n当前配置信息:")
-            for key, value in important_configs.items():
-                self.log(f"{key}: {value}")
-            
-            # 显示对话框
-            info = self.current_language['messages']['current_config']['format'].format(
-                important_configs['machineId'],
-                important_configs['macMachineId'],
-                important_configs['devDeviceId'],
-                important_configs['sqmId']
-            )
-            
-            QMessageBox.information(
-                self,
-                self.current_language['messages']['current_config']['title'],
-                info
-            )
-        except Exception as e:
-            error_msg = str(e)
-            self.log(f"查看配置时出错: {error_msg}")
-            QMessageBox.warning(
-                self,
-                self.current_language['messages']['error'],
-                error_msg
-            )
+        self.tasks.submit('view_config', self._read_current_config,
+                          on_done=self._show_current_config,
+                          on_error=self._on_view_config_error)
 
-    def update_update_control_buttons(self):
-        """更新控制按钮状态"""
-        try:
-            # 获取当前更新状态
-            is_update_enabled = self.modifier.is_auto_update_enabled()
-            
-            # 查找更新控制按钮
-            for btn in self.findChildren(QPushButton):
-                if btn.text() == self.current_language['buttons']['update_control']['disable_update']:
-                    btn.setEnabled(is_update_enabled)
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: %s;
-                            color: white;
-                            border: none;
-                            padding: 10px;
-                            border-radius: 5px;
-                            font-size: 14px;
-                            min-width: 200px;
-                        }
-                    """ % ('#4a69bd' if is_update_enabled else '#95a5a6'))
-                elif btn.text() == self.current_language['buttons']['update_control']['enable_update']:
-                    btn.setEnabled(not is_update_enabled)
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: %s;
-                            color: white;
-                            border: none;
-                            padding: 10px;
-                            border-radius: 5px;
-                            font-size: 14px;
-                            min-width: 200px;
-                        }
-                    """ % ('#4a69bd' if not is_update_enabled else '#95a5a6'))
-            
-            # 更新状态栏显示当前更新状态
-            status_msg = "自动更新: " + ("已启用" if is_update_enabled else "已禁用")
-            self.statusBar().showMessage(status_msg)
-            
-            # 记录日志
-            self.log(f"检测到更新状态: {status_msg}")
-            
-        except Exception as e:
-            self.log(f"更新按钮状态时出错: {str(e)}")
+    def _read_current_config(self):
+        """读取当前配置 (工作线程)"""
+        storage_path = self.modifier.get_storage_path()
+        if not os.path.exists(storage_path):
+            raise FileNotFoundError(f"配置文件不存在: {storage_path}")
+        
+        # 只读取需要的字段，找到后即停止扫描
+        config = self.modifier.read_keys(keys=TELEMETRY_KEYS)
+            
+        return {
+            'machineId': config.get('telemetry.machineId', '61757468307c757365725fb38b5fabb389d433be1468bdb64b93a96adc9c101c'),
+            'macMachineId': config.get('telemetry.macMachineId', 'e5b16fc8-03f8-4700-8b2c-a1c8904f6dc3'),
+            'devDeviceId': config.get('telemetry.devDeviceId', '46595587-da2f-4af1-afc4-4bdd58e9ecf2'),
+            'sqmId': config.get('telemetry.sqmId', '{6215A058-DE11-47EF-8B82-A030DFDA47D1}')
+        }
+
+    def _show_current_config(self, important_configs):
+        # 记录配置信息到日志
+        self.log("\n当前配置信息:")
+        for key, value in important_configs.items():
+            self.log(f"{key}: {value}")
+        
+        # 显示对话框
+        info = self.current_language['messages']['current_config']['format'].format(
+            important_configs['machineId'],
+            important_configs['macMachineId'],
+            important_configs['devDeviceId'],
+            important_configs['sqmId']
+        )
+        
+        QMessageBox.information(
+            self,
+            self.current_language['messages']['current_config']['title'],
+            info
+        )
+
+    def _on_view_config_error(self, error_msg):
+        self.log(f"查看配置时出错: {error_msg}")
+        QMessageBox.warning(
+            self,
+            self.current_language['messages']['error'],
+            error_msg
+        )
+
+    def _apply_update_state(self, is_update_enabled):
+        """根据更新状态设置按钮 (更新状态变化时调用)"""
+        # 已生效的一侧显示为灰色 (state 属性，样式表只解析一次)
+        self.disable_update_btn.setEnabled(is_update_enabled)
+        self.enable_update_btn.setEnabled(not is_update_enabled)
+        set_state(self.disable_update_btn, None if is_update_enabled else 'active')
+        set_state(self.enable_update_btn, 'active' if is_update_enabled else None)
+        
+        # 更新状态栏显示当前更新状态
+        status_msg = "自动更新: " + ("已启用" if is_update_enabled else "已禁用")
+        self.statusBar().showMessage(status_msg)
+        
+        # 记录日志
+        self.log(f"检测到更新状态: {status_msg}")
 
 class BackupDialog(QDialog):
-    def __init__(self, parent, backups, modifier):
+    def __init__(self, parent, backups, modifier, infos=None):
         super().__init__(parent)
-        self.backups = backups
         self.modifier = modifier
         self.parent = parent
-        self.current_language = parent.current_language
-        self.content_widget = None  # 添加内容部件引用
+        # 备份列表组件在第一次打开对话框时才导入
+        from cursor_tool.qt.backup_view import BackupListModel
+        # 已在后台读取的备份摘要由模型缓存，其余的在行第一次显示时由后台任务读取
+        # (与其他备份操作在同一个工作线程中依次执行)
+        self.model = BackupListModel(backups, self.modifier.backup_summary, infos,
+                                     tasks=parent.tasks,
+                                     formatter=self.format_info, parent=self)
         self.setup_ui()
+
+    @property
+    def current_language(self):
+        return self.parent.current_language
+
+    def format_info(self, summary):
+        """按当前语言格式化备份摘要"""
+        return self.modifier.format_backup_info(summary, self.current_language)
         
     def setup_ui(self):
         """设置备份对话框界面"""
-        self.setWindowTitle(self.current_language['dialog']['title'])
+        i18n = self.parent.i18n
+        i18n.bind(self, 'dialog.title', 'setWindowTitle')
         self.setMinimumSize(800, 600)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #f5f6fa;
-            }
-            QFrame {
-                background-color: white;
-                border-radius: 5px;
-                border: 1px solid #dcdde1;
-            }
-            QPushButton {
-                background-color: #4a69bd;
-                color: white;
-                border: none;
-                padding: 10px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #6a89cc;
-            }
-            QLabel {
-                padding: 10px;
-            }
-        """)
         
         layout = QVBoxLayout(self)
         layout.setSpacing(15)
         layout.setContentsMargins(20, 20, 20, 20)
         
         # 标题
-        self.title_label = QLabel(self.current_language['dialog']['backup_list'])
+        self.title_label = i18n.bind(QLabel(), 'dialog.backup_list')
         self.title_label.setFont(QFont('Arial', 12, QFont.Weight.Bold))
         self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.title_label)
         
-        # 创建滚动区域
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("QScrollArea { border: none; }")
-        
-        # 创建备份列表
-        self.create_backup_list()
-        
-        layout.addWidget(self.scroll)
+        # 备份列表 (按需加载并由委托绘制每一行)
+        from cursor_tool.qt.backup_view import BackupDelegate, create_backup_view
+        self.delegate = BackupDelegate(QFont('Consolas', 9), '', '')
+        self.delegate.restore_clicked.connect(self.restore_backup)
+        self.delegate.delete_clicked.connect(self.delete_backup)
+        self.list_view = create_backup_view(self.model, self.delegate)
+        i18n.bind(self, ('dialog.restore', 'dialog.delete'), self._set_row_texts)
+        layout.addWidget(self.list_view)
         
         # 关闭按钮
-        close_btn = QPushButton(self.current_language['dialog']['close'])
-        close_btn.setObjectName('close_btn')  # 设置对象名以便更新
+        close_btn = i18n.bind(QPushButton(), 'dialog.close')
         close_btn.clicked.connect(self.close)
         layout.addWidget(close_btn)
 
-    def create_backup_list(self):
-        """创建备份列表"""
-        self.content_widget = QWidget()
-        content_layout = QVBoxLayout(self.content_widget)
-        content_layout.setSpacing(15)
-        
-        # 添加备份列表
-        for i, backup in enumerate(self.backups, 1):
-            frame = QFrame()
-            frame_layout = QVBoxLayout(frame)
-            
-            # 备份信息
-            info = self.modifier.get_backup_info(backup, self.current_language)
-            info_label = QLabel(info)
-            info_label.setObjectName(f"backup_info_{i-1}")
-            info_label.setFont(QFont('Consolas', 9))
-            frame_layout.addWidget(info_label)
-            
-            # 按钮容器
-            button_container = QWidget()
-            button_layout = QHBoxLayout(button_container)
-            button_layout.setSpacing(10)
-            
-            # 恢复按钮
-            restore_btn = QPushButton(self.current_language['dialog']['restore'])
-            restore_btn.setObjectName('restore_btn')
-            restore_btn.clicked.connect(lambda checked, b=backup: self.restore_backup(b))
-            button_layout.addWidget(restore_btn)
-            
-            # 删除按钮
-            delete_btn = QPushButton(self.current_language['dialog']['delete'])
-            delete_btn.setObjectName('delete_btn')
-            delete_btn.clicked.connect(lambda checked, b=backup: self.delete_backup(b))
-            button_layout.addWidget(delete_btn)
-            
-            frame_layout.addWidget(button_container)
-            content_layout.addWidget(frame)
-        
-        self.scroll.setWidget(self.content_widget)
-
     def restore_backup(self, backup):
         """恢复备份"""
         self.parent.log(f"准备恢复备份: {backup}")
@@ -1214,23 +1076,27 @@ class BackupDialog(QDialog):
         
         if reply == QMessageBox.StandardButton.Yes:
             self.parent.log("开始恢复备份...")
-            if self.modifier.restore_backup(backup):
-                success_msg = self.current_language['messages']['backup_restored']
-                self.parent.log(success_msg)
-                QMessageBox.information(
-                    self,
-                    self.current_language['messages']['success'],
-                    success_msg
-                )
-                self.close()
-            else:
-                error_msg = self.current_language['messages']['restore_failed']
-                self.parent.log(f"恢复失败: {error_msg}")
-                QMessageBox.warning(
-                    self,
-                    self.current_language['messages']['error'],
-                    error_msg
-                )
+            self.parent.tasks.submit('restore', self.modifier.restore_backup, backup,
+                                     on_done=self._on_restored)
+
+    def _on_restored(self, ok):
+        if ok:
+            success_msg = self.current_language['messages']['backup_restored']
+            self.parent.log(success_msg)
+            QMessageBox.information(
+                self,
+                self.current_language['messages']['success'],
+                success_msg
+            )
+            self.close()
+        else:
+            error_msg = self.current_language['messages']['restore_failed']
+            self.parent.log(f"恢复失败: {error_msg}")
+            QMessageBox.warning(
+                self,
+                self.current_language['messages']['error'],
+                error_msg
+            )
 
     def delete_backup(self, backup):
         """删除备份"""
@@ -1243,69 +1109,46 @@ class BackupDialog(QDialog):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                self.parent.log("正在删除备份...")
-                os.remove(backup)
-                self.backups = self.modifier.list_backups()
-                self.create_backup_list()
-                
-                success_msg = self.current_language['messages']['backup_deleted']
-                self.parent.log(success_msg)
-                QMessageBox.information(
-                    self,
-                    self.current_language['messages']['success'],
-                    success_msg
-                )
-            except Exception as e:
-                error_msg = f"{self.current_language['messages']['delete_failed']}: {str(e)}"
-                self.parent.log(f"删除失败: {error_msg}")
-                QMessageBox.warning(
-                    self,
-                    self.current_language['messages']['error'],
-                    error_msg
-                )
-
-    def update_ui_text(self):
-        """更新对话框的文本"""
-        try:
-            # 更新窗口标题
-            self.setWindowTitle(self.current_language['dialog']['title'])
-            
-            # 更新标题标签
-            if hasattr(self, 'title_label'):
-                self.title_label.setText(self.current_language['dialog']['backup_list'])
-            
-            # 更新所有按钮
-            for btn in self.findChildren(QPushButton):
-                if btn.objectName() == 'restore_btn':
-                    btn.setText(self.current_language['dialog']['restore'])
-                elif btn.objectName() == 'delete_btn':
-                    btn.setText(self.current_language['dialog']['delete'])
-                elif btn.objectName() == 'close_btn':
-                    btn.setText(self.current_language['dialog']['close'])
-            
-            # 更新备份信息标签
-            for label in self.findChildren(QLabel):
-                if label.objectName().startswith('backup_info_'):
-                    backup_index = int(label.objectName().split('_')[-1])
-                    if backup_index < len(self.backups):
-                        info = self.modifier.get_backup_info(
-                            self.backups[backup_index], 
-                            self.current_language
-                        )
-                        label.setText(info)
-                        
-        except Exception as e:
-            print(f"更新对话框文本时出错: {e}")
+            self.parent.log("正在删除备份...")
+            self.parent.tasks.submit('delete_backup', self._delete_backup, backup,
+                                     on_done=self._on_deleted,
+                                     on_error=self._on_delete_failed)
+
+    def _delete_backup(self, backup):
+        """删除备份并重新列出 (工作线程)"""
+        self.modifier.delete_backup(backup)
+        return self.modifier.list_backups(newest_first=True)
+
+    def _on_deleted(self, backups):
+        # 只移除 (或插入) 发生变化的行
+        self.model.set_backups(backups)
+        
+        success_msg = self.current_language['messages']['backup_deleted']
+        self.parent.log(success_msg)
+        QMessageBox.information(
+            self,
+            self.current_language['messages']['success'],
+            success_msg
+        )
+
+    def _on_delete_failed(self, error):
+        error_msg = f"{self.current_language['messages']['delete_failed']}: {error}"
+        self.parent.log(f"删除失败: {error_msg}")
+        QMessageBox.warning(
+            self,
+            self.current_language['messages']['error'],
+            error_msg
+        )
+
+    def _set_row_texts(self, restore_text, delete_text):
+        """设置列表中的按钮文本，备份信息按新语言重新格式化 (不重新读取备份)"""
+        self.delegate.set_texts(restore_text, delete_text)
+        self.model.set_formatter(self.format_info)
+        self.list_view.viewport().update()
 
     def update_backups(self, new_backups):
         """更新备份列表"""
-        self.backups = new_backups
-        # 删除旧的内容部件
-        if self.content_widget:
-            self.content_widget.deleteLater()
-        # 创建新的备份列表
-        self.create_backup_list()
+        self.model.set_backups(new_backups)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""BackupStore 的去重、差异备份和对象回收"""
+import datetime
+import json
+import os
+
+import pytest
+
+from cursor_tool.backup_store import BackupStore
+
+
+def snapshot(i, size=200):
+    """相邻快照只有 telemetry.* 键不同"""
+    config = {f"key.{n}": f"value {n}" * 4 for n in range(size)}
+    config['telemetry.machineId'] = f"{i:064x}"
+    config['telemetry.devDeviceId'] = f"device-{i}"
+    return json.dumps(config, indent=2).encode('utf-8')
+
+
+def moment(i):
+    return datetime.datetime(2025, 1, 1) + datetime.timedelta(minutes=i)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BackupStore(tmp_path / 'backups', 'backup_{timestamp}.json', 'backup_*.json')
+
+
+def object_files(store):
+    return {name for _, _, files in os.walk(store.objects_dir) for name in files}
+
+
+def reopen(store):
+    return BackupStore(store.backup_dir, store.name_format, store.legacy_pattern)
+
+
+def test_delta_round_trip(store):
+    paths = [store.add(snapshot(i), moment(i)) for i in range(BackupStore.FULL_EVERY + 3)]
+    infos = store._load_manifest()['objects']
+    kinds = [infos[store.find(path)['blob']]['kind'] for path in paths]
+    # 第一个是完整基准，之后的 FULL_EVERY 个是差异，然后重新保存完整基准
+    assert kinds[0] == 'full' and kinds[BackupStore.FULL_EVERY + 1] == 'full'
+    assert kinds.count('delta') == BackupStore.FULL_EVERY + 1
+
+    fresh = reopen(store)
+    for i, path in enumerate(paths):
+        assert json.loads(fresh.read(path)) == json.loads(snapshot(i))
+    assert fresh.summary(paths[3])['telemetry']['telemetry.machineId'] == f"{3:064x}"
+
+
+def test_identical_content_stored_once(store):
+    first = store.add(snapshot(0), moment(0))
+    second = store.add(snapshot(0), moment(0))
+    assert first != second
+    assert store.find(first)['blob'] == store.find(second)['blob']
+    assert len(object_files(store)) == 1
+
+    store.remove(first)
+    assert store.read(second) == snapshot(0)
+    store.remove(second)
+    assert object_files(store) == set()
+
+
+def test_base_kept_while_deltas_need_it(store):
+    paths = [store.add(snapshot(i), moment(i)) for i in range(4)]
+    manifest = store._load_manifest()
+    base = store.find(paths[0])['blob']
+    assert manifest['objects'][store.find(paths[1])['blob']]['base'] == base
+
+    # 删除基准对应的备份后，基准对象仍被差异引用
+    store.remove_many(paths[:1])
+    assert base in object_files(store)
+    assert [json.loads(reopen(store).read(path)) for path in paths[1:]] == \
+        [json.loads(snapshot(i)) for i in range(1, 4)]
+
+    # 最后一个差异删除后基准随之回收
+    store.remove_many(paths[1:])
+    assert object_files(store) == set()
+    manifest = reopen(store)._load_manifest()
+    assert manifest['objects'] == {} and manifest['base'] is None
+
+
+def test_failed_object_write_leaves_manifest_unchanged(store, monkeypatch):
+    store.add(snapshot(0), moment(0))
+    before = json.loads(json.dumps(store._load_manifest()))
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr('cursor_tool.backup_store.atomic_write', fail)
+    with pytest.raises(OSError):
+        store.add(snapshot(1), moment(1))
+    assert store._load_manifest()['objects'] == before['objects']
+
+
+def test_manifest_saved_before_objects_removed(store, monkeypatch):
+    """清单写入失败时不删除对象，已有备份仍可读取"""
+    paths = [store.add(snapshot(i), moment(i)) for i in range(3)]
+    files = object_files(store)
+
+    def fail(manifest):
+        raise OSError("disk full")
+    monkeypatch.setattr(store, '_save_manifest', fail)
+    with pytest.raises(OSError):
+        store.remove_many(paths)
+    assert object_files(store) == files
+    fresh = reopen(store)
+    assert [json.loads(fresh.read(path)) for path in paths] == [json.loads(snapshot(i)) for i in range(3)]
+
+
+def test_legacy_files(store):
+    os.makedirs(store.backup_dir)
+    legacy = os.path.join(store.backup_dir, 'backup_20240101_000000.json')
+    with open(legacy, 'wb') as f:
+        f.write(snapshot(9))
+    os.utime(legacy, (moment(-1).timestamp(), moment(-1).timestamp()))
+    added = store.add(snapshot(0), moment(0))
+    assert store.paths() == [legacy, added]
+    assert store.read(legacy) == snapshot(9)
+    assert [entry.get('stored') for entry in store.usage_entries()] == \
+        [None, store._load_manifest()['objects'][store.find(added)['blob']]['stored']]
+
+    store.remove(legacy)
+    assert not os.path.exists(legacy)
+    assert store.paths() == [added]
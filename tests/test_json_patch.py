@@ -0,0 +1,57 @@
+"""patch_keys 只改变请求的键，其余内容逐字节保留"""
+import json
+
+import pytest
+
+from cursor_tool.json_patch import patch_file, patch_keys
+
+DATA = {
+    'telemetry.machineId': 'old',
+    'nested': {'telemetry.machineId': 'inner', 'list': [1, 2, {'a': None}]},
+    'path': 'C:\\Users\\"q"',
+    'update.mode': 'default',
+}
+
+
+@pytest.mark.parametrize('indent', [None, 2, 4, '\t'])
+def test_replace_matches_json_dump(indent):
+    """原文由 json.dump 生成时，结果与修改后重新 json.dump 逐字节相同"""
+    text = json.dumps(DATA, indent=indent).encode('utf-8')
+    updates = {'telemetry.machineId': {'id': 'new', 'n': [1, 2]}, 'update.mode': 'none'}
+    assert patch_keys(text, updates) == json.dumps(dict(DATA, **updates), indent=indent).encode('utf-8')
+
+
+@pytest.mark.parametrize('indent', [None, 2, '\t'])
+def test_append_matches_json_dump(indent):
+    text = json.dumps(DATA, indent=indent).encode('utf-8')
+    updates = {'update.mode': 'none', 'new.key': [1, {'b': 'c'}], 'other': 1}
+    assert patch_keys(text, updates) == json.dumps(dict(DATA, **updates), indent=indent).encode('utf-8')
+
+
+@pytest.mark.parametrize('text', [b'{}', b'{ }', b'{\n}', b''])
+def test_empty_object(text):
+    updates = {'a': 1, 'b': {'c': 2}}
+    assert patch_keys(text, updates) == json.dumps(updates, indent=2).encode('utf-8')
+
+
+def test_other_content_unchanged():
+    """不是 json.dump 生成的格式 (不规则的空白、CRLF) 在修改的值之外保持原样"""
+    text = b'{ "b" :1,\r\n\r\n   "a":  [ 1,2 ] ,"c":"x"  }\r\n'
+    assert patch_keys(text, {'a': 3}) == b'{ "b" :1,\r\n\r\n   "a":  3 ,"c":"x"  }\r\n'
+
+
+def test_duplicate_keys_all_replaced():
+    assert patch_keys(b'{"a": 1, "b": 2, "a": 3}', {'a': 0}) == b'{"a": 0, "b": 2, "a": 0}'
+
+
+def test_invalid_json():
+    with pytest.raises(json.JSONDecodeError):
+        patch_keys(b'{"a": 1', {'b': 2})
+
+
+def test_patch_file(tmp_path):
+    path = tmp_path / 'storage.json'
+    patch_file(path, {'a': 1})
+    assert json.loads(path.read_bytes()) == {'a': 1}
+    patch_file(path, {'a': 2, 'b': 3})
+    assert path.read_bytes() == json.dumps({'a': 2, 'b': 3}, indent=2).encode('utf-8')
@@ -0,0 +1,60 @@
+"""json_scan 与 json.load 的结果一致"""
+import json
+
+import pytest
+
+from cursor_tool.json_patch import patch_keys
+from cursor_tool.json_scan import read_keys, scan_keys
+
+DATA = {
+    'telemetry.machineId': 'a' * 64,
+    'telemetry.devDeviceId': 'b',
+    'nested': {'telemetry.fake': [1, {'x': '"}]'}], 'path': 'C:\\Users\\"q"'},
+    'update.mode': 'none',
+    'list': ['a,"b"', '\\', {}],
+    'empty': '',
+    'number': -1.5e3,
+}
+
+
+@pytest.mark.parametrize('indent', [None, 2, '\t'])
+def test_matches_json_load(indent):
+    text = json.dumps(DATA, indent=indent)
+    result = scan_keys(text, keys=['update.mode', 'number', 'missing'], prefixes=['telemetry.'])
+    assert result == {key: value for key, value in DATA.items()
+                      if key in ('update.mode', 'number') or key.startswith('telemetry.')}
+
+
+def test_duplicate_key_last_wins():
+    assert scan_keys('{"a": 1, "b": 2, "a": 3}', keys=['a']) == {'a': 3}
+
+
+@pytest.mark.parametrize('text', [
+    r'{"a\u002eb": 1}',
+    r'{"x": "C:\\p", "a\u002eb": 1}',
+    '{\n  "a\\u002eb" : 1\n}',
+    r'{"a\/b": 2, "a.b": 1}',
+])
+def test_escaped_keys(text):
+    """键名含转义序列时按原文统计不到，也必须找到"""
+    assert scan_keys(text, keys=['a.b']) == {'a.b': 1}
+    assert scan_keys(text, prefixes=['a.']) == {'a.b': 1}
+
+
+def test_patch_escaped_key_replaced():
+    """键名含转义序列时原位替换，不追加重复的键"""
+    patched = patch_keys(b'{\n  "a\\u002eb": 1\n}', {'a.b': 2})
+    assert patched.count(b'a\\u002eb') == 1 and b'"a.b"' not in patched
+    assert json.loads(patched) == {'a.b': 2}
+
+
+def test_read_keys(tmp_path):
+    path = tmp_path / 'storage.json'
+    path.write_text(json.dumps(DATA), encoding='utf-8')
+    assert read_keys(path, keys=['empty']) == {'empty': ''}
+    path.write_bytes(b'')
+    with pytest.raises(json.JSONDecodeError):
+        read_keys(path, keys=['empty'])
+    path.write_bytes(b'{"a": [1, 2}')
+    with pytest.raises(json.JSONDecodeError):
+        read_keys(path, keys=['a'])
@@ -0,0 +1,104 @@
+"""保留策略的时段分组和大小限制"""
+import datetime
+
+from cursor_tool.retention import RetentionEngine, RetentionPolicy, plan
+
+START = datetime.datetime(2025, 1, 6, 12, 0)  # 星期一
+
+
+def entry(name, moment, size=10, **fields):
+    return dict(name=name, timestamp=moment.timestamp(), size=size, **fields)
+
+
+def names(entries):
+    return [item['name'] for item in entries]
+
+
+def test_no_rules_keeps_everything():
+    entries = [entry(f"b{i}", START + datetime.timedelta(hours=i)) for i in range(5)]
+    keep, remove = plan(entries, RetentionPolicy())
+    assert names(keep) == names(entries) and remove == []
+
+
+def test_keep_last():
+    entries = [entry(f"b{i}", START + datetime.timedelta(minutes=i)) for i in range(5)]
+    keep, remove = plan(entries, RetentionPolicy(keep_last=2))
+    assert names(keep) == ['b3', 'b4']
+    assert [item['reason'] for item in remove] == ['policy'] * 3
+
+
+def test_hourly_keeps_newest_in_each_hour():
+    entries = [entry(f"h{hour}m{minute}", START + datetime.timedelta(hours=hour, minutes=minute))
+               for hour in range(4) for minute in (0, 30)]
+    keep, _ = plan(entries, RetentionPolicy(hourly=3))
+    assert names(keep) == ['h1m30', 'h2m30', 'h3m30']
+
+
+def test_daily_and_weekly_combined():
+    days = [entry(f"d{day}", START + datetime.timedelta(days=day)) for day in range(15)]
+    keep, _ = plan(days, RetentionPolicy(daily=2, weekly=3))
+    # 最近两天，以及三周中每周最新的一天 (星期日)
+    assert names(keep) == ['d6', 'd13', 'd14']
+
+
+def test_incremental_matches_plan():
+    policy = RetentionPolicy(keep_last=3, hourly=5, daily=2)
+    entries = [entry(f"b{i}", START + datetime.timedelta(minutes=37 * i)) for i in range(60)]
+    engine = RetentionEngine(policy)
+    removed = []
+    for item in entries:
+        removed.extend(engine.add(item))
+    keep, remove = plan(entries, policy)
+    assert sorted(names(removed)) == sorted(names(remove))
+    assert len(engine) == len(keep)
+
+
+def test_out_of_order_entry_rebuilds():
+    engine = RetentionEngine(RetentionPolicy(keep_last=2))
+    engine.extend([entry('b1', START), entry('b3', START + datetime.timedelta(hours=2))])
+    assert names(engine.add(entry('b2', START + datetime.timedelta(hours=1)))) == ['b1']
+
+
+def test_size_limit_drops_oldest():
+    entries = [entry(f"b{i}", START + datetime.timedelta(minutes=i), size=100) for i in range(5)]
+    keep, remove = plan(entries, RetentionPolicy(max_bytes=250))
+    assert names(keep) == ['b3', 'b4']
+    assert [item['reason'] for item in remove] == ['size'] * 3
+
+
+def test_size_limit_keeps_newest():
+    entries = [entry('b0', START, size=100), entry('b1', START + datetime.timedelta(minutes=1), size=500)]
+    keep, _ = plan(entries, RetentionPolicy(max_bytes=200))
+    assert names(keep) == ['b1']
+
+
+def test_size_limit_skips_shared_blobs():
+    """与其他备份共享对象的备份不释放空间，跳过"""
+    entries = [
+        entry('b1', START, blob='x', stored=100),
+        entry('b2', START + datetime.timedelta(minutes=1), blob='x', stored=100),
+        entry('b3', START + datetime.timedelta(minutes=2), blob='y', stored=10),
+        entry('b4', START + datetime.timedelta(minutes=3), blob='z', stored=150),
+    ]
+    keep, remove = plan(entries, RetentionPolicy(max_bytes=250))
+    assert names(keep) == ['b1', 'b2', 'b4'] and names(remove) == ['b3']
+
+
+def test_size_limit_keeps_delta_base():
+    """仍有差异依赖的基准不删除，只删除能释放空间的差异"""
+    moment = START
+    entries = [entry('full', moment, blob='f', stored=100)]
+    for i in range(3):
+        moment += datetime.timedelta(minutes=1)
+        entries.append(entry(f"delta{i}", moment, blob=f"d{i}", stored=10, base='f', base_stored=100))
+    keep, remove = plan(entries, RetentionPolicy(max_bytes=125))
+    assert names(keep) == ['full', 'delta1', 'delta2']
+    assert names(remove) == ['delta0']
+
+    engine = RetentionEngine(RetentionPolicy(max_bytes=125))
+    engine.extend(entries)
+    assert engine.total_bytes == 120
+    # 差异全部删除后基准不再被引用
+    for name in ('delta1', 'delta2'):
+        engine.discard(name)
+    assert engine.total_bytes == 100